@@ -0,0 +1,351 @@
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+
+from loader import REGION_COL, CRIME_COL, COUNT_COL, LONG_COLUMNS, SIDO_COL, SIGUNGU_COL, crime_names, count_matrix, split_region
+from profiling import span, timed
+from sorting import fast_sort
+
+
+# pandas 3은 항상 copy-on-write, pandas 2는 옵션을 켜야 함
+PANDAS_3 = int(pd.__version__.split('.')[0]) >= 3
+
+
+def enable_copy_on_write():
+    """pandas 2에서 copy-on-write 켜기 (프로세스 전체 옵션이라 앱 진입점에서 한 번만 부름)"""
+    if not PANDAS_3:
+        pd.set_option('mode.copy_on_write', True)
+
+
+def shared_copy(frame):
+    """
+    여러 세션이 같이 쓰는 캐시한 DataFrame을 내보낼 때의 복사본
+    copy-on-write이면 얕은 복사본 (받은 쪽이 고칠 때만 복사됨), 아니면 깊은 복사본
+    """
+    return frame.copy(deep=not (PANDAS_3 or pd.get_option('mode.copy_on_write') is True))
+
+
+def _intern(labels):
+    # 같은 문자열은 한 객체만 쓰도록 (라벨 색인과 long 테이블이 문자열을 공유)
+    return [sys.intern(str(label)) for label in labels]
+
+
+class CrimeCube:
+    """
+    지역 x 범죄유형 발생 건수를 원본 CSV와 같은 dense 행렬 그대로 들고 있는 핵심 자료구조
+    - matrix[i, j] = regions[i] 지역의 crimes[j] 범죄 발생 건수 (int32)
+    - region_sums / crime_sums = 행렬의 행/열 합 (marginal totals)
+    - region_sido[i] = regions[i]가 속한 시도 코드 (sidos[region_sido[i]]), districts[i] = 시군구 이름
+    합계, top-k, 필터, 피벗은 모두 축 방향 합/슬라이스로 계산하고
+    long format 테이블은 정말 필요한 화면에서만 to_long()으로 만든다.
+    데이터가 추가되면 append()로 해당 칸만 더하고 합계도 증분으로 갱신한다.
+    """
+
+    def __init__(self, regions=(), crimes=(), matrix=None, attrs=None):
+        self.regions = _intern(regions)
+        self.crimes = _intern(crimes)
+        self._region_pos = {name: i for i, name in enumerate(self.regions)}
+        self._crime_pos = {name: j for j, name in enumerate(self.crimes)}
+        if matrix is None:
+            matrix = np.zeros((len(self.regions), len(self.crimes)), dtype=np.int32)
+        # 읽기 전용 memmap이 들어와도 복사하지 않음 (수정할 때만 복사)
+        self.matrix = np.asarray(matrix, dtype=np.int32)
+        self.region_sums = self.matrix.sum(axis=1, dtype=np.int64)
+        self.crime_sums = self.matrix.sum(axis=0, dtype=np.int64)
+        self.attrs = dict(attrs or {})
+        self.version = 0
+        self._views = {}
+        self._lock = threading.RLock()
+
+        # 지역 -> (시도, 시군구) 코드는 지역이 처음 들어올 때 한 번만 나눔
+        self.sidos = []
+        self._sido_pos = {}
+        self.districts = []
+        self.region_sido = np.empty(0, dtype=np.int64)
+        self._add_hierarchy(self.regions)
+
+    def _add_hierarchy(self, names):
+        codes = []
+        for name in names:
+            sido, sigungu = split_region(name)
+            if sido not in self._sido_pos:
+                self._sido_pos[sido] = len(self.sidos)
+                self.sidos.append(sys.intern(sido))
+            codes.append(self._sido_pos[sido])
+            self.districts.append(sys.intern(sigungu))
+        self.region_sido = np.concatenate([self.region_sido, np.asarray(codes, dtype=np.int64)])
+
+    @classmethod
+    @timed('transform.from_wide')
+    def from_wide(cls, df_raw):
+        """
+        원본 wide format(범죄 유형 x 지역) DataFrame으로 바로 만들기 (long 테이블을 거치지 않음)
+        0 이하, 빈 칸, 숫자가 아닌 칸은 0으로 두고, 같은 이름이 두 번 나오면 더한다.
+        Args:
+            df_raw: loader.read_raw 결과
+        Returns:
+            CrimeCube
+        """
+        values = count_matrix(df_raw)
+        with np.errstate(invalid='ignore'):
+            values = np.where(values > 0, values, 0).astype(np.int32)
+
+        crime_codes, crimes = pd.factorize(crime_names(df_raw))
+        region_codes, regions = pd.factorize(np.asarray([str(col).strip() for col in df_raw.columns[2:]], dtype=object))
+        matrix = np.zeros((len(regions), len(crimes)), dtype=np.int32)
+        np.add.at(matrix, (region_codes[None, :], crime_codes[:, None]), values)
+
+        # 한 건도 없는 지역/범죄 유형은 long 테이블과 마찬가지로 빼 둔다
+        keep_rows = matrix.sum(axis=1) > 0
+        keep_cols = matrix.sum(axis=0) > 0
+        return cls(regions[keep_rows], crimes[keep_cols], matrix[np.ix_(keep_rows, keep_cols)])
+
+    def _codes(self, labels, positions, names):
+        # 라벨을 행렬 위치로 바꾸고, 처음 보는 라벨은 뒤에 추가
+        labels = pd.Categorical(labels)
+        new = _intern(name for name in labels.categories if str(name) not in positions)
+        for name in new:
+            positions[name] = len(names)
+            names.append(name)
+        if names is self.regions:
+            self._add_hierarchy(new)
+        category_pos = np.array([positions[str(name)] for name in labels.categories], dtype=np.int64)
+        return category_pos[labels.codes], len(new)
+
+    @timed('transform.append')
+    def append(self, df, version=None):
+        """
+        long format 행들을 집계에 더하기 (새 지역/범죄유형이면 행렬을 늘림)
+        다시 전체를 집계하지 않고 해당 칸과 합계만 갱신한다.
+        attrs['version']은 화면/응답 캐시 키라서 데이터와 함께 바꾼다.
+        Args:
+            df: '지역', '범죄유형', '발생건수' 컬럼 DataFrame
+            version: 새 attrs['version'] (None이면 이전 버전 뒤에 append 횟수를 붙임)
+        """
+        with self._lock:
+            rows, new_rows = self._codes(df[REGION_COL], self._region_pos, self.regions)
+            cols, new_cols = self._codes(df[CRIME_COL], self._crime_pos, self.crimes)
+            counts = df[COUNT_COL].to_numpy(dtype=np.int32)
+
+            if new_rows or new_cols or not self.matrix.flags.writeable:
+                # 행렬 크기가 바뀌거나 읽기 전용(memmap)이면 새 배열로 복사
+                matrix = np.zeros((len(self.regions), len(self.crimes)), dtype=np.int32)
+                matrix[:self.matrix.shape[0], :self.matrix.shape[1]] = self.matrix
+                self.matrix = matrix
+                self.region_sums = np.concatenate([self.region_sums, np.zeros(new_rows, dtype=np.int64)])
+                self.crime_sums = np.concatenate([self.crime_sums, np.zeros(new_cols, dtype=np.int64)])
+
+            np.add.at(self.matrix, (rows, cols), counts)
+            np.add.at(self.region_sums, rows, counts)
+            np.add.at(self.crime_sums, cols, counts)
+            self.version += 1
+            if version is None and 'version' in self.attrs:
+                version = f"{str(self.attrs['version']).partition('+')[0]}+{self.version}"
+            if version is not None:
+                self.attrs['version'] = version
+            self._views.clear()
+
+    def _view(self, name, build):
+        # 같은 버전 안에서는 한 번 만든 표를 재사용
+        with self._lock:
+            view = self._views.get(name)
+            if view is None:
+                with span(f'aggregate.{name}'):
+                    view = self._views[name] = build()
+            return view
+
+    def _frame_view(self, name, build):
+        # 공유하는 DataFrame은 복사본으로 (copy-on-write이면 데이터는 복사하지 않음)
+        return shared_copy(self._view(name, build))
+
+    def region_index(self, name):
+        """지역 이름 -> 행 위치 (없으면 None)"""
+        return self._region_pos.get(name)
+
+    def crime_index(self, name):
+        """범죄 유형 이름 -> 열 위치 (없으면 None)"""
+        return self._crime_pos.get(name)
+
+    def nbytes(self):
+        """행렬과 합계 배열이 차지하는 메모리 (바이트, 라벨 문자열 제외)"""
+        return self.matrix.nbytes + self.region_sums.nbytes + self.crime_sums.nbytes
+
+    def _labels(self):
+        # 라벨 배열과 이름 순위 (데이터 버전마다 한 번만)
+        def build():
+            regions = np.asarray(self.regions, dtype=object)
+            crimes = np.asarray(self.crimes, dtype=object)
+            region_rank = np.empty(len(regions), dtype=np.int64)
+            region_rank[np.argsort(regions, kind='stable')] = np.arange(len(regions))
+            crime_rank = np.empty(len(crimes), dtype=np.int64)
+            crime_rank[np.argsort(crimes, kind='stable')] = np.arange(len(crimes))
+            return regions, crimes, region_rank, crime_rank
+        return self._view('labels', build)
+
+    def _cells(self, rows, cols, categorical=False):
+        # (행 위치, 열 위치) 배열 -> long format DataFrame (0인 칸 제외)
+        counts = self.matrix[rows, cols]
+        keep = counts > 0
+        rows, cols, counts = rows[keep], cols[keep], counts[keep]
+        if categorical:
+            # 큰 테이블은 범주형으로 (문자열을 행마다 들고 있지 않음)
+            region = pd.Categorical.from_codes(rows, self.regions).remove_unused_categories()
+            crime = pd.Categorical.from_codes(cols, self.crimes).remove_unused_categories()
+        else:
+            regions, crimes, _, _ = self._labels()
+            region, crime = regions[rows], crimes[cols]
+        return pd.DataFrame({REGION_COL: region, CRIME_COL: crime, COUNT_COL: counts})
+
+    def to_long(self):
+        """long format 테이블 ('지역', '범죄유형', '발생건수'), 처음 필요할 때 한 번만 만듦"""
+        def build():
+            rows, cols = np.nonzero(self.matrix)
+            return self._cells(rows, cols, categorical=True)
+        return self._frame_view('long', build)
+
+    def _totals(self, label_col, labels, sums):
+        frame = pd.DataFrame({label_col: labels, COUNT_COL: sums})
+        frame = frame[frame[COUNT_COL] > 0]
+        # 건수 내림차순, 같으면 이름 오름차순
+        return fast_sort(frame, key=[COUNT_COL, label_col], reverse=[True, False])
+
+    def region_totals(self):
+        """지역별 총 발생 건수 DataFrame ('지역', '발생건수'), 많은 순"""
+        return self._frame_view('region_totals', lambda: self._totals(REGION_COL, self.regions, self.region_sums))
+
+    def crime_totals(self):
+        """범죄 유형별 총 발생 건수 DataFrame ('범죄유형', '발생건수'), 많은 순"""
+        return self._frame_view('crime_totals', lambda: self._totals(CRIME_COL, self.crimes, self.crime_sums))
+
+    def sido_matrix(self):
+        """시도 x 범죄유형 행렬 (지역 행을 시도 코드로 더한 rollup)"""
+        def build():
+            matrix = np.zeros((len(self.sidos), self.matrix.shape[1]), dtype=np.int64)
+            np.add.at(matrix, self.region_sido, self.matrix)
+            matrix.flags.writeable = False
+            return matrix
+        return self._view('sido_matrix', build)
+
+    def sido_totals(self):
+        """시도별 총 발생 건수 DataFrame ('시도', '발생건수'), 많은 순"""
+        def build():
+            sums = np.bincount(self.region_sido, weights=self.region_sums, minlength=len(self.sidos))
+            return self._totals(SIDO_COL, self.sidos, sums.astype(np.int64))
+        return self._frame_view('sido_totals', build)
+
+    def district_totals(self, sido):
+        """
+        한 시도 안의 시군구별 총 발생 건수 (모든 시도를 한 번에 만들어 두고 dict에서 꺼냄)
+        Args:
+            sido: 시도 이름
+        Returns:
+            '시군구', '지역', '발생건수' DataFrame (많은 순), 없는 시도면 빈 DataFrame
+        """
+        def build():
+            districts = np.asarray(self.districts, dtype=object)
+            regions = np.asarray(self.regions, dtype=object)
+            _, _, region_rank, _ = self._labels()
+            # (시도, 건수 내림차순, 지역 이름) 순으로 한 번 정렬하고 시도 경계에서 자름
+            order = np.lexsort((region_rank, -self.region_sums, self.region_sido))
+            order = order[self.region_sums[order] > 0]
+            bounds = np.cumsum(np.bincount(self.region_sido[order], minlength=len(self.sidos)))[:-1]
+            return {
+                sido_name: pd.DataFrame({
+                    SIGUNGU_COL: districts[rows],
+                    REGION_COL: regions[rows],
+                    COUNT_COL: self.region_sums[rows],
+                })
+                for sido_name, rows in zip(self.sidos, np.split(order, bounds))
+            }
+        by_sido = self._view('district_totals', build)
+        empty = pd.DataFrame({SIGUNGU_COL: [], REGION_COL: [], COUNT_COL: np.empty(0, dtype=np.int64)})
+        return shared_copy(by_sido.get(sido, empty))
+
+    def pivot(self):
+        """지역 x 범죄유형 피벗 테이블 (pivot_table과 같이 라벨 이름 순 정렬, 빈 칸은 0)"""
+        def build():
+            row_order = np.argsort(np.asarray(self.regions, dtype=object), kind='stable')
+            col_order = np.argsort(np.asarray(self.crimes, dtype=object), kind='stable')
+            return pd.DataFrame(
+                self.matrix[np.ix_(row_order, col_order)],
+                index=pd.Index([self.regions[i] for i in row_order], name=REGION_COL),
+                columns=pd.Index([self.crimes[j] for j in col_order], name=CRIME_COL),
+            )
+        return self._frame_view('pivot', build)
+
+    @timed('aggregate.filter')
+    def filter(self, region=None, crime=None):
+        """
+        지역/범죄 유형 필터 (None이면 전체): 행 또는 열 하나를 잘라서 long format으로
+        Returns:
+            '지역', '범죄유형', '발생건수' DataFrame (0인 칸 제외, 행렬 순서)
+        """
+        i = None if region is None else self.region_index(region)
+        j = None if crime is None else self.crime_index(crime)
+        if (region is not None and i is None) or (crime is not None and j is None):
+            return pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in
+                                 zip(LONG_COLUMNS, ['category', 'category', np.int32])})
+        if i is None and j is None:
+            return self.to_long()
+        if j is None:
+            cols = np.arange(len(self.crimes))
+            return self._cells(np.full_like(cols, i), cols)
+        if i is None:
+            rows = np.arange(len(self.regions))
+            return self._cells(rows, np.full_like(rows, j))
+        return self._cells(np.array([i]), np.array([j]))
+
+    @timed('aggregate.top_k')
+    def top_k(self, k, by=None):
+        """
+        발생 건수 상위 k개 (지역, 범죄유형) 칸
+        동점은 지역 이름, 범죄 유형 이름 순으로 정해서 항상 같은 결과가 나온다.
+        Args:
+            k: 상위 k개 (by가 있으면 그룹마다 k개)
+            by: None, '지역'(지역마다 상위 k개 범죄), '범죄유형'(범죄마다 상위 k개 지역)
+        Returns:
+            '지역', '범죄유형', '발생건수' DataFrame
+        """
+        _, _, region_rank, crime_rank = self._labels()
+        flat = self.matrix.ravel()
+        if k <= 0 or flat.size == 0:
+            return self._cells(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+
+        if by is None:
+            # k번째로 큰 값 이상인 칸만 후보로 (동점 때문에 k개보다 조금 많을 수 있음)
+            kth = min(k, flat.size)
+            threshold = np.partition(flat, -kth)[-kth]
+            rows, cols = np.nonzero(self.matrix >= max(threshold, 1))
+            counts = self.matrix[rows, cols].astype(np.int64)
+            order = np.lexsort((crime_rank[cols], region_rank[rows], -counts))[:k]
+            return self._cells(rows[order], cols[order])
+
+        # (건수 내림차순, 이름 순)을 겹치지 않는 정수 하나로 만들어서 축마다 argpartition으로 k개만 고르고
+        # 그 k개만 정렬 (행/열 전체를 정렬하지 않음)
+        counts = -self.matrix.astype(np.int64)
+        if by == REGION_COL:
+            # 행마다 상위 k개 범죄
+            keys, axis = counts * len(self.crimes) + crime_rank, 1
+        elif by == CRIME_COL:
+            # 열마다 상위 k개 지역
+            keys, axis = counts * len(self.regions) + region_rank[:, None], 0
+        else:
+            raise ValueError(f"by는 None, '{REGION_COL}', '{CRIME_COL}' 중 하나여야 합니다: {by}")
+        kk = min(k, keys.shape[axis])
+        order = np.argpartition(keys, kk - 1, axis=axis)
+        order = order[:, :kk] if axis == 1 else order[:kk, :]
+        order = np.take_along_axis(order, np.argsort(np.take_along_axis(keys, order, axis=axis), axis=axis), axis=axis)
+        if axis == 1:
+            rows = np.repeat(np.arange(keys.shape[0]), kk)
+            cols = order.ravel()
+            group_rank = region_rank[rows]
+        else:
+            rows = order.T.ravel()
+            cols = np.repeat(np.arange(keys.shape[1]), kk)
+            group_rank = crime_rank[cols]
+
+        # 그룹 이름 순으로 그룹을 늘어놓음 (그룹 안 순서는 그대로)
+        order = np.argsort(group_rank, kind='stable')
+        return self._cells(rows[order], cols[order])
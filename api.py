@@ -0,0 +1,173 @@
+import argparse
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from aggregates import enable_copy_on_write
+from loader import DataLoadError
+from queries import QueryError, QueryService
+from store import CrimeStore
+from watcher import DataWatcher
+
+
+# 모든 질의 URL 앞부분 (예: /api/region_totals?year=2023&limit=20)
+API_PREFIX = '/api/'
+
+
+class ResponseCache:
+    """
+    ETag -> 응답 본문(JSON 바이트) LRU 캐시
+    ETag는 데이터 버전 + 질의 이름 + 정리된 파라미터의 해시라서 데이터가 바뀌면 자연히 새 키가 된다.
+    """
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, etag):
+        with self._lock:
+            body = self._entries.get(etag)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(etag)
+            self.hits += 1
+            return body
+
+    def put(self, etag, body):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[etag] = body
+            self._entries.move_to_end(etag)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def info(self):
+        """캐시 상태 (hits, misses, 현재 크기, 최대 크기)"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries),
+                    'max_size': self.max_entries}
+
+
+def make_etag(version, name, params):
+    """데이터 버전과 질의 파라미터로 만든 강한 ETag"""
+    key = json.dumps([version, name, params], ensure_ascii=False, sort_keys=True)
+    return '"' + hashlib.sha256(key.encode('utf-8')).hexdigest()[:32] + '"'
+
+
+def _dumps(payload):
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    """
+    GET /api/meta                 사용할 수 있는 연도와 질의 목록
+    GET /api/cache                응답 캐시 상태
+    GET /api/<질의>?파라미터...    QueryService.QUERIES의 질의 (JSON)
+    If-None-Match가 ETag와 같으면 본문 없이 304를 돌려준다.
+    """
+    # keep-alive (부하 테스트에서 요청마다 연결을 새로 맺지 않도록)
+    protocol_version = 'HTTP/1.1'
+    # 헤더와 본문을 따로 쓰므로 Nagle + delayed ACK로 응답마다 40ms씩 멈추지 않도록
+    disable_nagle_algorithm = True
+    server_version = 'CrimeFinderAPI/1.0'
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if not url.path.startswith(API_PREFIX):
+            return self._send(404, _dumps({'error': f"없는 경로입니다: {url.path}"}))
+        name = url.path[len(API_PREFIX):]
+        service = self.server.service
+        try:
+            if name == 'meta':
+                return self._send(200, _dumps(service.meta()))
+            if name == 'cache':
+                return self._send(200, _dumps(self.server.cache.info()))
+            if name not in service.QUERIES:
+                return self._send(404, _dumps({'error': f"없는 질의입니다: {name}"}))
+
+            params = dict(parse_qsl(url.query, keep_blank_values=True))
+            cube, clean = service.prepare(name, params)
+            etag = make_etag(cube.attrs['version'], name, clean)
+            if etag in self._if_none_match():
+                return self._send(304, b'', etag)
+
+            body = self.server.cache.get(etag)
+            if body is None:
+                body = _dumps(service.payload(name, cube, clean))
+                self.server.cache.put(etag, body)
+            return self._send(200, body, etag)
+        except QueryError as e:
+            return self._send(400, _dumps({'error': str(e)}))
+        except DataLoadError as e:
+            return self._send(503, _dumps({'error': f"데이터를 불러올 수 없습니다: {e}"}))
+
+    def _if_none_match(self):
+        header = self.headers.get('If-None-Match', '')
+        return {tag.strip() for tag in header.split(',') if tag.strip()}
+
+    def _send(self, status, body, etag=None):
+        self.send_response(status)
+        if status != 304:
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if etag is not None:
+            self.send_header('ETag', etag)
+            # 캐시해도 되지만 쓰기 전에 ETag로 다시 확인하도록
+            self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class ApiServer(ThreadingHTTPServer):
+    """요청마다 스레드 하나, 질의 계층과 응답 캐시는 모든 스레드가 공유"""
+    daemon_threads = True
+
+    def __init__(self, address, service, cache_entries=512, verbose=False):
+        super().__init__(address, ApiHandler)
+        self.service = service
+        self.cache = ResponseCache(cache_entries)
+        self.verbose = verbose
+
+
+def main():
+    parser = argparse.ArgumentParser(description='범죄 통계 JSON API (로컬 HTTP 서버)')
+    parser.add_argument('--data-dir', default='data')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8502)
+    parser.add_argument('--cache-entries', type=int, default=512, help='응답 캐시 크기 (0이면 캐시하지 않음)')
+    parser.add_argument('--verbose', action='store_true', help='요청마다 로그 출력')
+    args = parser.parse_args()
+
+    enable_copy_on_write()
+    store = CrimeStore(args.data_dir)
+    store.refresh()
+    # 대시보드와 같이 data 폴더를 감시해서 바뀐 연도만 다시 읽음
+    watcher = DataWatcher(store)
+    watcher.start()
+
+    server = ApiServer((args.host, args.port), QueryService(store), args.cache_entries, args.verbose)
+    print(f"http://{args.host}:{server.server_port}{API_PREFIX}meta", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        watcher.stop()
+
+
+if __name__ == '__main__':
+    main()
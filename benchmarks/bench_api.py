@@ -0,0 +1,154 @@
+"""
+JSON API 부하 테스트 (초당 요청 수와 응답 시간 꼬리)
+
+api.py 서버를 띄우고 클라이언트 스레드 여러 개가 keep-alive 연결 하나씩으로
+질의 묶음(모든 질의 종류, 시도/지역/범죄 유형별 파라미터)을 돌아가며 요청한다.
+- nocache: 응답 캐시를 끄고 (--cache-entries 0) 매번 질의를 실행하고 JSON으로 바꿈
+- cache:   응답 캐시에서 본문을 꺼내 보냄 (처음 한 바퀴만 계산)
+- etag:    클라이언트가 받은 ETag를 If-None-Match로 보내서 304 (본문 없음)를 받음
+클라이언트도 같은 기계의 파이썬 스레드라서 절대값보다 모드끼리의 차이를 보는 용도.
+
+실행 (프로젝트 루트에서):
+    python -m benchmarks.bench_api
+    python -m benchmarks.bench_api --clients 16 --requests 20000 --modes cache etag
+"""
+import argparse
+import http.client
+import json
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from urllib.parse import urlencode
+
+import numpy as np
+
+from benchmarks.bench_interactions import free_port
+
+
+MODES = ['nocache', 'cache', 'etag']
+
+
+def start_api(port, cache_entries, timeout=60.0):
+    """api.py 서버를 띄우고 /api/meta에 응답할 때까지 기다림"""
+    proc = subprocess.Popen(
+        [sys.executable, 'api.py', '--port', str(port), '--cache-entries', str(cache_entries)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/api/meta', timeout=1) as res:
+                return proc, json.load(res)
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError('API 서버가 시작되지 않았습니다.')
+
+
+def fetch_json(port, path):
+    with urllib.request.urlopen(f'http://127.0.0.1:{port}{path}', timeout=10) as res:
+        return json.load(res)
+
+
+def build_paths(port, meta):
+    """요청할 URL 묶음 (가장 최근 연도와 전체 합계, 질의마다 여러 파라미터)"""
+    paths = []
+    for year in [meta['latest_year'], '전체']:
+        base = {'year': year}
+        paths.append('/api/top_combinations?' + urlencode({**base, 'k': 10}))
+        paths.append('/api/top_combinations?' + urlencode({**base, 'k': 100}))
+        paths.append('/api/region_totals?' + urlencode(base))
+        paths.append('/api/region_totals?' + urlencode({**base, 'limit': 20}))
+        paths.append('/api/crime_totals?' + urlencode(base))
+        sidos = fetch_json(port, '/api/sido_totals?' + urlencode(base))['rows']
+        paths.append('/api/sido_totals?' + urlencode(base))
+        paths += ['/api/district_totals?' + urlencode({**base, 'sido': row['시도']}) for row in sidos]
+        regions = fetch_json(port, '/api/region_totals?' + urlencode({**base, 'limit': 40}))['rows']
+        paths += ['/api/search?' + urlencode({**base, 'region': row['지역']}) for row in regions]
+        paths += ['/api/similar_regions?' + urlencode({**base, 'region': row['지역']}) for row in regions[:10]]
+        paths += ['/api/scorecard?' + urlencode({**base, 'region': row['지역']}) for row in regions[:10]]
+        paths += ['/api/rank_range?' + urlencode({**base, 'start': start, 'stop': start + 19}) for start in (1, 21, 101)]
+        crimes = fetch_json(port, '/api/crime_totals?' + urlencode({**base, 'limit': 20}))['rows']
+        paths += ['/api/search?' + urlencode({**base, 'crime': row['범죄유형'], 'limit': 50}) for row in crimes]
+    return paths
+
+
+def client(port, paths, count, offset, use_etag, latencies, statuses):
+    """연결 하나로 paths를 offset부터 돌아가며 count번 요청"""
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    etags = {}
+    try:
+        for i in range(count):
+            path = paths[(offset + i) % len(paths)]
+            headers = {'If-None-Match': etags[path]} if use_etag and path in etags else {}
+            t0 = time.perf_counter()
+            conn.request('GET', path, headers=headers)
+            res = conn.getresponse()
+            res.read()
+            latencies.append(time.perf_counter() - t0)
+            statuses[res.status] = statuses.get(res.status, 0) + 1
+            if res.getheader('ETag'):
+                etags[path] = res.getheader('ETag')
+    finally:
+        conn.close()
+
+
+def run_mode(port, paths, mode, clients, requests):
+    """
+    클라이언트 스레드들로 requests개 요청
+    Returns:
+        (초당 요청 수, 응답 시간 배열(초), 상태 코드별 개수)
+    """
+    per_client = requests // clients
+    latencies = [[] for _ in range(clients)]
+    statuses = [{} for _ in range(clients)]
+    threads = [
+        threading.Thread(target=client, args=(port, paths, per_client, n * len(paths) // clients,
+                                              mode == 'etag', latencies[n], statuses[n]))
+        for n in range(clients)
+    ]
+    t0 = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - t0
+
+    total = {}
+    for counts in statuses:
+        for status, count in counts.items():
+            total[status] = total.get(status, 0) + count
+    latency = np.concatenate([np.asarray(values) for values in latencies])
+    return len(latency) / elapsed, latency, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=8, help='동시 클라이언트 (연결) 수')
+    parser.add_argument('--requests', type=int, default=5000, help='모드마다 보낼 요청 수')
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=MODES)
+    args = parser.parse_args()
+
+    for mode in args.modes:
+        # 모드마다 새 서버 (앞 모드에서 채운 캐시가 섞이지 않도록)
+        port = free_port()
+        proc, meta = start_api(port, 0 if mode == 'nocache' else 512)
+        try:
+            paths = build_paths(port, meta)
+            # 한 바퀴 미리 돌려서 집계와 검색 색인을 만들어 둠 (cache 모드는 응답 캐시도 채워짐)
+            run_mode(port, paths, 'cache', 1, len(paths))
+            rps, latency, statuses = run_mode(port, paths, mode, args.clients, args.requests)
+        finally:
+            proc.terminate()
+            proc.wait()
+
+        p50, p90, p99 = np.percentile(latency, [50, 90, 99]) * 1e3
+        print(f"[{mode:7s}] URL {len(paths)}개, 클라이언트 {args.clients}개, 요청 {len(latency):,}개: "
+              f"{rps:8.0f} req/s   p50 {p50:6.2f}ms  p90 {p90:6.2f}ms  p99 {p99:6.2f}ms  "
+              f"max {latency.max() * 1e3:7.2f}ms   상태 {dict(sorted(statuses.items()))}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+외부 병합 정렬(external_sort) vs 메모리 안 정렬(fast_sort) 비교
+여러 연도 long 테이블을 흉내 내서 (실제 데이터를 연도 수만큼 반복) '발생건수' 내림차순으로 정렬하고
+시간과 최대 메모리(tracemalloc 기준, 입력 조각을 만드는 메모리 포함)를 잰다.
+병합은 행마다 파이썬에서 비교하므로 fast_sort보다 훨씬 느리다: 데이터가 메모리에 들어가면 fast_sort를 쓴다.
+
+실행 (프로젝트 루트에서):
+    python -m benchmarks.bench_external_sort
+    python -m benchmarks.bench_external_sort --years 200 --limits 4 16 64
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from external_sort import external_sort
+from loader import COUNT_COL, REGION_COL, YEAR_COL
+from sorting import fast_sort
+from store import CrimeStore
+
+
+KEY = [COUNT_COL, YEAR_COL, REGION_COL]
+REVERSE = [True, False, False]
+
+
+def make_chunks(long, years):
+    """연도마다 long 테이블 한 조각 (건수는 연도마다 조금씩 흔들어서 동점을 줄임)"""
+    rng = np.random.default_rng(0)
+    for year in range(years):
+        chunk = long.copy()
+        chunk[YEAR_COL] = np.int16(1900 + year)
+        chunk[COUNT_COL] = (chunk[COUNT_COL] * rng.uniform(0.5, 1.5, len(chunk))).astype(np.int32)
+        yield chunk
+
+
+def measure(func):
+    """시간은 tracemalloc 없이 (할당마다 붙는 비용이 커서), 최대 메모리는 한 번 더 돌려서 잰다"""
+    t0 = time.perf_counter()
+    rows = func()
+    elapsed = time.perf_counter() - t0
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rows, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--data-dir', default='data')
+    parser.add_argument('--years', type=int, default=100, help='흉내 낼 연도 수')
+    parser.add_argument('--limits', type=float, nargs='+', default=[4, 16, 64], help='external_sort 메모리 상한 (MB)')
+    args = parser.parse_args()
+
+    store = CrimeStore(args.data_dir)
+    store.refresh()
+    long = store.to_long()
+    print(f"조각 {args.years}개 x {len(long):,}행 = {args.years * len(long):,}행, 키 {KEY}")
+
+    def in_memory():
+        table = pd.concat(make_chunks(long, args.years), ignore_index=True)
+        return len(fast_sort(table, key=KEY, reverse=REVERSE))
+
+    def external(limit):
+        def run():
+            return sum(len(chunk) for chunk in external_sort(make_chunks(long, args.years), key=KEY,
+                                                             reverse=REVERSE, memory_limit=int(limit * 2**20)))
+        return run
+
+    rows, elapsed, peak = measure(in_memory)
+    print(f"  fast_sort (전체를 메모리에)       : {elapsed:7.2f}초   최대 메모리 {peak / 2**20:8.1f}MB   {rows:,}행")
+    for limit in args.limits:
+        rows, elapsed, peak = measure(external(limit))
+        print(f"  external_sort (상한 {limit:5.0f}MB)     : {elapsed:7.2f}초   최대 메모리 {peak / 2**20:8.1f}MB   {rows:,}행")
+
+
+if __name__ == '__main__':
+    main()
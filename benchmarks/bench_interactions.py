@@ -0,0 +1,215 @@
+"""
+대시보드 상호작용마다 서버 CPU 시간 측정
+
+streamlit 서버를 띄우고 브라우저 대신 웹소켓으로 접속해서 탭을 열고 위젯 값을 바꾸며
+상호작용 하나(rerun 또는 fragment rerun)가 끝날 때까지 서버 프로세스가 쓴 CPU 시간
+(/proc/<pid>/stat, 모든 스레드 합계), 응답 시간, 받은 메시지 크기를 잰다.
+없는 탭이나 위젯은 건너뛰므로 이전 버전 스크립트와도 비교할 수 있다 (Linux 전용).
+
+실행 (프로젝트 루트에서):
+    python -m benchmarks.bench_interactions
+    git show HEAD~1:main.py > main_before.py
+    python -m benchmarks.bench_interactions --script main_before.py --repeat 10
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+import numpy as np
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+
+# (종류, 이름): 'tab'은 탭 열기, 'select'는 선택 상자 값 바꾸기 (반복할 때마다 다른 값을 고름)
+INTERACTIONS = [
+    ('tab', '📍 지역별'),
+    ('select', '시도 선택 (시군구별로 보기)'),
+    ('select', '정렬 벤치마크 입력 분포'),
+    ('tab', '🔍 검색'),
+    ('select', '지역 선택'),
+    ('select', '범죄 유형 선택'),
+    ('select', '기준 연도'),
+]
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK')
+
+
+def process_cpu(pid):
+    """프로세스의 user + system CPU 시간 (초, 모든 스레드 합계)"""
+    with open(f'/proc/{pid}/stat') as f:
+        fields = f.read().rsplit(')', 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(script, port, timeout=60.0, env=None):
+    """
+    streamlit 서버를 띄우고 health 체크가 될 때까지 기다림
+    Args:
+        env: 서버에 더할 환경 변수 dict (None이면 현재 환경 그대로)
+    """
+    proc = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', script,
+         '--server.headless', 'true', '--server.port', str(port),
+         '--browser.gatherUsageStats', 'false', '--server.fileWatcherType', 'none'],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        env=None if env is None else {**os.environ, **env}
+    )
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/_stcore/health', timeout=1) as res:
+                if res.status == 200:
+                    return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError('streamlit 서버가 시작되지 않았습니다.')
+
+
+class Session:
+    """
+    브라우저 한 탭 흉내
+    받은 delta에서 선택 상자와 탭의 위젯 id, fragment id를 모아 두고
+    rerun할 때마다 브라우저처럼 모든 위젯 값을 함께 보낸다.
+    """
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.page_hash = ''
+        self.widgets = {}   # 이름 -> {'id', 'fragment_id', 'options'}
+        self.states = {}    # 위젯 id -> WidgetState
+        self.exceptions = []
+        self._tab_container = ('', '')
+
+    def _track(self, msg):
+        if msg.HasField('new_session'):
+            self.page_hash = msg.new_session.main_script_hash
+        if not msg.HasField('delta'):
+            return
+        delta = msg.delta
+        if delta.HasField('new_element'):
+            element = delta.new_element
+            kind = element.WhichOneof('type')
+            if kind == 'selectbox':
+                box = element.selectbox
+                self.widgets[box.label] = {'id': box.id, 'fragment_id': delta.fragment_id,
+                                           'options': list(box.options)}
+            elif kind == 'exception':
+                self.exceptions.append(element.exception.message)
+        elif delta.HasField('add_block') and delta.add_block.HasField('tab_container'):
+            self._tab_container = (delta.add_block.tab_container.id, delta.fragment_id)
+        elif delta.HasField('add_block') and delta.add_block.HasField('tab'):
+            tab_id, fragment_id = self._tab_container
+            if tab_id:
+                self.widgets[delta.add_block.tab.label] = {'id': tab_id, 'fragment_id': fragment_id,
+                                                           'options': None}
+
+    async def rerun(self, fragment_id=''):
+        """
+        rerun 요청을 보내고 끝날 때까지 기다림
+        Returns:
+            받은 메시지 바이트 수
+        """
+        msg = BackMsg()
+        msg.rerun_script.query_string = ''
+        msg.rerun_script.page_script_hash = self.page_hash
+        msg.rerun_script.widget_states.widgets.extend(self.states.values())
+        if fragment_id:
+            msg.rerun_script.fragment_id = fragment_id
+        await self.ws.send(msg.SerializeToString())
+
+        received = 0
+        while True:
+            raw = await asyncio.wait_for(self.ws.recv(), 120)
+            received += len(raw)
+            forward = ForwardMsg()
+            forward.ParseFromString(raw)
+            self._track(forward)
+            if forward.HasField('script_finished') and \
+                    forward.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                return received
+
+    def set_value(self, name, value):
+        """위젯 값 바꾸기 (fragment 안의 위젯이면 그 fragment id를 돌려줌)"""
+        widget = self.widgets[name]
+        self.states[widget['id']] = WidgetState(id=widget['id'], string_value=value)
+        return widget['fragment_id']
+
+
+async def measure(pid, session, fragment_id=''):
+    cpu0 = process_cpu(pid)
+    t0 = time.perf_counter()
+    received = await session.rerun(fragment_id)
+    return time.perf_counter() - t0, process_cpu(pid) - cpu0, received
+
+
+async def run_interactions(port, pid, repeat):
+    """
+    INTERACTIONS를 차례로 실행
+    Returns:
+        (이름, 응답 시간 리스트, CPU 시간 리스트, 받은 바이트 리스트) 리스트
+    """
+    rows = []
+    async with websockets.connect(f'ws://127.0.0.1:{port}/_stcore/stream', max_size=None) as ws:
+        session = Session(ws)
+        first = await measure(pid, session)
+        rows.append(('첫 화면', [first[0]], [first[1]], [first[2]]))
+
+        for kind, name in INTERACTIONS:
+            if name not in session.widgets:
+                continue
+            options = session.widgets[name]['options']
+            if kind == 'tab':
+                fragment_id = session.set_value(name, name)
+                result = await measure(pid, session, fragment_id)
+                rows.append((f"탭 열기: {name}", [result[0]], [result[1]], [result[2]]))
+                continue
+            if not options or len(options) < 2:
+                continue
+            times, cpus, sizes = [], [], []
+            for i in range(repeat):
+                fragment_id = session.set_value(name, options[(i + 1) % len(options)])
+                wall, cpu, size = await measure(pid, session, fragment_id)
+                times.append(wall)
+                cpus.append(cpu)
+                sizes.append(size)
+            rows.append((f"선택: {name}", times, cpus, sizes))
+        if session.exceptions:
+            print('스크립트 예외:', *session.exceptions, sep='\n  ')
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--script', default='main.py')
+    parser.add_argument('--repeat', type=int, default=10, help='선택 상자마다 값을 바꾸는 횟수')
+    args = parser.parse_args()
+
+    port = free_port()
+    proc = start_server(args.script, port)
+    try:
+        rows = asyncio.run(run_interactions(port, proc.pid, args.repeat))
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    print(f"[{args.script}] 상호작용마다 서버 CPU 시간 (평균, {args.repeat}번 반복)")
+    for name, times, cpus, sizes in rows:
+        print(f"  {name:<32} CPU {np.mean(cpus) * 1e3:8.1f}ms   응답 {np.median(times) * 1e3:8.1f}ms"
+              f"   수신 {np.mean(sizes) / 1024:8.1f}KB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+load_data 변환 벤치마크: 기존 iterrows 루프 vs 벡터화(wide_to_long)
+
+실행 (프로젝트 루트에서):
+    python -m benchmarks.bench_load
+    python -m benchmarks.bench_load --scale 100 --repeat 3
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from loader import wide_to_long, wide_to_long_loop
+
+
+DATA_PATH = "data/경찰청_범죄 발생 지역별 통계_20231231.csv"
+
+
+def make_synthetic(src_path, dst_path, scale, seed=0):
+    """
+    원본 CSV의 범죄 유형 행을 scale배로 늘린 합성 CSV 만들기
+    Args:
+        src_path: 원본 CSV 경로
+        dst_path: 저장할 경로
+        scale: 행 배수
+        seed: 난수 시드
+    Returns:
+        합성 CSV 경로
+    """
+    df_raw = pd.read_csv(src_path, encoding='cp949')
+    rng = np.random.default_rng(seed)
+    frames = []
+    for i in range(scale):
+        part = df_raw.copy()
+        part.iloc[:, 1] = part.iloc[:, 1].astype(str) + f'_{i}'
+        counts = part.iloc[:, 2:].to_numpy()
+        part.iloc[:, 2:] = rng.poisson(np.maximum(counts, 1)) * (counts > 0)
+        frames.append(part)
+    pd.concat(frames, ignore_index=True).to_csv(dst_path, index=False, encoding='cp949')
+    return dst_path
+
+
+def measure(func, path, repeat):
+    """
+    CSV 읽기 + 변환의 시간(중앙값)과 최대 메모리 측정
+    Args:
+        func: 변환 함수 (df_raw -> long DataFrame)
+        path: CSV 경로
+        repeat: 반복 횟수
+    Returns:
+        (중앙값 초, 최대 메모리 MB, 결과 DataFrame)
+    """
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        df = func(pd.read_csv(path, encoding='cp949'))
+        times.append(time.perf_counter() - t0)
+
+    tracemalloc.start()
+    df = func(pd.read_csv(path, encoding='cp949'))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return float(np.median(times)), peak / 1024 ** 2, df
+
+
+def run(path, label, repeat):
+    loop_t, loop_mem, loop_df = measure(wide_to_long_loop, path, repeat)
+    vec_t, vec_mem, vec_df = measure(wide_to_long, path, repeat)
+
+    # 두 결과가 같은지 확인 (문자열/정수로 맞춰서 비교)
+    same = loop_df.astype({'지역': str, '범죄유형': str, '발생건수': 'int64'}).equals(
+        vec_df.astype({'지역': str, '범죄유형': str, '발생건수': 'int64'}))
+    loop_size = loop_df.memory_usage(deep=True).sum() / 1024 ** 2
+    vec_size = vec_df.memory_usage(deep=True).sum() / 1024 ** 2
+
+    print(f"[{label}] 행 수: {len(vec_df):,}  결과 동일: {same}")
+    print(f"  iterrows 루프 : {loop_t:8.3f}s  최대 메모리 {loop_mem:8.1f}MB  결과 크기 {loop_size:7.2f}MB")
+    print(f"  벡터화        : {vec_t:8.3f}s  최대 메모리 {vec_mem:8.1f}MB  결과 크기 {vec_size:7.2f}MB")
+    print(f"  속도 {loop_t / vec_t:6.1f}배, 최대 메모리 {loop_mem / vec_mem:5.1f}배 감소")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--path', default=DATA_PATH)
+    parser.add_argument('--scale', type=int, default=100, help='합성 파일 배수')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    run(args.path, '원본 CSV', args.repeat)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        synthetic = make_synthetic(args.path, os.path.join(tmp, 'synthetic.csv'), args.scale)
+        run(synthetic, f'합성 CSV x{args.scale}', args.repeat)
+
+
+if __name__ == '__main__':
+    main()
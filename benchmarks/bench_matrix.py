@@ -0,0 +1,114 @@
+"""
+dense 행렬 엔진(CrimeCube) vs long format DataFrame 경로 비교
+메모리 사용량과 쿼리(합계, top-k, 필터, 피벗)마다의 지연 시간을 잰다.
+
+실행 (프로젝트 루트에서):
+    python -m benchmarks.bench_matrix
+    python -m benchmarks.bench_matrix --scale 100 --repeat 20
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from aggregates import CrimeCube
+from benchmarks.bench_load import DATA_PATH, make_synthetic
+from loader import read_raw, wide_to_long
+from sorting import fast_sort, top_k
+
+
+def dataframe_queries(df, region, crime):
+    """기존 DataFrame 경로 (매번 long 테이블에서 다시 계산)"""
+    return {
+        '지역별 합계': lambda: fast_sort(df.groupby('지역', observed=True)['발생건수'].sum().reset_index(),
+                                     key=['발생건수', '지역'], reverse=[True, False]),
+        '범죄유형별 합계': lambda: fast_sort(df.groupby('범죄유형', observed=True)['발생건수'].sum().reset_index(),
+                                       key=['발생건수', '범죄유형'], reverse=[True, False]),
+        'top 10': lambda: top_k(df, 10, '발생건수'),
+        '지역 필터': lambda: fast_sort(df[df['지역'] == region], key='발생건수', reverse=True),
+        '범죄유형 필터': lambda: fast_sort(df[df['범죄유형'] == crime], key='발생건수', reverse=True),
+        '피벗': lambda: df.pivot_table(values='발생건수', index='지역', columns='범죄유형',
+                                     aggfunc='sum', fill_value=0, observed=True),
+    }
+
+
+def cube_queries(cube, region, crime):
+    """행렬 경로 (캐시해 둔 표를 지워서 매번 새로 계산한 시간을 잰다)"""
+    def fresh(method):
+        def run():
+            cube._views.clear()
+            return method()
+        return run
+
+    return {
+        '지역별 합계': fresh(cube.region_totals),
+        '범죄유형별 합계': fresh(cube.crime_totals),
+        'top 10': lambda: cube.top_k(10),
+        '지역 필터': lambda: fast_sort(cube.filter(region=region), key='발생건수', reverse=True),
+        '범죄유형 필터': lambda: fast_sort(cube.filter(crime=crime), key='발생건수', reverse=True),
+        '피벗': fresh(cube.pivot),
+    }
+
+
+def median_time(func, repeat):
+    func()
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - t0)
+    return float(np.median(times))
+
+
+def cube_bytes(cube):
+    # 행렬 + 합계 배열 + 라벨 문자열 (intern되어 한 번씩만 셈)
+    labels = sum(sys.getsizeof(name) for name in cube.regions + cube.crimes)
+    return cube.nbytes() + labels
+
+
+def run(path, label, repeat):
+    df_raw, _, _ = read_raw(path)
+
+    t0 = time.perf_counter()
+    df = wide_to_long(df_raw)
+    long_build = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    cube = CrimeCube.from_wide(df_raw)
+    cube_build = time.perf_counter() - t0
+
+    region = cube.region_totals()['지역'].iloc[0]
+    crime = cube.crime_totals()['범죄유형'].iloc[0]
+
+    df_mem = df.memory_usage(deep=True).sum()
+    df_object_mem = df.astype({'지역': object, '범죄유형': object}).memory_usage(deep=True).sum()
+    print(f"[{label}] long 행 수 {len(df):,}, 행렬 {cube.matrix.shape[0]} x {cube.matrix.shape[1]}")
+    print(f"  만들기      : DataFrame {long_build * 1e3:8.2f}ms   행렬 {cube_build * 1e3:8.2f}ms")
+    print(f"  메모리      : DataFrame {df_mem / 1024:8.1f}KB (문자열 컬럼이면 {df_object_mem / 1024:.1f}KB)"
+          f"   행렬 {cube_bytes(cube) / 1024:8.1f}KB")
+
+    df_q = dataframe_queries(df, region, crime)
+    cube_q = cube_queries(cube, region, crime)
+    for name in df_q:
+        a = median_time(df_q[name], repeat)
+        b = median_time(cube_q[name], repeat)
+        print(f"  {name:<10}: DataFrame {a * 1e3:8.3f}ms   행렬 {b * 1e3:8.3f}ms   ({a / b:5.1f}배)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--path', default=DATA_PATH)
+    parser.add_argument('--scale', type=int, default=100, help='합성 파일 배수 (범죄 유형 행을 늘림)')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    run(args.path, '원본 CSV', args.repeat)
+    with tempfile.TemporaryDirectory() as tmp:
+        synthetic = make_synthetic(args.path, os.path.join(tmp, 'synthetic.csv'), args.scale)
+        run(synthetic, f'합성 CSV x{args.scale}', args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+동시 세션 수에 따른 서버 메모리(RSS) 부하 테스트
+
+streamlit 서버를 띄우고 웹소켓 세션을 단계별로 늘려 가며 (1, 5, 10, 25, 50개)
+각 세션이 첫 화면 -> 검색 탭 -> 지역 선택까지 한 뒤 연결을 유지한 상태에서
+서버 프로세스의 RSS(/proc/<pid>/status의 VmRSS)를 잰다 (Linux 전용).
+- sequential: 세션을 하나씩 열어서 세션마다 남는 메모리만 잰다.
+  데이터와 색인, 집계를 프로세스마다 한 번만 들고 있으면 세션 상태와 streamlit 자체 기록 정도만 남는다.
+- concurrent: 단계마다 새 세션을 한꺼번에 열어서 동시에 그릴 때의 최대 메모리까지 잰다.
+
+실행 (프로젝트 루트에서):
+    python -m benchmarks.bench_sessions
+    python -m benchmarks.bench_sessions --sessions 1 10 50 100 --modes concurrent
+"""
+import argparse
+import asyncio
+
+import websockets
+
+from benchmarks.bench_interactions import Session, free_port, start_server
+
+
+DEFAULT_SESSIONS = [1, 5, 10, 25, 50]
+MODES = ['sequential', 'concurrent']
+
+
+def process_rss(pid):
+    """프로세스의 RSS (바이트)"""
+    with open(f'/proc/{pid}/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) * 1024
+    raise RuntimeError('VmRSS를 읽을 수 없습니다.')
+
+
+async def open_session(port, number, stack):
+    """
+    세션 하나를 열고 검색까지 해 본 뒤 연결을 stack에 남겨 둠
+    Args:
+        number: 세션 번호 (세션마다 다른 지역을 고름)
+    """
+    ws = await websockets.connect(f'ws://127.0.0.1:{port}/_stcore/stream', max_size=None)
+    stack.append(ws)
+    session = Session(ws)
+    await session.rerun()
+    if '🔍 검색' in session.widgets:
+        await session.rerun(session.set_value('🔍 검색', '🔍 검색'))
+    if '지역 선택' in session.widgets:
+        options = session.widgets['지역 선택']['options']
+        await session.rerun(session.set_value('지역 선택', options[1 + number % (len(options) - 1)]))
+    return session
+
+
+async def run_load(port, pid, levels, mode):
+    """
+    levels 단계까지 세션을 늘리면서 RSS 측정
+    Args:
+        mode: 'sequential'(하나씩 열기) 또는 'concurrent'(단계마다 한꺼번에 열기)
+    Returns:
+        (세션 수, RSS 바이트) 리스트 (세션 0개일 때 포함)
+    """
+    rows = [(0, process_rss(pid))]
+    connections = []
+    try:
+        for level in levels:
+            numbers = range(len(connections), level)
+            if mode == 'concurrent':
+                await asyncio.gather(*(open_session(port, n, connections) for n in numbers))
+            else:
+                for n in numbers:
+                    await open_session(port, n, connections)
+            await asyncio.sleep(0.5)
+            rows.append((level, process_rss(pid)))
+    finally:
+        for ws in connections:
+            await ws.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--script', default='main.py')
+    parser.add_argument('--sessions', type=int, nargs='+', default=DEFAULT_SESSIONS)
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=MODES)
+    args = parser.parse_args()
+
+    for mode in args.modes:
+        # 모드마다 새 서버 (앞 모드에서 늘어난 메모리가 섞이지 않도록)
+        port = free_port()
+        proc = start_server(args.script, port)
+        try:
+            rows = asyncio.run(run_load(port, proc.pid, sorted(args.sessions), mode))
+        finally:
+            proc.terminate()
+            proc.wait()
+
+        print(f"[{args.script}, {mode}] 동시 세션 수별 서버 RSS")
+        base = rows[1][1] if len(rows) > 1 else rows[0][1]
+        for sessions, rss in rows:
+            per_session = (rss - base) / (sessions - 1) / 1024 if sessions > 1 else 0.0
+            print(f"  세션 {sessions:4d}개: RSS {rss / 2**20:8.1f}MB   (첫 세션 이후 세션당 {per_session:8.1f}KB)")
+
+
+if __name__ == '__main__':
+    main()
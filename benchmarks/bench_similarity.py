@@ -0,0 +1,77 @@
+"""
+지역 유사도 색인 만들기: 지역 쌍마다 파이썬 반복 vs 블록 행렬 곱 (SimilarityIndex)
+
+실제 데이터(지역 x 범죄유형)와, 실제 지역 프로필에 잡음을 섞어 지역 수를 늘린 합성 데이터로
+모든 지역의 상위 k개 이웃을 구하는 시간을 잰다. 파이썬 반복은 큰 입력에서 너무 오래 걸리므로
+--loop-max 지역 수까지만 잰다.
+
+실행 (프로젝트 루트에서):
+    python -m benchmarks.bench_similarity
+    python -m benchmarks.bench_similarity --sizes 1000 5000 20000 --block-rows 128 512
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+
+from aggregates import CrimeCube
+from similarity import BLOCK_ROWS, MAX_NEIGHBORS, SimilarityIndex
+from store import CrimeStore
+
+
+def synthetic_cube(cube, n, seed=0):
+    """실제 지역 프로필을 골라 잡음을 섞은 지역 n개짜리 CrimeCube"""
+    rng = np.random.default_rng(seed)
+    base = cube.matrix[rng.integers(0, cube.matrix.shape[0], n)].astype(np.float64)
+    matrix = np.rint(base * rng.uniform(0.5, 1.5, base.shape)).astype(np.int32)
+    return CrimeCube([f'지역{i:06d}' for i in range(n)], cube.crimes, matrix)
+
+
+def loop_neighbors(cube, k):
+    """지역 쌍마다 파이썬으로 코사인 유사도를 구하고 정렬 (비교용)"""
+    rows = cube.matrix.tolist()
+    norms = [math.sqrt(sum(v * v for v in row)) or 1.0 for row in rows]
+    result = []
+    for i, a in enumerate(rows):
+        sims = []
+        for j, b in enumerate(rows):
+            if i != j:
+                sims.append((-sum(x * y for x, y in zip(a, b)) / (norms[i] * norms[j]), cube.regions[j]))
+        sims.sort()
+        result.append(sims[:k])
+    return result
+
+
+def timeit(func):
+    t0 = time.perf_counter()
+    func()
+    return time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--data-dir', default='data')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 5000, 20000], help='합성 지역 수')
+    parser.add_argument('--block-rows', type=int, nargs='+', default=[BLOCK_ROWS])
+    parser.add_argument('--loop-max', type=int, default=1000, help='파이썬 반복을 잴 최대 지역 수')
+    args = parser.parse_args()
+
+    store = CrimeStore(args.data_dir)
+    store.refresh()
+    cube = store.cube(store.latest_year())
+
+    cubes = [('실제', cube)] + [(f'합성 {n:,}', synthetic_cube(cube, n)) for n in args.sizes]
+    for label, data in cubes:
+        n, d = data.matrix.shape
+        line = f"  {label:>10s} ({n:6,d} x {d}):"
+        if n <= args.loop_max:
+            line += f"  파이썬 반복 {timeit(lambda: loop_neighbors(data, MAX_NEIGHBORS)):8.3f}초"
+        for block_rows in args.block_rows:
+            seconds = timeit(lambda: SimilarityIndex(data, block_rows=block_rows))
+            line += f"  블록 곱({block_rows}행) {seconds:8.3f}초"
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,302 @@
+"""
+정렬 알고리즘 벤치마크 (Streamlit 없이 실행)
+
+sorting.py의 모든 정렬 함수를 입력 크기(10 ~ 10^6)와 입력 분포
+(무작위, 정렬됨, 역순, 중복 많음, 실제 발생건수)별로 측정하고
+중앙값/p95와 log-log 회귀로 구한 증가 차수를 JSON/CSV로 저장한다.
+대시보드는 저장된 결과만 읽어서 그린다.
+
+실행 (프로젝트 루트에서):
+    python -m benchmarks.bench_sort
+    python -m benchmarks.bench_sort --max-size 100000 --repeat 5 --budget 0.5
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import time
+
+import numpy as np
+import pandas as pd
+
+from cache import file_fingerprint
+from sorting import selection_sort, bubble_sort, insertion_sort, quick_sort, fast_sort
+from store import discover_files
+
+
+DATA_DIR = "data"
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+RESULTS_JSON = os.path.join(RESULTS_DIR, 'sort_benchmark.json')
+RESULTS_CSV = os.path.join(RESULTS_DIR, 'sort_benchmark.csv')
+
+ALGORITHMS = {
+    'quick': quick_sort,
+    'selection': selection_sort,
+    'insertion': insertion_sort,
+    'bubble': bubble_sort,
+    'fast': fast_sort,
+}
+ALGORITHM_NAMES = {
+    'quick': '퀵 정렬',
+    'selection': '선택 정렬',
+    'insertion': '삽입 정렬',
+    'bubble': '버블 정렬',
+    'fast': 'fast_sort (numpy)',
+}
+DISTRIBUTIONS = ['random', 'sorted', 'reversed', 'duplicates', 'real']
+DISTRIBUTION_NAMES = {
+    'random': '무작위',
+    'sorted': '이미 정렬됨',
+    'reversed': '역순',
+    'duplicates': '중복 많음',
+    'real': '실제 발생건수',
+}
+KINDS = ['list', 'frame']
+DEFAULT_SIZES = [10, 32, 100, 316, 1_000, 3_162, 10_000, 31_623, 100_000, 316_228, 1_000_000]
+
+
+def latest_data_path(data_dir=DATA_DIR):
+    """가장 최근 연도 통계 CSV 경로 (대시보드가 결과를 비교하는 파일)"""
+    files = discover_files(data_dir)
+    return files[max(files)]
+
+
+def load_real_counts(path=None):
+    """
+    실제 발생건수 분포 (0보다 큰 셀의 값들)
+    Args:
+        path: 원본 CSV 경로 (None이면 가장 최근 연도 파일)
+    Returns:
+        int64 numpy 배열
+    """
+    from loader import read_raw, wide_to_long
+
+    path = path or latest_data_path()
+    df_raw, _, _ = read_raw(path)
+    return wide_to_long(df_raw)['발생건수'].to_numpy(dtype=np.int64)
+
+
+def make_values(distribution, n, rng, real_counts):
+    """
+    입력 분포에 맞는 정수 n개 만들기
+    Args:
+        distribution: DISTRIBUTIONS 중 하나
+        n: 개수
+        rng: numpy Generator
+        real_counts: 실제 발생건수 배열 ('real'일 때 복원 추출)
+    Returns:
+        int64 numpy 배열
+    """
+    if distribution == 'random':
+        return rng.integers(0, 1_000_000, n)
+    if distribution == 'sorted':
+        return np.sort(rng.integers(0, 1_000_000, n))
+    if distribution == 'reversed':
+        return np.sort(rng.integers(0, 1_000_000, n))[::-1].copy()
+    if distribution == 'duplicates':
+        return rng.integers(0, 10, n)
+    if distribution == 'real':
+        return rng.choice(real_counts, n)
+    raise ValueError(f"알 수 없는 분포: {distribution}")
+
+
+def make_input(kind, values):
+    """
+    정렬 함수에 넘길 입력 만들기
+    Args:
+        kind: 'list'(정수 리스트) 또는 'frame'('발생건수' 컬럼 DataFrame)
+        values: make_values 결과
+    Returns:
+        (data, 정렬 함수에 넘길 kwargs) 튜플
+    """
+    if kind == 'list':
+        return values.tolist(), {}
+    frame = pd.DataFrame({'순번': np.arange(len(values)), '발생건수': values})
+    return frame, {'key': '발생건수'}
+
+
+def time_call(func, data, kwargs, warmup, repeat):
+    """
+    함수 실행 시간 측정 (perf_counter, warmup 후 repeat번)
+    Returns:
+        초 단위 측정값 리스트
+    """
+    for _ in range(warmup):
+        func(data, **kwargs)
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func(data, **kwargs)
+        times.append(time.perf_counter() - t0)
+    return times
+
+
+def run_benchmark(algorithms=None, sizes=None, distributions=None, kinds=None,
+                  repeat=5, warmup=1, budget=1.0, reverse=False, seed=0, progress=None):
+    """
+    벤치마크 실행
+    한 번 실행에 budget초가 넘게 걸린 (알고리즘, 분포, 종류)는 더 큰 크기를 건너뛴다.
+    Args:
+        algorithms: ALGORITHMS 키 리스트 (None이면 전부)
+        sizes: 입력 크기 리스트
+        distributions: 입력 분포 리스트
+        kinds: 'list', 'frame' 중 측정할 것
+        repeat: 반복 횟수
+        warmup: 측정 전 워밍업 횟수
+        budget: 한 번 실행 시간 상한 (초)
+        reverse: 내림차순 정렬로 측정할지
+        seed: 난수 시드
+        progress: progress(done, total, label) 콜백
+    Returns:
+        측정 결과 dict 리스트
+    """
+    algorithms = algorithms or list(ALGORITHMS)
+    sizes = sorted(sizes or DEFAULT_SIZES)
+    distributions = distributions or DISTRIBUTIONS
+    kinds = kinds or KINDS
+    real_counts = load_real_counts() if 'real' in distributions else None
+
+    total = len(algorithms) * len(distributions) * len(kinds) * len(sizes)
+    done = 0
+    records = []
+    for name in algorithms:
+        func = ALGORITHMS[name]
+        for distribution in distributions:
+            for kind in kinds:
+                over_budget = False
+                for n in sizes:
+                    done += 1
+                    if over_budget:
+                        continue
+                    if progress:
+                        progress(done, total, f"{name} / {distribution} / {kind} / n={n:,}")
+
+                    rng = np.random.default_rng(seed)
+                    data, kwargs = make_input(kind, make_values(distribution, n, rng, real_counts))
+                    kwargs['reverse'] = reverse
+
+                    # 먼저 한 번 재 보고 너무 느리면 반복 없이 기록만 하고 다음 크기는 건너뜀
+                    first = time_call(func, data, kwargs, 0, 1)
+                    if first[0] > budget:
+                        times = first
+                        over_budget = True
+                    else:
+                        times = time_call(func, data, kwargs, warmup, repeat)
+
+                    records.append({
+                        'algorithm': name,
+                        'distribution': distribution,
+                        'kind': kind,
+                        'reverse': reverse,
+                        'n': n,
+                        'runs': len(times),
+                        'median': float(np.median(times)),
+                        'p95': float(np.percentile(times, 95)),
+                        'min': float(np.min(times)),
+                    })
+    return records
+
+
+def fit_scaling(records, min_time=1e-5):
+    """
+    (알고리즘, 분포, 종류)마다 log(시간) = a * log(n) + b 회귀로 증가 차수 a 추정
+    측정 오차가 큰 아주 짧은 실행(min_time 미만)은 제외한다.
+    Returns:
+        dict 리스트 ({'algorithm', 'distribution', 'kind', 'exponent', 'coef', 'points'})
+    """
+    frame = pd.DataFrame(records)
+    fits = []
+    if frame.empty:
+        return fits
+    for (name, distribution, kind), group in frame.groupby(['algorithm', 'distribution', 'kind'], sort=False):
+        group = group[group['median'] >= min_time]
+        if len(group) < 3:
+            continue
+        exponent, intercept = np.polyfit(np.log(group['n']), np.log(group['median']), 1)
+        fits.append({
+            'algorithm': name,
+            'distribution': distribution,
+            'kind': kind,
+            'exponent': float(exponent),
+            'coef': float(np.exp(intercept)),
+            'points': int(len(group)),
+        })
+    return fits
+
+
+def write_results(records, fits, json_path=RESULTS_JSON, csv_path=RESULTS_CSV, settings=None):
+    """
+    결과를 JSON(전체)과 CSV(측정값 표)로 저장
+    """
+    os.makedirs(os.path.dirname(json_path), exist_ok=True)
+    payload = {
+        'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'settings': settings or {},
+        'results': records,
+        'fits': fits,
+    }
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False, indent=1)
+
+    os.makedirs(os.path.dirname(csv_path), exist_ok=True)
+    with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+        fields = ['algorithm', 'distribution', 'kind', 'reverse', 'n', 'runs', 'median', 'p95', 'min']
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(records)
+
+
+def load_results(json_path=RESULTS_JSON):
+    """
+    저장된 벤치마크 결과 읽기
+    Returns:
+        write_results가 저장한 dict, 파일이 없으면 None
+    """
+    if not os.path.exists(json_path):
+        return None
+    with open(json_path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--algorithms', nargs='+', choices=list(ALGORITHMS), default=list(ALGORITHMS))
+    parser.add_argument('--distributions', nargs='+', choices=DISTRIBUTIONS, default=DISTRIBUTIONS)
+    parser.add_argument('--kinds', nargs='+', choices=KINDS, default=KINDS)
+    parser.add_argument('--max-size', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--budget', type=float, default=1.0, help='한 번 실행 시간 상한(초), 넘으면 더 큰 크기는 건너뜀')
+    parser.add_argument('--reverse', action='store_true', help='내림차순 정렬로 측정')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', default=RESULTS_JSON)
+    parser.add_argument('--csv', default=RESULTS_CSV)
+    args = parser.parse_args()
+
+    sizes = [n for n in DEFAULT_SIZES if n <= args.max_size]
+    settings = {
+        'sizes': sizes, 'repeat': args.repeat, 'warmup': args.warmup,
+        'budget': args.budget, 'reverse': args.reverse, 'seed': args.seed,
+        'data_sha256': file_fingerprint(latest_data_path())['sha256'],
+    }
+
+    def progress(done, total, label):
+        print(f"[{done}/{total}] {label}", flush=True)
+
+    records = run_benchmark(args.algorithms, sizes, args.distributions, args.kinds,
+                            args.repeat, args.warmup, args.budget, args.reverse, args.seed, progress)
+    fits = fit_scaling(records)
+    write_results(records, fits, args.json, args.csv, settings)
+
+    print()
+    for fit in fits:
+        print(f"{fit['algorithm']:>10} {fit['distribution']:>10} {fit['kind']:>5}: "
+              f"시간 ~ n^{fit['exponent']:.2f} ({fit['points']}개 크기)")
+    print(f"\n저장: {args.json}\n      {args.csv}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+콜드 스타트 측정: import 시간, 스냅샷 읽기, 첫 화면까지 걸리는 시간을 따로 잰다
+
+- import:       새 파이썬 프로세스에서 모듈 하나를 import하는 시간 (그 모듈이 부르는 모듈 포함)
+- snapshot:     새 프로세스에서 스냅샷 파일을 확인하고 읽는 시간 (없으면 먼저 만듦)
+- first render: streamlit 서버를 새로 띄우고 첫 세션이 첫 화면을 다 받을 때까지
+                (스크립트의 import, 데이터 준비, 그리기 포함). 스냅샷을 켜고 끈
+                (CRIME_FINDER_SNAPSHOT=0) 두 경우와, 같은 프로세스의 두 번째 세션(첫 세션 바로 뒤,
+                백그라운드 데이터 로드 중)과 세 번째 세션(--settle초 뒤, 데이터를 다 읽은 뒤)을 함께 잰다.
+모두 --repeat번 재서 중앙값을 보여준다 (Linux, 디스크 캐시는 데워진 상태).
+
+실행 (프로젝트 루트에서):
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --repeat 5 --script main.py
+"""
+import argparse
+import asyncio
+import subprocess
+import sys
+import time
+
+import numpy as np
+import websockets
+
+from benchmarks.bench_interactions import Session, free_port, start_server
+
+
+MODULES = ['streamlit', 'pandas', 'plotly.express', 'store', 'figures', 'queries', 'snapshot']
+
+
+def run_python(code):
+    """새 파이썬 프로세스에서 code를 실행하고 마지막 줄 출력을 돌려줌"""
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return out.stdout.strip().splitlines()[-1]
+
+
+def import_time(module):
+    return float(run_python(f"import time; t = time.perf_counter(); import {module}; "
+                            f"print(time.perf_counter() - t)"))
+
+
+def snapshot_time():
+    return float(run_python("import time; t = time.perf_counter(); import snapshot; "
+                            "s = snapshot.load_snapshot('data'); assert s is not None; "
+                            "print(time.perf_counter() - t)"))
+
+
+async def first_render(port, settle):
+    """첫 세션, 바로 뒤 두 번째 세션, settle초 뒤 세 번째 세션이 첫 화면을 다 받을 때까지 걸린 시간 (초)"""
+    times = []
+    for n in range(3):
+        if n == 2:
+            await asyncio.sleep(settle)
+        t0 = time.perf_counter()
+        async with websockets.connect(f'ws://127.0.0.1:{port}/_stcore/stream', max_size=None) as ws:
+            session = Session(ws)
+            await session.rerun()
+            if session.exceptions:
+                raise RuntimeError('스크립트 예외: ' + ' / '.join(session.exceptions))
+        times.append(time.perf_counter() - t0)
+    return times
+
+
+def render_times(script, env, settle):
+    port = free_port()
+    proc = start_server(script, port, env=env)
+    try:
+        return asyncio.run(first_render(port, settle))
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--script', default='main.py')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--settle', type=float, default=3.0, help='세 번째 세션 전에 기다릴 시간 (초)')
+    args = parser.parse_args()
+
+    print("import (새 프로세스, 중앙값)")
+    for module in MODULES:
+        try:
+            seconds = np.median([import_time(module) for _ in range(args.repeat)])
+        except subprocess.CalledProcessError:
+            print(f"  {module:<16} (import 실패)")
+            continue
+        print(f"  {module:<16} {seconds * 1e3:8.1f}ms")
+
+    # 스냅샷이 없거나 오래됐으면 새로 만들어 둠
+    subprocess.run([sys.executable, 'snapshot.py'], check=True, stdout=subprocess.DEVNULL)
+    seconds = np.median([snapshot_time() for _ in range(args.repeat)])
+    print(f"snapshot 확인 + 읽기 (import 포함)   {seconds * 1e3:8.1f}ms")
+
+    print(f"first render [{args.script}] (서버 시작 후 세션 연결부터 첫 화면 끝까지, 중앙값)")
+    for label, env in [('스냅샷 사용', {}), ('스냅샷 끔', {'CRIME_FINDER_SNAPSHOT': '0'})]:
+        runs = np.array([render_times(args.script, env, args.settle) for _ in range(args.repeat)])
+        first, second, third = np.median(runs, axis=0) * 1e3
+        print(f"  {label:<10} 첫 세션 {first:8.1f}ms   바로 뒤 세션 {second:8.1f}ms   "
+              f"{args.settle:g}초 뒤 세션 {third:8.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""
+정렬 벤치마크를 백그라운드에서 실행하는 작업 관리자
+
+대시보드에서 버튼을 눌렀을 때만 실행된다. 알고리즘마다 별도 프로세스
+(python -m benchmarks.bench_sort --algorithms ...)로 돌려서 시간 제한을 넘기면
+프로세스를 종료하고 다음 알고리즘으로 넘어간다. 진행 상황은 자식 프로세스가
+출력하는 "[done/total] label" 줄을 읽어서 갱신한다.
+"""
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.bench_sort import ALGORITHMS, RESULTS_JSON, RESULTS_CSV, DEFAULT_SIZES, fit_scaling, write_results
+
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROGRESS_LINE = re.compile(r'^\[(\d+)/(\d+)\] (.*)$')
+
+
+class BenchmarkJob:
+    """프로세스 하나에 하나만 두고 모든 세션이 같이 쓰는 벤치마크 작업"""
+
+    def __init__(self, json_path=RESULTS_JSON, csv_path=RESULTS_CSV):
+        self.json_path = json_path
+        self.csv_path = csv_path
+        self._lock = threading.Lock()
+        self._thread = None
+        self._state = {
+            'status': 'idle',   # idle / running / done / error
+            'progress': 0.0,
+            'label': '',
+            'timeouts': [],
+            'error': None,
+            'started': None,
+            'finished': None,
+        }
+
+    def snapshot(self):
+        """현재 상태 복사본"""
+        with self._lock:
+            return dict(self._state, timeouts=list(self._state['timeouts']))
+
+    def is_running(self):
+        with self._lock:
+            return self._state['status'] == 'running'
+
+    def start(self, data_sha256, max_size=100_000, repeat=3, budget=1.0, timeout=120.0):
+        """
+        벤치마크 시작 (이미 실행 중이면 아무것도 하지 않음)
+        Args:
+            data_sha256: 현재 데이터 파일 해시 (결과에 기록해서 데이터가 바뀌면 무효 처리)
+            max_size: 최대 입력 크기
+            repeat: 반복 횟수
+            budget: 한 번 실행 시간 상한 (초)
+            timeout: 알고리즘 하나에 주는 전체 시간 제한 (초)
+        Returns:
+            새로 시작했으면 True
+        """
+        with self._lock:
+            if self._state['status'] == 'running':
+                return False
+            self._state.update(status='running', progress=0.0, label='시작 중', timeouts=[],
+                               error=None, started=time.time(), finished=None)
+        settings = {
+            'sizes': [n for n in DEFAULT_SIZES if n <= max_size],
+            'repeat': repeat,
+            'warmup': 1,
+            'budget': budget,
+            'timeout': timeout,
+            'reverse': False,
+            'seed': 0,
+            'data_sha256': data_sha256,
+        }
+        self._thread = threading.Thread(target=self._run, args=(settings,), daemon=True)
+        self._thread.start()
+        return True
+
+    def _set(self, **kwargs):
+        with self._lock:
+            self._state.update(kwargs)
+
+    def _run_algorithm(self, name, index, total, settings, tmp):
+        json_path = os.path.join(tmp, f'{name}.json')
+        cmd = [
+            sys.executable, '-m', 'benchmarks.bench_sort',
+            '--algorithms', name,
+            '--max-size', str(max(settings['sizes'])),
+            '--repeat', str(settings['repeat']),
+            '--budget', str(settings['budget']),
+            '--seed', str(settings['seed']),
+            '--json', json_path,
+            '--csv', os.path.join(tmp, f'{name}.csv'),
+        ]
+        proc = subprocess.Popen(cmd, cwd=PROJECT_DIR, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                text=True, encoding='utf-8')
+        timer = threading.Timer(settings['timeout'], proc.kill)
+        timer.start()
+        try:
+            for line in proc.stdout:
+                match = PROGRESS_LINE.match(line.strip())
+                if match:
+                    done, count, label = int(match.group(1)), int(match.group(2)), match.group(3)
+                    self._set(progress=(index + done / count) / total, label=label)
+            proc.wait()
+        finally:
+            timer.cancel()
+
+        if proc.returncode != 0 or not os.path.exists(json_path):
+            # 시간 제한으로 종료됐거나 실패 -> 이 알고리즘은 결과 없이 기록
+            with self._lock:
+                self._state['timeouts'].append(name)
+            return []
+        with open(json_path, encoding='utf-8') as f:
+            return json.load(f)['results']
+
+    def _run(self, settings):
+        try:
+            names = list(ALGORITHMS)
+            records = []
+            with tempfile.TemporaryDirectory() as tmp:
+                for index, name in enumerate(names):
+                    records.extend(self._run_algorithm(name, index, len(names), settings, tmp))
+            settings['timeouts'] = self.snapshot()['timeouts']
+            write_results(records, fit_scaling(records), self.json_path, self.csv_path, settings)
+            self._set(status='done', progress=1.0, label='완료', finished=time.time())
+        except Exception as e:
+            self._set(status='error', error=str(e), finished=time.time())
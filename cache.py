@@ -0,0 +1,138 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from aggregates import CrimeCube
+from profiling import timed
+
+
+# 변환된 지역 x 범죄유형 행렬을 디스크에 저장해 두는 캐시
+# 디렉터리 하나 = 원본 CSV 하나의 특정 버전 (크기 + mtime + 내용 해시)
+# 행렬은 .npy 파일로 저장하고 읽을 때는 memory map으로 열어서
+# 여러 서버 프로세스가 같은 페이지를 공유한다.
+CACHE_DIR = os.environ.get(
+    'CRIME_FINDER_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+)
+CACHE_FORMAT = 3
+META_FILE = 'meta.json'
+MATRIX_FILE = 'matrix.npy'
+
+
+def file_fingerprint(path, chunk_size=1 << 20):
+    """
+    원본 파일의 지문 (크기, 수정 시각, 내용 해시)
+    Args:
+        path: 파일 경로
+        chunk_size: 해시 계산 시 한 번에 읽을 바이트 수
+    Returns:
+        {'size', 'mtime_ns', 'sha256'} dict
+    """
+    stat = os.stat(path)
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': digest.hexdigest(),
+    }
+
+
+def _entry_prefix(path):
+    # 같은 원본 파일의 캐시 디렉터리들은 같은 접두사를 가진다
+    return hashlib.sha256(os.path.abspath(path).encode('utf-8')).hexdigest()[:12]
+
+
+def _entry_dir(path, fingerprint, cache_dir):
+    return os.path.join(cache_dir, f"{_entry_prefix(path)}-{fingerprint['sha256'][:16]}")
+
+
+def _remove_entry(entry):
+    shutil.rmtree(entry, ignore_errors=True)
+
+
+@timed('load.read_cache')
+def read_cache(path, cache_dir=None, fingerprint=None):
+    """
+    디스크 캐시에서 집계 행렬 읽기
+    캐시가 없거나 원본과 지문이 다르거나 깨져 있으면 None (깨진 캐시는 지움)
+    Args:
+        path: 원본 CSV 경로
+        cache_dir: 캐시 디렉터리 (None이면 CACHE_DIR)
+        fingerprint: 미리 계산한 file_fingerprint(path) 결과
+    Returns:
+        CrimeCube (행렬은 읽기 전용 memmap) 또는 None
+    """
+    cache_dir = cache_dir or CACHE_DIR
+    fingerprint = fingerprint or file_fingerprint(path)
+    entry = _entry_dir(path, fingerprint, cache_dir)
+    if not os.path.isdir(entry):
+        return None
+
+    try:
+        with open(os.path.join(entry, META_FILE), encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('format') != CACHE_FORMAT or meta.get('fingerprint') != fingerprint:
+            raise ValueError('stale cache')
+
+        matrix = np.load(os.path.join(entry, MATRIX_FILE), mmap_mode='r', allow_pickle=False)
+        if matrix.dtype != np.int32 or matrix.shape != (len(meta['regions']), len(meta['crimes'])):
+            raise ValueError('matrix shape mismatch')
+
+        return CrimeCube(meta['regions'], meta['crimes'], matrix, attrs=meta.get('attrs'))
+    except (OSError, ValueError, KeyError, TypeError):
+        # 깨졌거나 오래된 캐시 -> 지우고 다시 만들게 한다
+        _remove_entry(entry)
+        return None
+
+
+@timed('load.write_cache')
+def write_cache(path, cube, cache_dir=None, fingerprint=None):
+    """
+    집계 행렬을 디스크 캐시에 저장 (임시 디렉터리에 쓰고 rename)
+    같은 원본 파일의 예전 캐시는 지운다. 쓸 수 없는 환경이면 조용히 넘어간다.
+    Args:
+        path: 원본 CSV 경로
+        cube: CrimeCube
+        cache_dir: 캐시 디렉터리 (None이면 CACHE_DIR)
+        fingerprint: 미리 계산한 file_fingerprint(path) 결과
+    Returns:
+        저장 성공 여부
+    """
+    cache_dir = cache_dir or CACHE_DIR
+    fingerprint = fingerprint or file_fingerprint(path)
+    entry = _entry_dir(path, fingerprint, cache_dir)
+
+    meta = {
+        'format': CACHE_FORMAT,
+        'source': os.path.abspath(path),
+        'fingerprint': fingerprint,
+        'regions': list(cube.regions),
+        'crimes': list(cube.crimes),
+        'attrs': dict(cube.attrs),
+    }
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = tempfile.mkdtemp(dir=cache_dir, prefix='.tmp-')
+        try:
+            np.save(os.path.join(tmp, MATRIX_FILE), np.ascontiguousarray(cube.matrix, dtype=np.int32))
+            with open(os.path.join(tmp, META_FILE), 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False)
+
+            prefix = _entry_prefix(path) + '-'
+            for name in os.listdir(cache_dir):
+                if name.startswith(prefix):
+                    _remove_entry(os.path.join(cache_dir, name))
+            os.replace(tmp, entry)
+        finally:
+            _remove_entry(tmp)
+        return True
+    except OSError:
+        return False
@@ -0,0 +1,291 @@
+import functools
+import heapq
+import itertools
+import marshal
+import os
+import struct
+import sys
+import tempfile
+from operator import itemgetter
+
+import numpy as np
+import pandas as pd
+
+from profiling import span
+from sorting import fast_sort
+
+
+# 기본 메모리 상한 (정렬할 때 한 번에 들고 있는 행의 대략적인 크기)
+DEFAULT_MEMORY_LIMIT = 64 * 1024 * 1024
+# run 파일 한 블록의 행 수 (블록마다 컬럼별 리스트 하나를 marshal로 씀)
+BLOCK_ROWS = 1024
+# 한 번에 합치는 run 파일 수 (넘으면 여러 단계로 합침)
+MAX_FANIN = 64
+# 블록 앞에 붙이는 바이트 길이
+_LENGTH = struct.Struct('<Q')
+
+
+class _Descending:
+    """내림차순 비교용 래퍼 (문자열처럼 부호를 뒤집을 수 없는 키)"""
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+
+def _key_columns(frame, keys, reverses):
+    """
+    정렬된 run 조각 -> 병합 비교 키 컬럼들 (행마다 튜플로 묶으면 fast_sort와 같은 순서)
+    키마다 (결측 여부, 값) 두 컬럼을 만든다: 결측값은 항상 맨 뒤, 내림차순 숫자는 부호를 뒤집고
+    문자열처럼 뒤집을 수 없는 값은 그대로 두고 (marshal로 쓸 수 있게) 읽을 때 _Descending으로 감싼다.
+    튜플끼리의 비교는 C 안에서 끝나서 병합할 때 행마다 파이썬 키 함수를 부르지 않는다.
+    """
+    parts = []
+    for col, rev in zip(keys, reverses):
+        series = frame[col]
+        missing = series.isna().to_numpy()
+        if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+            values = series.to_numpy(dtype=np.float64, na_value=0.0) if missing.any() else series.to_numpy()
+            if rev:
+                # 부호 없는 정수는 뒤집으면 넘치므로 파이썬 정수로
+                values = [-v for v in values.tolist()] if values.dtype.kind == 'u' else (-values).tolist()
+            else:
+                values = values.tolist()
+        else:
+            values = series.astype(object).where(~missing, 0).tolist()
+        parts.append(missing.astype(np.int8).tolist())
+        parts.append(values)
+    return parts
+
+
+def _write_run(blocks, tmp_dir):
+    """정렬된 블록들을 run 파일 하나로 씀 ((길이, marshal 바이트)의 연속)"""
+    fd, path = tempfile.mkstemp(prefix='run-', suffix='.bin', dir=tmp_dir)
+    with os.fdopen(fd, 'wb') as f:
+        for block in blocks:
+            data = marshal.dumps(block)
+            f.write(_LENGTH.pack(len(data)))
+            f.write(data)
+    return path
+
+
+def _read_run(path):
+    """run 파일의 블록을 하나씩 읽음 (marshal.load(f)는 작은 read를 많이 불러서 느리므로 통째로 읽어 loads)"""
+    with open(path, 'rb') as f:
+        while True:
+            header = f.read(_LENGTH.size)
+            if not header:
+                return
+            yield marshal.loads(f.read(_LENGTH.unpack(header)[0]))
+
+
+def _frame_blocks(frame, keys, reverses):
+    # 정렬된 DataFrame -> (키 컬럼 리스트들, 데이터 컬럼 리스트들) 블록 (블록마다 변환해서 파이썬 객체를 조금씩만 만듦)
+    for start in range(0, len(frame), BLOCK_ROWS):
+        part = frame.iloc[start:start + BLOCK_ROWS]
+        yield (tuple(_key_columns(part, keys, reverses)),
+               tuple(part[col].tolist() for col in frame.columns))
+
+
+def _descending_parts(frame, keys, reverses):
+    # _Descending으로 감싸야 하는 키 컬럼 위치 (내림차순인 숫자가 아닌 키의 값 컬럼)
+    return [2 * i + 1 for i, (col, rev) in enumerate(zip(keys, reverses))
+            if rev and not (pd.api.types.is_numeric_dtype(frame[col].dtype)
+                            and not pd.api.types.is_bool_dtype(frame[col].dtype))]
+
+
+def _frame_rows(path, wrap=()):
+    # (키 튜플, 행 튜플) 스트림
+    for key_cols, cols in _read_run(path):
+        key_cols = list(key_cols)
+        for i in wrap:
+            key_cols[i] = [_Descending(v) for v in key_cols[i]]
+        yield from zip(zip(*key_cols), zip(*cols))
+
+
+def _row_blocks(rows, wrap=()):
+    # (키 튜플, 행 튜플) 스트림 -> 블록 (다단계 병합에서 다시 쓸 때, 감싼 키는 다시 벗김)
+    rows = iter(rows)
+    while True:
+        chunk = list(itertools.islice(rows, BLOCK_ROWS))
+        if not chunk:
+            return
+        key_rows, data_rows = zip(*chunk)
+        key_cols = [list(col) for col in zip(*key_rows)]
+        for i in wrap:
+            key_cols[i] = [v.value for v in key_cols[i]]
+        yield tuple(key_cols), tuple(list(col) for col in zip(*data_rows))
+
+
+def _block_bytes(block):
+    """marshal에서 읽은 블록 하나가 메모리에서 차지하는 대략적인 크기 (공유 객체도 따로 셈)"""
+    if isinstance(block, tuple):
+        return sys.getsizeof(block) + sum(_block_bytes(item) for item in block)
+    if isinstance(block, list):
+        return sys.getsizeof(block) + sum(sys.getsizeof(item) for item in block)
+    return sys.getsizeof(block)
+
+
+def _value_blocks(values):
+    values = iter(values)
+    while True:
+        chunk = list(itertools.islice(values, BLOCK_ROWS))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _value_rows(path):
+    for block in _read_run(path):
+        yield from block
+
+
+def _merge_runs(paths, read_rows, key, reverse, to_blocks, tmp_dir, fanin=MAX_FANIN):
+    """
+    run 파일이 fanin개보다 많으면 fanin개씩 합쳐서 더 큰 run으로 다시 씀
+    Returns:
+        최종 병합에 쓸 run 파일 경로 리스트 (fanin개 이하)
+    """
+    while len(paths) > fanin:
+        merged = []
+        for start in range(0, len(paths), fanin):
+            group = paths[start:start + fanin]
+            rows = heapq.merge(*(read_rows(path) for path in group), key=key, reverse=reverse)
+            merged.append(_write_run(to_blocks(rows), tmp_dir))
+            for path in group:
+                os.remove(path)
+        paths = merged
+    return paths
+
+
+def _external_sort_frames(chunks, key, reverse, memory_limit, chunk_rows, tmp_dir):
+    first = next(chunks)
+    columns = list(first.columns)
+    keys = columns if key is None else ([key] if isinstance(key, str) else list(key))
+    reverses = [reverse] * len(keys) if isinstance(reverse, bool) else list(reverse)
+    if len(reverses) != len(keys):
+        raise ValueError(f"reverse 개수({len(reverses)})가 key 개수({len(keys)})와 다릅니다.")
+
+    # 범주형은 라벨 문자열로 (run 안 정렬과 병합이 같은 기준으로 비교하도록)
+    categorical = [col for col in columns if isinstance(first[col].dtype, pd.CategoricalDtype)]
+    dtypes = {col: first[col].dtype for col in columns if col not in categorical}
+
+    def normalize(frame):
+        if list(frame.columns) != columns:
+            raise ValueError(f"모든 조각의 컬럼이 같아야 합니다: {list(frame.columns)} != {columns}")
+        return frame.astype({col: object for col in categorical}) if categorical else frame
+
+    # 정렬하는 동안 입력과 정렬된 사본을 같이 들고 있으므로 버퍼는 상한의 절반까지
+    buffer_limit = memory_limit // 2
+    paths, buffer, buffered = [], [], 0
+
+    def spill():
+        with span('sort.external_run'):
+            run = fast_sort(pd.concat(buffer, ignore_index=True), key=keys, reverse=reverses)
+            paths.append(_write_run(_frame_blocks(run, keys, reverses), tmp_dir))
+
+    for chunk in itertools.chain([first], chunks):
+        chunk = normalize(chunk)
+        if chunk.empty:
+            continue
+        buffer.append(chunk)
+        buffered += int(chunk.memory_usage(index=False, deep=True).sum())
+        if buffered >= buffer_limit:
+            spill()
+            buffer, buffered = [], 0
+    if buffer:
+        spill()
+        buffer = []
+    if not paths:
+        return
+
+    # 병합할 때는 run마다 블록 하나씩 들고 있으므로 블록 크기로 한 번에 합칠 run 수를 정함
+    block_bytes = _block_bytes(next(_read_run(paths[0])))
+    fanin = max(2, min(MAX_FANIN, memory_limit // (2 * block_bytes)))
+    wrap = _descending_parts(first, keys, reverses)
+    read_rows = functools.partial(_frame_rows, wrap=wrap)
+    to_blocks = functools.partial(_row_blocks, wrap=wrap)
+    paths = _merge_runs(paths, read_rows, itemgetter(0), False, to_blocks, tmp_dir, fanin)
+    rows = heapq.merge(*(read_rows(path) for path in paths), key=itemgetter(0))
+    while True:
+        chunk = [row for _, row in itertools.islice(rows, chunk_rows)]
+        if not chunk:
+            return
+        frame = pd.DataFrame.from_records(chunk, columns=columns)
+        yield frame.astype({col: dtype for col, dtype in dtypes.items() if frame[col].dtype != dtype})
+
+
+def _item_bytes(value):
+    """값 하나가 버퍼에서 차지하는 대략적인 크기 (리스트 칸 8바이트 + 객체, 튜플이면 원소까지)"""
+    size = 8 + sys.getsizeof(value)
+    if isinstance(value, tuple):
+        size += sum(sys.getsizeof(item) for item in value)
+    return size
+
+
+def _external_sort_values(values, key, reverse, memory_limit, tmp_dir):
+    # 정렬하는 동안 키 리스트도 같이 들고 있으므로 버퍼는 상한의 절반까지 (값마다 바이트 수를 셈)
+    buffer_limit = memory_limit // 2
+    paths = []
+    while True:
+        buffer, buffered = [], 0
+        for value in values:
+            buffer.append(value)
+            buffered += _item_bytes(value)
+            if buffered >= buffer_limit:
+                break
+        if not buffer:
+            break
+        with span('sort.external_run'):
+            buffer.sort(key=key, reverse=reverse)
+            paths.append(_write_run(_value_blocks(buffer), tmp_dir))
+        del buffer
+
+    # 병합할 때는 run마다 블록 하나씩 들고 있으므로 블록 크기로 한 번에 합칠 run 수를 정함
+    block_bytes = _block_bytes(next(_read_run(paths[0])))
+    fanin = max(2, min(MAX_FANIN, memory_limit // (2 * block_bytes)))
+    paths = _merge_runs(paths, _value_rows, key, reverse, _value_blocks, tmp_dir, fanin)
+    yield from heapq.merge(*(_value_rows(path) for path in paths), key=key, reverse=reverse)
+
+
+def external_sort(data, key=None, reverse=False, memory_limit=DEFAULT_MEMORY_LIMIT,
+                  chunk_rows=8192, tmp_dir=None):
+    """
+    메모리보다 큰 입력을 위한 외부 병합 정렬 (fast_sort와 같은 key/reverse 사용법, 안정 정렬)
+    입력을 memory_limit 크기의 조각으로 나눠 정렬한 run을 임시 파일(marshal 블록)로 내려 쓰고,
+    heapq로 k-way 병합하면서 결과를 generator로 흘려보낸다.
+    Args:
+        data: DataFrame, DataFrame 조각들의 iterable (예: pd.read_csv(chunksize=...)),
+              또는 값들의 iterable (리스트 정렬처럼 key는 키 함수)
+        key: DataFrame이면 컬럼명 또는 컬럼명 리스트 (None이면 모든 컬럼), 값이면 키 함수
+        reverse: True면 내림차순, DataFrame은 컬럼마다 다르게 하려면 bool 리스트
+        memory_limit: 한 run에 담을 데이터 크기 상한 (바이트, sys.getsizeof와 pandas memory_usage로 잰
+                      대략적인 값이라 실제 최대 메모리는 이보다 조금 클 수 있음)
+        chunk_rows: DataFrame 결과 조각 하나의 행 수
+        tmp_dir: run 파일을 둘 폴더 (None이면 시스템 임시 폴더)
+    Returns:
+        DataFrame 입력이면 정렬된 DataFrame 조각들, 값 입력이면 정렬된 값들을 내는 generator
+        (범주형 컬럼은 문자열 컬럼으로 나옴)
+    """
+    if isinstance(data, pd.DataFrame):
+        frame = data
+        data = (frame.iloc[start:start + chunk_rows] for start in range(0, len(frame), chunk_rows))
+    items = iter(data)
+    try:
+        first = next(items)
+    except StopIteration:
+        return
+    items = itertools.chain([first], items)
+
+    with tempfile.TemporaryDirectory(prefix='crime-sort-', dir=tmp_dir) as run_dir:
+        if isinstance(first, pd.DataFrame):
+            rows = _external_sort_frames(items, key, reverse, memory_limit, chunk_rows, run_dir)
+        else:
+            rows = _external_sort_values(items, key, reverse, memory_limit, run_dir)
+        yield from rows
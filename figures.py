@@ -0,0 +1,184 @@
+import numpy as np
+import pandas as pd
+
+from loader import COUNT_COL, CRIME_COL, REGION_COL, SIDO_COL, SIGUNGU_COL
+from sorting import fast_sort
+
+
+# 단순화 모드에서 작은 범주를 모아 두는 라벨
+OTHER_LABEL = '기타'
+
+
+def _px():
+    # plotly.express는 import가 무거우므로 (첫 화면은 스냅샷의 차트 spec으로 그림) 차트를 처음 만들 때 import
+    import plotly.express as px
+    return px
+
+
+def reduce_categories(frame, label_col, value_col=COUNT_COL, top_n=None, min_share=None, other_label=OTHER_LABEL):
+    """
+    범주가 많은 표를 상위 범주 + '기타' 한 줄로 줄이기 (같은 라벨이 여러 줄이면 먼저 합침)
+    Args:
+        frame: label_col, value_col 컬럼이 있는 DataFrame
+        label_col: 범주 컬럼
+        value_col: 값 컬럼
+        top_n: 남길 범주 수 (None이면 제한 없음)
+        min_share: 전체 합계에서 이 비율 미만인 범주는 '기타'로 (None이면 제한 없음)
+        other_label: 모은 범주의 라벨
+    Returns:
+        label_col, value_col DataFrame (값 많은 순, '기타'는 맨 끝)
+    """
+    totals = frame.groupby(label_col, observed=True, sort=False)[value_col].sum().reset_index()
+    totals[label_col] = totals[label_col].astype(object)
+    totals = fast_sort(totals, key=[value_col, label_col], reverse=[True, False])
+
+    keep = np.ones(len(totals), dtype=bool)
+    if top_n is not None:
+        keep[top_n:] = False
+    if min_share is not None:
+        values = totals[value_col].to_numpy()
+        keep &= values >= min_share * values.sum()
+    if keep.all():
+        return totals
+
+    other = pd.DataFrame({label_col: [other_label], value_col: [totals[value_col][~keep].sum()]})
+    return pd.concat([totals[keep], other], ignore_index=True)
+
+
+def _reduce(frame, label_col, reduction):
+    # reduction: None 또는 (top_n, min_share)
+    if reduction is None:
+        return frame
+    top_n, min_share = reduction
+    return reduce_categories(frame, label_col, top_n=top_n, min_share=min_share)
+
+
+def top_combinations_figure(top_combinations):
+    """가장 많이 발생한 지역-범죄 조합 가로 막대 그래프"""
+    fig = _px().bar(
+        top_combinations,
+        x=COUNT_COL,
+        y=REGION_COL,
+        color=CRIME_COL,
+        orientation='h',
+        title='지역별 범죄 발생 건수 (Top 10)',
+        labels={COUNT_COL: '발생 건수', REGION_COL: '지역', CRIME_COL: '범죄 유형'},
+        height=500
+    )
+    fig.update_layout(yaxis={'categoryorder': 'total ascending'})
+    return fig
+
+
+def region_totals_figure(region_total, reduction=None):
+    """지역별 총 범죄 발생 건수 막대 그래프 (reduction이 있으면 상위 지역 + 기타)"""
+    region_total = _reduce(region_total, REGION_COL, reduction)
+    fig = _px().bar(
+        x=region_total[REGION_COL],
+        y=region_total[COUNT_COL],
+        title='지역별 총 범죄 발생 건수',
+        labels={'x': '지역', 'y': '총 발생 건수'}
+    )
+    fig.update_xaxes(tickangle=-45)
+    return fig
+
+
+def sido_totals_figure(sido_total):
+    """시도별 총 범죄 발생 건수 막대 그래프"""
+    return _px().bar(
+        sido_total,
+        x=SIDO_COL,
+        y=COUNT_COL,
+        title='시도별 총 범죄 발생 건수',
+        labels={COUNT_COL: '총 발생 건수'}
+    )
+
+
+def district_totals_figure(district_total, sido, reduction=None):
+    """한 시도의 시군구별 총 범죄 발생 건수 막대 그래프"""
+    district_total = _reduce(district_total, SIGUNGU_COL, reduction)
+    fig = _px().bar(
+        district_total,
+        x=SIGUNGU_COL,
+        y=COUNT_COL,
+        title=f'{sido} 시군구별 총 범죄 발생 건수',
+        labels={COUNT_COL: '총 발생 건수'}
+    )
+    fig.update_xaxes(tickangle=-45)
+    return fig
+
+
+def crime_share_figure(crime_total, reduction=None):
+    """범죄 유형별 비율 파이 차트 (reduction이 있으면 작은 조각을 기타로)"""
+    crime_total = _reduce(crime_total, CRIME_COL, reduction)
+    return _px().pie(
+        values=crime_total[COUNT_COL],
+        names=crime_total[CRIME_COL],
+        title='범죄 유형별 비율'
+    )
+
+
+def search_figure(result, label_col, title, reduction=None):
+    """
+    검색 결과 막대 그래프
+    막대 색이 x축 범주와 같으므로 같은 범주의 여러 줄은 한 막대로 합쳐서 그린다 (모양은 같고 데이터는 작음).
+    Args:
+        result: SearchIndex.search 결과
+        label_col: x축이자 색으로 쓸 컬럼 ('지역' 또는 '범죄유형')
+        title: 그래프 제목
+        reduction: None 또는 (top_n, min_share)
+    """
+    totals = reduce_categories(result, label_col)
+    totals = _reduce(totals, label_col, reduction)
+    return _px().bar(totals, x=label_col, y=COUNT_COL, color=label_col, title=title)
+
+
+def benchmark_figure(bench_df, title):
+    """정렬 시간 중앙값 log-log 그래프"""
+    return _px().line(
+        bench_df,
+        x='n',
+        y='median',
+        color='알고리즘',
+        line_dash='데이터',
+        markers=True,
+        log_x=True,
+        log_y=True,
+        title=title,
+        labels={'n': '입력 크기', 'median': '시간 (초)'}
+    )
+
+
+def similar_regions_figure(similar, region):
+    """선택한 지역과 범죄 구성이 비슷한 지역들의 코사인 유사도 가로 막대 그래프"""
+    fig = _px().bar(
+        similar,
+        x='유사도',
+        y=REGION_COL,
+        orientation='h',
+        title=f'{region}와 범죄 구성이 비슷한 지역',
+        hover_data=[COUNT_COL],
+    )
+    fig.update_layout(yaxis={'categoryorder': 'total ascending'})
+    fig.update_xaxes(range=[max(0.0, float(similar['유사도'].min()) - 0.05) if len(similar) else 0.0, 1.0])
+    return fig
+
+
+def profile_comparison_figure(profile, top_n=10):
+    """
+    지역들의 범죄 유형별 비율 비교 묶음 막대 그래프
+    Args:
+        profile: SimilarityIndex.profile 결과 (첫 행이 기준 지역)
+        top_n: 기준 지역에서 비율이 큰 범죄 유형 몇 개만
+    """
+    crimes = profile.iloc[0].nlargest(top_n).index
+    shares = profile[crimes].rename_axis(REGION_COL).reset_index().melt(
+        id_vars=REGION_COL, var_name=CRIME_COL, value_name='비율'
+    )
+    return _px().bar(
+        shares,
+        x=CRIME_COL,
+        y='비율',
+        color=REGION_COL,
+        barmode='group',
+        title='범죄 유형별 비율 비교 (기준 지역 상위 유형)',
+    )
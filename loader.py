@@ -0,0 +1,235 @@
+import codecs
+import io
+
+import numpy as np
+import pandas as pd
+
+from profiling import timed
+
+
+# long format 컬럼 이름
+REGION_COL = '지역'
+CRIME_COL = '범죄유형'
+COUNT_COL = '발생건수'
+LONG_COLUMNS = [REGION_COL, CRIME_COL, COUNT_COL]
+SIDO_COL = '시도'
+SIGUNGU_COL = '시군구'
+YEAR_COL = '연도'
+
+# 지역 컬럼 이름 앞부분 -> 시도 (긴 것부터 비교해야 '경기도광주시'가 '광주'로 잡히지 않음)
+# '세종시'처럼 시군구가 없는 곳은 시군구도 시도 이름과 같게 둔다.
+SIDO_PREFIXES = [
+    '경기도', '강원도', '세종시',
+    '서울', '부산', '대구', '인천', '광주', '대전', '울산',
+    '충북', '충남', '전북', '전남', '경북', '경남', '제주', '외국',
+]
+UNKNOWN_SIDO = '기타'
+
+# 인코딩 판별에 쓰는 앞부분 크기와 후보 (euc-kr은 cp949의 부분집합이라 cp949로 충분)
+SNIFF_BYTES = 64 * 1024
+LEGACY_ENCODINGS = ['cp949']
+
+
+class DataLoadError(ValueError):
+    """데이터 파일을 읽거나 해석할 수 없을 때 발생하는 예외"""
+
+
+def _decodes(sample, encoding, final):
+    # 앞부분만 잘라 읽은 경우 마지막 멀티바이트 문자가 잘려 있을 수 있어서
+    # final=False인 증분 디코더로 검사한다
+    try:
+        codecs.getincrementaldecoder(encoding)().decode(sample, final=final)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+def sniff_encoding(sample, complete=False):
+    """
+    파일 앞부분 바이트로 인코딩 판별
+    Args:
+        sample: 파일 앞부분 바이트
+        complete: sample이 파일 전체이면 True
+    Returns:
+        (인코딩 이름, 판별 이유) 튜플
+    Raises:
+        DataLoadError: 어떤 후보로도 해석할 수 없을 때
+    """
+    if sample.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig', 'UTF-8 BOM이 있음'
+    if _decodes(sample, 'utf-8', complete):
+        if sample.isascii():
+            return 'utf-8', '모든 바이트가 ASCII'
+        return 'utf-8', f'앞부분 {len(sample):,}바이트가 올바른 UTF-8'
+    for encoding in LEGACY_ENCODINGS:
+        if _decodes(sample, encoding, complete):
+            return encoding, f'UTF-8로 해석할 수 없고 앞부분 {len(sample):,}바이트가 {encoding}로 해석됨'
+    raise DataLoadError(
+        f"인코딩을 판별할 수 없습니다: 앞부분 {len(sample):,}바이트가 "
+        f"UTF-8, {', '.join(LEGACY_ENCODINGS)} 어느 것으로도 해석되지 않습니다."
+    )
+
+
+@timed('load.read_raw')
+def read_raw(path, sniff_bytes=SNIFF_BYTES):
+    """
+    CSV 파일을 한 번만 읽고 한 번만 디코딩해서 원본 DataFrame 만들기
+    Args:
+        path: CSV 파일 경로
+        sniff_bytes: 인코딩 판별에 쓸 앞부분 크기
+    Returns:
+        (원본 DataFrame, 인코딩 이름, 판별 이유) 튜플
+    Raises:
+        DataLoadError: 파일을 읽을 수 없거나 디코딩/파싱에 실패했을 때
+    """
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read()
+    except OSError as e:
+        raise DataLoadError(f"데이터 파일을 열 수 없습니다: {path} ({e})") from e
+
+    encoding, reason = sniff_encoding(raw[:sniff_bytes], complete=len(raw) <= sniff_bytes)
+    try:
+        text = raw.decode(encoding)
+    except UnicodeDecodeError as e:
+        text = None
+        if encoding == 'utf-8':
+            # 앞부분이 ASCII뿐이면 UTF-8로 판별되므로 뒤에 cp949 바이트가 나오면 전체를 다시 시도
+            for legacy in LEGACY_ENCODINGS:
+                try:
+                    text = raw.decode(legacy)
+                except UnicodeDecodeError:
+                    continue
+                encoding, reason = legacy, f'{e.start:,}번째 바이트부터 UTF-8이 아니고 파일 전체가 {legacy}로 해석됨'
+                break
+        if text is None:
+            raise DataLoadError(
+                f"{encoding}로 판별했지만({reason}) {e.start:,}번째 바이트에서 디코딩에 실패했습니다: {e.reason}"
+            ) from e
+
+    try:
+        df_raw = pd.read_csv(io.StringIO(text))
+    except (pd.errors.ParserError, pd.errors.EmptyDataError) as e:
+        raise DataLoadError(f"CSV 형식을 해석할 수 없습니다: {path} ({e})") from e
+
+    if df_raw.shape[1] < 3:
+        raise DataLoadError(
+            f"컬럼이 부족합니다: 범죄대분류, 범죄중분류, 지역 컬럼이 필요하지만 {df_raw.shape[1]}개뿐입니다."
+        )
+    return df_raw, encoding, reason
+
+
+def split_region(name):
+    """
+    '서울종로구' 같은 지역 이름을 (시도, 시군구)로 나누기
+    Args:
+        name: 지역 컬럼 이름
+    Returns:
+        (시도, 시군구) 튜플, 알 수 없는 앞부분이면 ('기타', name)
+    """
+    for prefix in SIDO_PREFIXES:
+        if name.startswith(prefix):
+            rest = name[len(prefix):]
+            return prefix, rest or name
+    return UNKNOWN_SIDO, name
+
+
+def crime_names(df_raw):
+    """
+    범죄 유형 이름 만들기 (범죄대분류 + 범죄중분류, 대분류가 없으면 중분류만)
+    Args:
+        df_raw: 원본 wide format DataFrame (0번: 범죄대분류, 1번: 범죄중분류)
+    Returns:
+        범죄 유형 이름 numpy 배열 (원본 행 순서)
+    """
+    category = df_raw.iloc[:, 0]
+    crime_type = df_raw.iloc[:, 1].astype(str)
+    names = np.where(
+        category.notna(),
+        category.astype(str) + ' - ' + crime_type,
+        crime_type
+    )
+    return np.asarray(names, dtype=object)
+
+
+def count_matrix(df_raw):
+    """
+    지역별 발생 건수 부분(2번 컬럼부터)을 숫자 행렬로 바꾸기
+    숫자로 바꿀 수 없는 칸과 빈 칸은 NaN, 소수는 int()처럼 버림 처리한다.
+    Args:
+        df_raw: 원본 wide format DataFrame
+    Returns:
+        (범죄 유형 수, 지역 수) float64 numpy 배열
+    """
+    values = df_raw.iloc[:, 2:].apply(pd.to_numeric, errors='coerce')
+    return np.trunc(values.to_numpy(dtype=np.float64, na_value=np.nan))
+
+
+@timed('transform.wide_to_long')
+def wide_to_long(df_raw):
+    """
+    wide format(범죄 유형 x 지역) 원본을 long format으로 변환 (벡터화 버전)
+    셀마다 dict를 만들지 않고 NumPy 마스크로 0보다 큰 칸만 한 번에 골라낸다.
+    Args:
+        df_raw: 원본 wide format DataFrame
+    Returns:
+        '지역', '범죄유형'(category), '발생건수'(int32) 컬럼을 가진 DataFrame
+    """
+    names = crime_names(df_raw)
+    regions = np.asarray([str(col).strip() for col in df_raw.columns[2:]], dtype=object)
+    values = count_matrix(df_raw)
+
+    # NaN 비교는 False라서 0보다 큰 칸만 남는다 (행 우선 순서 = 기존 루프 순서)
+    with np.errstate(invalid='ignore'):
+        mask = values > 0
+    crime_idx, region_idx = np.nonzero(mask)
+
+    crime_codes, crime_labels = pd.factorize(names)
+    region_codes, region_labels = pd.factorize(regions)
+
+    return pd.DataFrame({
+        REGION_COL: pd.Categorical.from_codes(region_codes[region_idx], region_labels).remove_unused_categories(),
+        CRIME_COL: pd.Categorical.from_codes(crime_codes[crime_idx], crime_labels).remove_unused_categories(),
+        COUNT_COL: values[mask].astype(np.int32),
+    })
+
+
+def wide_to_long_loop(df_raw):
+    """
+    기존 iterrows 기반 변환 (벤치마크 비교용으로 남겨 둠)
+    Args:
+        df_raw: 원본 wide format DataFrame
+    Returns:
+        '지역', '범죄유형', '발생건수' 컬럼을 가진 DataFrame
+    """
+    # 첫 번째 컬럼: 범죄대분류, 두 번째 컬럼: 범죄중분류
+    # 나머지 컬럼들: 각 지역별 발생 건수
+    crime_category_col = df_raw.columns[0]  # 범죄대분류
+    crime_type_col = df_raw.columns[1]      # 범죄중분류
+
+    data_list = []
+
+    for idx, row in df_raw.iterrows():
+        crime_category = row[crime_category_col]
+        crime_type = row[crime_type_col]
+
+        # 범죄 유형: 범죄대분류 + 범죄중분류 (또는 범죄중분류만)
+        crime_name = f"{crime_category} - {crime_type}" if pd.notna(crime_category) else str(crime_type)
+
+        # 나머지 컬럼들을 순회하며 지역별 발생 건수 수집
+        for col in df_raw.columns[2:]:
+            region_name = str(col).strip()
+
+            if pd.notna(row[col]) and str(row[col]).strip() != '':
+                try:
+                    count = int(row[col])
+                    if count > 0:  # 0보다 큰 값만 저장
+                        data_list.append({
+                            REGION_COL: region_name,
+                            CRIME_COL: crime_name,
+                            COUNT_COL: count
+                        })
+                except (ValueError, TypeError):
+                    continue
+
+    return pd.DataFrame(data_list)
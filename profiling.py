@@ -0,0 +1,147 @@
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+
+# CRIME_FINDER_PROFILE=1 일 때만 측정 (꺼져 있으면 span은 빈 컨텍스트, timed는 함수를 그대로 돌려줌)
+ENABLED = os.environ.get('CRIME_FINDER_PROFILE', '').lower() in ('1', 'true', 'yes', 'on')
+LOG_PATH = os.environ.get(
+    'CRIME_FINDER_PROFILE_LOG',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'profile.jsonl')
+)
+
+_NULL = nullcontext()
+_current = contextvars.ContextVar('profile_run', default=None)
+_log_lock = threading.Lock()
+
+
+class Run:
+    """
+    한 번의 실행(rerun, fragment rerun, 백그라운드 작업)에서 모은 구간별 시간
+    spans[이름] = [호출 수, 합계 초, 최대 초]
+    """
+
+    def __init__(self, label, **fields):
+        self.label = label
+        self.fields = fields
+        self.spans = {}
+        self.started = time.perf_counter()
+        self.elapsed = None
+
+    def add(self, name, seconds):
+        stat = self.spans.get(name)
+        if stat is None:
+            self.spans[name] = [1, seconds, seconds]
+        else:
+            stat[0] += 1
+            stat[1] += seconds
+            stat[2] = max(stat[2], seconds)
+
+    def summary(self):
+        """
+        구간별 요약 (합계 시간 많은 순)
+        Returns:
+            {'stage', 'name', 'count', 'total_ms', 'max_ms'} dict 리스트 (stage는 이름의 첫 부분)
+        """
+        rows = [
+            {'stage': name.split('.', 1)[0], 'name': name, 'count': count,
+             'total_ms': round(total * 1e3, 3), 'max_ms': round(longest * 1e3, 3)}
+            for name, (count, total, longest) in self.spans.items()
+        ]
+        return sorted(rows, key=lambda row: -row['total_ms'])
+
+    def record(self):
+        return {
+            'ts': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'run': self.label,
+            **self.fields,
+            'total_ms': round((self.elapsed or 0.0) * 1e3, 3),
+            'spans': {row['name']: {k: row[k] for k in ('count', 'total_ms', 'max_ms')}
+                      for row in self.summary()},
+        }
+
+
+def _write(run, log_path=None):
+    # JSONL 한 줄 (여러 세션 스레드가 같이 쓰므로 잠금)
+    path = log_path or LOG_PATH
+    line = json.dumps(run.record(), ensure_ascii=False)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with _log_lock, open(path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+    except OSError:
+        # 기록 실패로 페이지가 멈추면 안 됨
+        pass
+
+
+def start_run(label, **fields):
+    """
+    실행 하나의 측정 시작 (꺼져 있으면 None)
+    Args:
+        label: 실행 종류 (예: 'rerun')
+        fields: 로그에 함께 남길 값 (예: session='...')
+    Returns:
+        finish_run에 넘길 Run 객체
+    """
+    if not ENABLED:
+        return None
+    # 이전 실행이 중간에 끊겼어도 (st.stop, st.rerun) 새 실행으로 바꿔 끼움
+    run = Run(label, **fields)
+    _current.set(run)
+    return run
+
+
+def finish_run(run, log_path=None):
+    """
+    측정을 끝내고 로그에 한 줄 추가
+    Returns:
+        Run 객체 (꺼져 있었으면 None)
+    """
+    if run is None:
+        return None
+    run.elapsed = time.perf_counter() - run.started
+    _current.set(None)
+    _write(run, log_path)
+    return run
+
+
+@contextmanager
+def _span(name):
+    run = _current.get()
+    own = run is None
+    if own:
+        # 바깥 실행이 없으면 (fragment rerun, 백그라운드 스레드) 이 구간 하나를 실행으로 기록
+        run = start_run(name)
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        run.add(name, time.perf_counter() - t0)
+        if own:
+            finish_run(run)
+
+
+def span(name):
+    """
+    구간 시간 측정 컨텍스트 ('단계.이름' 형식, 예: 'load.read_raw', 'render.pivot')
+    꺼져 있으면 아무 일도 하지 않는 컨텍스트를 돌려줌
+    """
+    return _span(name) if ENABLED else _NULL
+
+
+def timed(name):
+    """함수 전체를 span으로 감싸는 데코레이터 (꺼져 있으면 함수를 그대로 돌려줌)"""
+    def decorate(func):
+        if not ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
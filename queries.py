@@ -0,0 +1,282 @@
+import threading
+from collections import OrderedDict
+
+from profiling import timed
+from rank_index import RankIndex
+from search_index import SearchIndex
+from similarity import SimilarityIndex
+
+
+# 연도 파라미터에서 모든 연도 합계를 뜻하는 값
+ALL_YEARS = ('전체', 'all')
+# top_combinations의 k, 목록 질의의 limit 상한
+MAX_ROWS = 10000
+
+
+class QueryError(ValueError):
+    """없는 질의이거나 파라미터가 잘못되었을 때 발생하는 예외"""
+
+
+# 질의 함수: 대시보드와 API가 같은 결과를 쓰도록 cube를 받아 DataFrame을 돌려줌
+
+def top_combinations(cube, k=10):
+    """발생 건수 상위 k개 (지역, 범죄유형) 조합 (순위는 1부터 시작하는 인덱스)"""
+    frame = cube.top_k(k).reset_index(drop=True)
+    frame.index = frame.index + 1
+    return frame
+
+
+def region_totals(cube, limit=None):
+    """지역별 총 발생 건수 ('지역', '발생건수'), 많은 순으로 limit개"""
+    frame = cube.region_totals()
+    return frame if limit is None else frame.head(limit)
+
+
+def crime_totals(cube, limit=None):
+    """범죄 유형별 총 발생 건수 ('범죄유형', '발생건수'), 많은 순으로 limit개"""
+    frame = cube.crime_totals()
+    return frame if limit is None else frame.head(limit)
+
+
+def sido_totals(cube):
+    """시도별 총 발생 건수 ('시도', '발생건수'), 많은 순"""
+    return cube.sido_totals()
+
+
+def district_totals(cube, sido):
+    """한 시도의 시군구별 총 발생 건수 ('시군구', '지역', '발생건수'), 많은 순"""
+    return cube.district_totals(sido)
+
+
+def search(index, region=None, crime=None, limit=None):
+    """
+    지역/범죄 유형 필터 결과 (발생건수 많은 순)
+    Args:
+        index: SearchIndex (QueryService.search_index)
+        region: 지역 이름 (None이면 전체)
+        crime: 범죄 유형 이름 (None이면 전체)
+        limit: 앞에서 몇 개만 (None이면 전부)
+    """
+    frame = index.search(region, crime)
+    return frame if limit is None else frame.head(limit)
+
+
+def similar_regions(index, region, k=10):
+    """
+    범죄 구성이 region과 가장 비슷한 지역 k개
+    Args:
+        index: SimilarityIndex (QueryService.similarity_index)
+    Returns:
+        '지역', '유사도', '발생건수' DataFrame (유사도 높은 순)
+    """
+    return index.similar(region, k)
+
+
+def scorecard(index, region):
+    """
+    지역 하나의 범죄 유형별 순위표 (전체 합계가 첫 줄)
+    Args:
+        index: RankIndex (QueryService.rank_index)
+    Returns:
+        '범죄유형', '발생건수', '순위', '상위 %' DataFrame
+    """
+    return index.scorecard(region)
+
+
+def rank_range(index, crime=None, start=1, stop=10):
+    """
+    순위 start위부터 stop위까지의 지역 (crime이 None이면 전체 합계 기준)
+    Returns:
+        '순위', '지역', '발생건수' DataFrame
+    """
+    return index.between(start, stop, crime)
+
+
+def to_records(frame):
+    """DataFrame -> JSON으로 바꿀 수 있는 dict 리스트 (numpy 값은 파이썬 값으로)"""
+    return [
+        {col: value.item() if hasattr(value, 'item') else value for col, value in row.items()}
+        for row in frame.to_dict('records')
+    ]
+
+
+def _int(value, name, default):
+    if value is None or value == '':
+        return default
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise QueryError(f"{name}는 정수여야 합니다: {value!r}") from None
+    if not 1 <= number <= MAX_ROWS:
+        raise QueryError(f"{name}는 1 이상 {MAX_ROWS} 이하여야 합니다: {number}")
+    return number
+
+
+def _text(value):
+    # 빈 문자열과 '전체'는 필터 없음
+    return None if value in (None, '', '전체') else value
+
+
+class QueryService:
+    """
+    대시보드 밖에서 (HTTP API, 스크립트) 쓰는 질의 계층
+    - 질의 이름과 문자열 파라미터를 검사해서 정리하고, 같은 질의는 같은 파라미터 dict가 되도록 맞춘다.
+    - 결과 표는 CrimeStore의 cube 집계를 그대로 꺼내므로 데이터 버전마다 한 번만 계산된다.
+    - 검색, 유사도, 순위 색인은 데이터 버전마다 하나 (예전 버전은 오래된 것부터 버림).
+    """
+
+    # 질의 이름 -> 받는 파라미터
+    QUERIES = {
+        'top_combinations': ('year', 'k'),
+        'region_totals': ('year', 'limit'),
+        'crime_totals': ('year', 'limit'),
+        'sido_totals': ('year',),
+        'district_totals': ('year', 'sido'),
+        'search': ('year', 'region', 'crime', 'limit'),
+        'similar_regions': ('year', 'region', 'k'),
+        'scorecard': ('year', 'region'),
+        'rank_range': ('year', 'crime', 'start', 'stop'),
+    }
+
+    def __init__(self, store, index_cache=32):
+        self.store = store
+        self.index_cache = index_cache
+        self._indexes = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _index(self, kind, cube):
+        # (색인 종류, 데이터 버전)마다 하나
+        key = (kind.__name__, cube.attrs['version'])
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is not None:
+                self._indexes.move_to_end(key)
+                return index
+        index = kind(cube)
+        with self._lock:
+            index = self._indexes.setdefault(key, index)
+            self._indexes.move_to_end(key)
+            while len(self._indexes) > self.index_cache:
+                self._indexes.popitem(last=False)
+        return index
+
+    def search_index(self, cube):
+        """cube 데이터 버전의 검색 색인 (없으면 만듦)"""
+        return self._index(SearchIndex, cube)
+
+    def similarity_index(self, cube):
+        """cube 데이터 버전의 지역 유사도 색인 (없으면 만듦)"""
+        return self._index(SimilarityIndex, cube)
+
+    def rank_index(self, cube):
+        """cube 데이터 버전의 순위 색인 (없으면 만듦)"""
+        return self._index(RankIndex, cube)
+
+    def meta(self):
+        """사용할 수 있는 연도, 질의 목록, 데이터 버전"""
+        return {
+            'version': self.store.version,
+            'years': list(self.store.years),
+            'latest_year': self.store.latest_year(),
+            'queries': {name: list(params) for name, params in self.QUERIES.items()},
+        }
+
+    def prepare(self, name, params):
+        """
+        질의 이름과 파라미터 검사
+        Args:
+            name: QUERIES의 질의 이름
+            params: 파라미터 이름 -> 문자열 값 dict (URL 쿼리 문자열 그대로)
+        Returns:
+            (cube, 정리된 파라미터 dict): cube.attrs['version']과 파라미터로 응답을 캐시할 수 있다
+        """
+        if name not in self.QUERIES:
+            raise QueryError(f"없는 질의입니다: {name}")
+        allowed = self.QUERIES[name]
+        unknown = sorted(set(params) - set(allowed))
+        if unknown:
+            raise QueryError(f"{name}에 없는 파라미터입니다: {', '.join(unknown)}")
+
+        year = params.get('year')
+        if year is None or year == '':
+            year = self.store.latest_year()
+        elif year in ALL_YEARS:
+            year = None
+        else:
+            try:
+                year = int(year)
+            except ValueError:
+                raise QueryError(f"year는 연도 또는 '전체'여야 합니다: {year!r}") from None
+            if year not in self.store.years:
+                raise QueryError(f"데이터가 없는 연도입니다: {year}")
+
+        clean = {'year': year}
+        if 'k' in allowed:
+            clean['k'] = _int(params.get('k'), 'k', 10)
+        if 'limit' in allowed:
+            clean['limit'] = _int(params.get('limit'), 'limit', None)
+        if 'sido' in allowed:
+            if not params.get('sido'):
+                raise QueryError("sido 파라미터가 필요합니다.")
+            clean['sido'] = params['sido']
+        if name in ('similar_regions', 'scorecard'):
+            if not params.get('region'):
+                raise QueryError("region 파라미터가 필요합니다.")
+            clean['region'] = params['region']
+        elif 'region' in allowed:
+            clean['region'] = _text(params.get('region'))
+            clean['crime'] = _text(params.get('crime'))
+
+        cube = self.store.cube(year)
+        if name == 'rank_range':
+            clean['crime'] = _text(params.get('crime'))
+            if clean['crime'] is not None and cube.crime_index(clean['crime']) is None:
+                raise QueryError(f"없는 범죄 유형입니다: {clean['crime']}")
+            clean['start'] = _int(params.get('start'), 'start', 1)
+            clean['stop'] = _int(params.get('stop'), 'stop', clean['start'] + 9)
+            if clean['stop'] < clean['start']:
+                raise QueryError(f"stop({clean['stop']})은 start({clean['start']}) 이상이어야 합니다.")
+        return cube, clean
+
+    @timed('aggregate.query')
+    def execute(self, name, cube, params):
+        """prepare가 돌려준 cube와 파라미터로 질의 실행 -> DataFrame"""
+        if name == 'top_combinations':
+            return top_combinations(cube, params['k'])
+        if name == 'region_totals':
+            return region_totals(cube, params['limit'])
+        if name == 'crime_totals':
+            return crime_totals(cube, params['limit'])
+        if name == 'sido_totals':
+            return sido_totals(cube)
+        if name == 'district_totals':
+            return district_totals(cube, params['sido'])
+        if name == 'similar_regions':
+            return similar_regions(self.similarity_index(cube), params['region'], params['k'])
+        if name == 'scorecard':
+            return scorecard(self.rank_index(cube), params['region'])
+        if name == 'rank_range':
+            return rank_range(self.rank_index(cube), params['crime'], params['start'], params['stop'])
+        return search(self.search_index(cube), params['region'], params['crime'], params['limit'])
+
+    def run(self, name, params):
+        """
+        질의 하나를 실행해서 JSON으로 바꿀 수 있는 결과로
+        Returns:
+            {'query', 'version', 'params', 'columns', 'rows'} dict
+        """
+        cube, clean = self.prepare(name, params)
+        return self.payload(name, cube, clean)
+
+    def payload(self, name, cube, params):
+        """prepare가 돌려준 cube와 파라미터로 실행한 결과 dict (run과 같은 모양)"""
+        frame = self.execute(name, cube, params)
+        if name == 'top_combinations':
+            frame = frame.rename_axis('순위').reset_index()
+        return {
+            'query': name,
+            'version': cube.attrs['version'],
+            'params': params,
+            'columns': list(frame.columns),
+            'rows': to_records(frame),
+        }
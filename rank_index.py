@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+
+from loader import COUNT_COL, CRIME_COL, REGION_COL
+from profiling import timed
+
+
+# 범죄 유형 대신 모든 범죄 합계의 순위를 뜻하는 이름
+TOTAL_LABEL = '전체'
+RANK_COL = '순위'
+TOP_PERCENT_COL = '상위 %'
+
+
+class RankIndex:
+    """
+    "이 지역이 몇 위인가"를 바로 답하는 순위 색인 (데이터 버전마다 한 번만 만듦)
+    범죄 유형마다 + 전체 합계 열 하나를 더해서 열마다
+    - order[:, c]: 건수 내림차순(같으면 지역 이름 순) 지역 위치 -> 순위 구간 조회는 슬라이스
+    - ascending[:, c]: 오름차순 건수 -> 임의 건수의 순위는 이진 탐색 (O(log n))
+    - ranks[i, c]: 지역 i의 순위 (동점은 같은 순위, 1224 방식) -> 지역 순위 조회는 O(1)
+    모든 지역을 대상으로 하므로 그 범죄가 한 건도 없는 지역도 공동 꼴찌로 들어간다.
+    """
+
+    @timed('aggregate.rank_index')
+    def __init__(self, cube):
+        self.cube = cube
+        self.columns = list(cube.crimes) + [TOTAL_LABEL]
+        self._column_pos = {name: c for c, name in enumerate(self.columns)}
+        self.counts = np.column_stack([cube.matrix.astype(np.int64), cube.region_sums])
+        n = self.counts.shape[0]
+
+        name_rank = np.empty(n, dtype=np.int64)
+        name_rank[np.argsort(np.asarray(cube.regions, dtype=object), kind='stable')] = np.arange(n)
+        self.order = np.lexsort((np.broadcast_to(name_rank[:, None], self.counts.shape), -self.counts), axis=0)
+        self.ascending = np.sort(self.counts, axis=0)
+        # 순위 = 나보다 건수가 많은 지역 수 + 1
+        self.ranks = np.empty(self.counts.shape, dtype=np.int64)
+        for c in range(self.counts.shape[1]):
+            self.ranks[:, c] = n - np.searchsorted(self.ascending[:, c], self.counts[:, c], side='right') + 1
+        for array in (self.counts, self.order, self.ascending, self.ranks):
+            array.flags.writeable = False
+
+    @property
+    def size(self):
+        """순위를 매기는 지역 수"""
+        return self.counts.shape[0]
+
+    def _column(self, crime):
+        c = self._column_pos.get(TOTAL_LABEL if crime is None else crime)
+        if c is None:
+            raise KeyError(f"없는 범죄 유형입니다: {crime}")
+        return c
+
+    def rank(self, region, crime=None):
+        """
+        지역 하나의 순위 (O(1))
+        Args:
+            region: 지역 이름
+            crime: 범죄 유형 이름 (None이면 전체 합계)
+        Returns:
+            {'rank', 'count', 'size', 'top_percent'} dict, 없는 지역이면 None
+        """
+        i = self.cube.region_index(region)
+        if i is None:
+            return None
+        c = self._column(crime)
+        rank = int(self.ranks[i, c])
+        return {'rank': rank, 'count': int(self.counts[i, c]), 'size': self.size,
+                'top_percent': 100.0 * rank / self.size}
+
+    def rank_of_count(self, count, crime=None):
+        """건수가 count인 지역이 있다면 몇 위일지 (이진 탐색, O(log n))"""
+        c = self._column(crime)
+        return self.size - int(np.searchsorted(self.ascending[:, c], count, side='right')) + 1
+
+    def between(self, start, stop, crime=None):
+        """
+        순위가 start위부터 stop위까지인 지역 (1부터, 양 끝 포함, 정렬 없이 잘라내기만 함)
+        동점은 같은 순위라서 동점 그룹은 나누지 않고 모두 들어가거나 모두 빠진다.
+        Returns:
+            '순위', '지역', '발생건수' DataFrame
+        """
+        c = self._column(crime)
+        # order 순서의 순위는 오름차순이므로 이진 탐색으로 순위 값 구간을 찾음
+        ranks = self.ranks[self.order[:, c], c]
+        lo = np.searchsorted(ranks, start, side='left')
+        hi = np.searchsorted(ranks, stop, side='right')
+        rows = self.order[lo:max(hi, lo), c]
+        return pd.DataFrame({
+            RANK_COL: self.ranks[rows, c],
+            REGION_COL: [self.cube.regions[i] for i in rows],
+            COUNT_COL: self.counts[rows, c],
+        })
+
+    def scorecard(self, region):
+        """
+        지역 하나의 범죄 유형별 순위표 (전체 합계가 첫 줄, 나머지는 순위가 높은 유형부터)
+        Returns:
+            '범죄유형', '발생건수', '순위', '상위 %' DataFrame, 없는 지역이면 빈 DataFrame
+        """
+        i = self.cube.region_index(region)
+        if i is None:
+            return pd.DataFrame({CRIME_COL: [], COUNT_COL: [], RANK_COL: [], TOP_PERCENT_COL: []})
+        ranks = self.ranks[i]
+        crime_order = np.lexsort((np.arange(len(ranks) - 1), ranks[:-1]))
+        columns = np.concatenate([[len(ranks) - 1], crime_order])
+        return pd.DataFrame({
+            CRIME_COL: [self.columns[c] for c in columns],
+            COUNT_COL: self.counts[i, columns],
+            RANK_COL: ranks[columns],
+            TOP_PERCENT_COL: np.round(100.0 * ranks[columns] / self.size, 1),
+        })
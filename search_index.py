@@ -0,0 +1,60 @@
+import threading
+from collections import OrderedDict
+
+from aggregates import shared_copy
+from loader import COUNT_COL
+from profiling import span
+from sorting import fast_sort
+
+
+class SearchIndex:
+    """
+    검색 섹션용 색인
+    - 필터는 CrimeCube 행렬의 행/열 슬라이스로 바로 구함 (전체 테이블을 훑지 않음)
+    - 드롭다운 선택지 (이름 순, 데이터 버전마다 한 번만 정렬)
+    - (지역, 범죄 유형) 필터 결과를 담는 크기 제한 LRU 캐시
+    """
+
+    def __init__(self, cube, cache_size=256):
+        self.cube = cube
+        self.region_options = fast_sort(list(cube.regions))
+        self.crime_options = fast_sort(list(cube.crimes))
+
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def search(self, region=None, crime=None):
+        """
+        필터 결과를 발생건수 많은 순으로 정렬한 DataFrame (LRU 캐시)
+        캐시한 결과는 여러 세션이 같이 쓰므로 복사본을 돌려줌 (copy-on-write이면 고칠 때만 복사됨)
+        Args:
+            region: 지역 이름 (None이면 전체)
+            crime: 범죄 유형 이름 (None이면 전체)
+        Returns:
+            '지역', '범죄유형', '발생건수' DataFrame
+        """
+        key = (region, crime)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return shared_copy(self._cache[key])
+            self.misses += 1
+
+        with span('aggregate.search'):
+            result = fast_sort(self.cube.filter(region, crime), key=COUNT_COL, reverse=True)
+
+        with self._lock:
+            self._cache[key] = result
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return shared_copy(result)
+
+    def cache_info(self):
+        """캐시 상태 (hits, misses, 현재 크기, 최대 크기)"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._cache), 'max_size': self.cache_size}
@@ -0,0 +1,306 @@
+import os
+
+import streamlit as st
+import pandas as pd
+
+import queries
+from benchmarks.bench_sort import ALGORITHM_NAMES, DISTRIBUTION_NAMES, RESULTS_JSON, load_results
+from benchmarks.runner import BenchmarkJob
+from figures import (benchmark_figure, crime_share_figure, district_totals_figure, profile_comparison_figure,
+                     region_totals_figure, search_figure, sido_totals_figure, similar_regions_figure,
+                     top_combinations_figure)
+from profiling import span, timed
+from queries import QueryService
+from snapshot import top_combinations_table
+from startup import load_store
+
+# 대시보드 섹션 (pandas, plotly.express, 데이터 모듈을 쓰므로 main.py가 탭을 열 때 처음 import함)
+
+# 질의 계층 (API와 같은 질의 함수, 검색 색인은 데이터 버전마다 한 번만 만들고 모든 세션이 공유)
+@st.cache_resource
+def get_queries():
+    return QueryService(load_store())
+
+# 정렬 벤치마크 작업 (프로세스마다 하나, 모든 세션이 공유)
+@st.cache_resource
+def get_benchmark_job():
+    return BenchmarkJob()
+
+# 차트 (데이터 버전, 필터, 단순화 설정마다 한 번만 만들고 모든 세션이 공유)
+# st.plotly_chart는 받은 그림을 복사해서 직렬화하므로 공유해도 바뀌지 않음
+@st.cache_resource(max_entries=256)
+def get_figure(version, name, params, _build):
+    with span(f'render.figure.{name}'):
+        return _build()
+
+def show_chart(fig):
+    """차트 그리기 (그림을 JSON으로 바꾸는 시간도 render 단계로 측정)"""
+    with span('render.plotly_chart'):
+        st.plotly_chart(fig, width='stretch')
+
+def results_mtime():
+    """벤치마크 결과 파일 수정 시각 (캐시 키로 사용, 파일이 없으면 None)"""
+    try:
+        return os.path.getmtime(RESULTS_JSON)
+    except OSError:
+        return None
+
+@st.cache_resource(max_entries=2)
+def cached_results(mtime):
+    """결과 파일이 바뀌었을 때만 다시 읽음 (세션마다 복사하지 않고 읽기 전용으로 공유)"""
+    return load_results() if mtime is not None else None
+
+def benchmark_panel(data_sha256):
+    """벤치마크 실행 버튼과 진행 상황 (실행 중일 때만 1초마다 이 부분만 다시 그림)"""
+    job = get_benchmark_job()
+
+    @st.fragment(run_every=1.0 if job.is_running() else None)
+    def _panel():
+        state = job.snapshot()
+        if state['status'] == 'running':
+            st.progress(state['progress'], text=f"정렬 벤치마크 실행 중: {state['label']}")
+            return
+        if st.session_state.get('benchmark_was_running'):
+            # 방금 끝났으면 결과를 다시 읽도록 전체를 다시 그림
+            st.session_state['benchmark_was_running'] = False
+            st.rerun()
+        if state['status'] == 'error':
+            st.error(f"정렬 벤치마크 실패: {state['error']}")
+        elif state['timeouts']:
+            st.warning(f"시간 제한으로 중단된 알고리즘: {', '.join(ALGORITHM_NAMES[n] for n in state['timeouts'])}")
+        if st.button("⏱️ 정렬 벤치마크 실행 (백그라운드)"):
+            job.start(data_sha256)
+            st.rerun()
+
+    if job.is_running():
+        st.session_state['benchmark_was_running'] = True
+    _panel()
+
+# 1. 가장 많이 발생한 지역-범죄 조합 (표와 차트만 만들고 그리기는 main.py가 함, 스냅샷과 같은 모양)
+def top_combinations_view(cube):
+    """
+    Returns:
+        ({'columns', 'rows'} 표, 차트) 가장 많이 발생한 조합 10개, 순위는 1부터
+    """
+    # 행렬에서 부분 선택 top-k, 전체 정렬 없음
+    top, table = top_combinations_table(cube)
+    fig = get_figure(cube.attrs['version'], 'top_combinations', None,
+                     lambda: top_combinations_figure(top))
+    return table, fig
+
+###############################################################################################
+
+# 정렬 알고리즘 성능 비교 (저장된 결과만 읽어서 그림, 분포를 바꾸면 이 부분만 다시 그림)
+@st.fragment
+@timed('render.sort_benchmark')
+def section_sort_benchmark(data_sha256):
+    bench = cached_results(results_mtime())
+    if bench is None or bench.get('settings', {}).get('data_sha256') != data_sha256:
+        st.info("현재 데이터로 측정한 정렬 벤치마크 결과가 없습니다. 위의 버튼을 누르거나 "
+                "프로젝트 폴더에서 `python -m benchmarks.bench_sort`를 실행하세요.")
+        return
+
+    bench_df = pd.DataFrame(bench['results'])
+    bench_df['알고리즘'] = bench_df['algorithm'].map(ALGORITHM_NAMES)
+    bench_df['데이터'] = bench_df['kind'].map({'list': 'list', 'frame': 'DataFrame'})
+
+    distribution = st.selectbox(
+        "정렬 벤치마크 입력 분포",
+        list(DISTRIBUTION_NAMES),
+        format_func=DISTRIBUTION_NAMES.get
+    )
+    fig_bench = get_figure(bench['created'], 'benchmark', distribution, lambda: benchmark_figure(
+        bench_df[bench_df['distribution'] == distribution],
+        f"정렬 시간 중앙값 ({DISTRIBUTION_NAMES[distribution]}, 측정: {bench['created']})"
+    ))
+    show_chart(fig_bench)
+
+    fits = pd.DataFrame(bench['fits'])
+    if not fits.empty:
+        fits = fits[fits['distribution'] == distribution]
+        st.dataframe(
+            pd.DataFrame({
+                '알고리즘': fits['algorithm'].map(ALGORITHM_NAMES),
+                '데이터': fits['kind'],
+                '증가 차수 (시간 ~ n^k)': fits['exponent'].round(2),
+            }),
+            width='stretch',
+            hide_index=True
+        )
+
+# 2. 지역별 총 범죄 발생 건수
+@timed('render.region_totals')
+def section_region_totals(cube, data_sha256, reduction):
+    st.subheader("📍 지역별 총 범죄 발생 건수")
+
+    # 측정은 버튼을 눌렀을 때만 백그라운드에서 실행되고, 페이지를 다시 그릴 때는 실행되지 않음
+    benchmark_panel(data_sha256)
+    section_sort_benchmark(data_sha256)
+
+    # 집계는 데이터 버전마다 한 번만 (cube에서 읽기만 함)
+    region_total = queries.region_totals(cube).set_index('지역')['발생건수']
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.dataframe(region_total.reset_index(), width='stretch')
+
+    with col2:
+        fig2 = get_figure(cube.attrs['version'], 'region_totals', reduction,
+                          lambda: region_totals_figure(queries.region_totals(cube), reduction))
+        show_chart(fig2)
+
+    section_sido_totals(cube, reduction)
+
+# 시도별 합계 -> 시군구별 합계 (미리 만들어 둔 rollup에서 꺼내기만 함)
+@st.fragment
+@timed('render.sido_totals')
+def section_sido_totals(cube, reduction):
+    st.subheader("🗺️ 시도별 총 범죄 발생 건수")
+    sido_total = queries.sido_totals(cube)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        fig_sido = get_figure(cube.attrs['version'], 'sido_totals', None,
+                              lambda: sido_totals_figure(sido_total))
+        show_chart(fig_sido)
+
+    with col2:
+        selected_sido = st.selectbox("시도 선택 (시군구별로 보기)", sido_total['시도'].tolist())
+        fig_district = get_figure(cube.attrs['version'], 'district_totals', (selected_sido, reduction),
+                                  lambda: district_totals_figure(queries.district_totals(cube, selected_sido),
+                                                                 selected_sido, reduction))
+        show_chart(fig_district)
+
+#############################################################################################
+
+# 3. 범죄 유형별 총 발생 건수
+@timed('render.crime_totals')
+def section_crime_totals(cube, reduction):
+    st.subheader("⚖️ 범죄 유형별 총 발생 건수")
+    crime_total = queries.crime_totals(cube).set_index('범죄유형')['발생건수']
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.dataframe(crime_total.reset_index(), width='stretch')
+
+    with col2:
+        fig3 = get_figure(cube.attrs['version'], 'crime_share', reduction,
+                          lambda: crime_share_figure(queries.crime_totals(cube), reduction))
+        show_chart(fig3)
+
+########################################################################################
+
+# 4. 상세 분석 테이블
+@timed('render.pivot')
+def section_pivot(cube):
+    st.subheader("📋 지역-범죄 유형별 상세 분석")
+
+    # 피벗 테이블 생성
+    pivot_table = cube.pivot()
+
+    st.dataframe(pivot_table, width='stretch')
+
+#########################################################################################
+
+# 검색에서 고른 지역의 순위표 (순위 색인에서 꺼내기만 함, 다시 정렬하지 않음)
+def region_scorecard(cube, region, crime):
+    ranks = get_queries().rank_index(cube)
+    total = ranks.rank(region)
+    if total is None:
+        return
+
+    st.markdown(f"**📇 {region} 순위표** (전체 {ranks.size}개 지역 중)")
+    col1, col2, col3 = st.columns(3)
+    col1.metric("전체 범죄 순위", f"{total['rank']}위", f"상위 {total['top_percent']:.1f}%", delta_color='off')
+    col2.metric("전체 발생 건수", f"{total['count']:,}건")
+    if crime is not None:
+        picked = ranks.rank(region, crime)
+        col3.metric(f"{crime} 순위", f"{picked['rank']}위", f"상위 {picked['top_percent']:.1f}%",
+                    delta_color='off')
+
+    with st.expander("범죄 유형별 순위 보기"):
+        st.dataframe(queries.scorecard(ranks, region), width='stretch', hide_index=True)
+
+# 5. 검색 기능 (선택을 바꾸면 이 섹션만 다시 실행됨)
+@st.fragment
+@timed('render.search')
+def section_search(cube, reduction):
+    st.subheader("🔍 특정 지역 또는 범죄 유형 검색")
+
+    col1, col2 = st.columns(2)
+
+    # 선택지와 색인은 데이터 버전마다 한 번만 만들고, 필터 결과는 LRU 캐시에서 꺼냄
+    index = get_queries().search_index(cube)
+
+    with col1:
+        selected_region = st.selectbox("지역 선택", ['전체'] + index.region_options)
+
+    with col2:
+        selected_crime = st.selectbox("범죄 유형 선택", ['전체'] + index.crime_options)
+
+    sorted_filtered = queries.search(
+        index,
+        None if selected_region == '전체' else selected_region,
+        None if selected_crime == '전체' else selected_crime
+    )
+
+    if selected_region != '전체':
+        region_scorecard(cube, selected_region, None if selected_crime == '전체' else selected_crime)
+
+    if len(sorted_filtered) > 0:
+        st.dataframe(sorted_filtered, width='stretch')
+
+        if len(sorted_filtered) > 1:
+            fig5 = get_figure(cube.attrs['version'], 'search', (selected_region, selected_crime, reduction),
+                              lambda: search_figure(sorted_filtered,
+                                                    '지역' if selected_region == '전체' else '범죄유형',
+                                                    f'검색 결과: {selected_region} - {selected_crime}',
+                                                    reduction))
+            show_chart(fig5)
+    else:
+        st.info("검색 결과가 없습니다.")
+
+#########################################################################################
+
+# 6. 범죄 구성이 비슷한 지역 (지역을 바꾸면 이 섹션만 다시 실행됨)
+@st.fragment
+@timed('render.similar')
+def section_similar(cube):
+    st.subheader("🧭 범죄 구성이 비슷한 지역")
+    st.caption("지역마다 범죄 유형별 건수를 벡터로 보고 코사인 유사도가 높은 지역을 찾습니다 (건수 규모와 무관).")
+
+    # 유사도 색인은 데이터 버전마다 한 번만 (블록 행렬 곱으로 지역마다 이웃을 미리 구해 둠)
+    index = get_queries().search_index(cube)
+    similarity = get_queries().similarity_index(cube)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        selected_region = st.selectbox("기준 지역", index.region_options, key='similar_region')
+
+    with col2:
+        k = st.slider("비슷한 지역 수", min_value=3, max_value=30, value=10, key='similar_k')
+
+    similar = queries.similar_regions(similarity, selected_region, k)
+    if len(similar) == 0:
+        st.info("비교할 지역이 없습니다.")
+        return
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.dataframe(similar, width='stretch', hide_index=True)
+
+    with col2:
+        fig_similar = get_figure(cube.attrs['version'], 'similar_regions', (selected_region, k),
+                                 lambda: similar_regions_figure(similar, selected_region))
+        show_chart(fig_similar)
+
+    # 기준 지역과 가장 비슷한 세 곳의 범죄 유형별 비율 비교
+    compared = [selected_region] + similar['지역'].head(3).tolist()
+    fig_profile = get_figure(cube.attrs['version'], 'profile_comparison', tuple(compared),
+                             lambda: profile_comparison_figure(similarity.profile(compared)))
+    show_chart(fig_profile)
@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+
+from loader import COUNT_COL, REGION_COL
+from profiling import span, timed
+
+
+# 지역마다 미리 구해 두는 이웃 수 (이보다 많이 물으면 그 지역만 한 줄 곱으로 다시 계산)
+MAX_NEIGHBORS = 30
+# 한 번에 곱하는 행 수 (BLOCK_ROWS x 지역 수 유사도 블록만 메모리에 둠)
+BLOCK_ROWS = 256
+SIMILARITY_COL = '유사도'
+
+
+def profile_matrix(matrix):
+    """
+    지역 x 범죄유형 건수 행렬 -> 범죄 구성 프로필 (행마다 L2 정규화, float32)
+    코사인 유사도는 크기와 무관하므로 건수가 많은 지역과 적은 지역도 구성이 같으면 1에 가깝다.
+    한 건도 없는 지역은 0 벡터 (모든 지역과 유사도 0).
+    """
+    profiles = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(profiles, axis=1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        profiles = np.where(norms > 0, profiles / norms, 0).astype(np.float32)
+    profiles.flags.writeable = False
+    return profiles
+
+
+class SimilarityIndex:
+    """
+    범죄 구성이 비슷한 지역 찾기 (코사인 유사도 최근접 이웃)
+    - 데이터 버전마다 프로필 행렬을 한 번 만들고
+    - BLOCK_ROWS개 지역씩 (블록 x 전체) 행렬 곱으로 유사도를 구해 지역마다 상위 MAX_NEIGHBORS개만 남긴다.
+      (지역 수 x 지역 수 전체 행렬을 한꺼번에 만들지 않고, 지역 쌍마다 파이썬 반복도 없음)
+    - 조회는 미리 구한 이웃 배열에서 꺼내기만 한다.
+    """
+
+    @timed('aggregate.similarity_index')
+    def __init__(self, cube, max_neighbors=MAX_NEIGHBORS, block_rows=BLOCK_ROWS):
+        self.cube = cube
+        self.profiles = profile_matrix(cube.matrix)
+        n = len(cube.regions)
+        # 동점은 지역 이름 순
+        self._region_rank = np.empty(n, dtype=np.int64)
+        self._region_rank[np.argsort(np.asarray(cube.regions, dtype=object), kind='stable')] = np.arange(n)
+        self.max_neighbors = min(max_neighbors, max(n - 1, 0))
+        self.neighbors = np.empty((n, self.max_neighbors), dtype=np.int32)
+        self.scores = np.empty((n, self.max_neighbors), dtype=np.float32)
+
+        k = self.max_neighbors
+        for start in range(0, n, block_rows):
+            stop = min(start + block_rows, n)
+            sims = self.profiles[start:stop] @ self.profiles.T
+            # 자기 자신은 빼고
+            sims[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+            if k == 0:
+                continue
+            self.neighbors[start:stop], self.scores[start:stop] = self._top(sims, k)
+        self.neighbors.flags.writeable = False
+        self.scores.flags.writeable = False
+
+    def _top(self, sims, k):
+        # 행마다 상위 k개 (유사도 내림차순, 같으면 지역 이름 순)
+        if k >= sims.shape[1]:
+            candidates = np.broadcast_to(np.arange(sims.shape[1]), sims.shape)
+        else:
+            candidates = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        values = np.take_along_axis(sims, candidates, axis=1)
+        order = np.lexsort((self._region_rank[candidates], -values), axis=1)[:, :k]
+        rows = np.take_along_axis(candidates, order, axis=1)
+        scores = np.take_along_axis(values, order, axis=1)
+
+        if k < sims.shape[1]:
+            # k번째 값과 같은 값이 후보 밖에도 있는 행만 동점 후보를 모두 모아 다시 고름
+            kth = scores[:, -1:]
+            for r in np.flatnonzero(np.count_nonzero(sims >= kth, axis=1) > k):
+                tied = np.flatnonzero(sims[r] >= kth[r])
+                pick = tied[np.lexsort((self._region_rank[tied], -sims[r, tied]))[:k]]
+                rows[r], scores[r] = pick, sims[r, pick]
+        return rows, scores
+
+    def similar(self, region, k=10):
+        """
+        region과 범죄 구성이 가장 비슷한 지역 k개
+        Args:
+            region: 지역 이름
+            k: 돌려줄 지역 수
+        Returns:
+            '지역', '유사도', '발생건수' DataFrame (유사도 높은 순), 없는 지역이면 빈 DataFrame
+        """
+        i = self.cube.region_index(region)
+        if i is None or k <= 0:
+            rows, scores = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        elif k <= self.max_neighbors:
+            rows, scores = self.neighbors[i, :k], self.scores[i, :k]
+        else:
+            # 미리 구한 것보다 많이 물으면 이 지역 한 줄만 다시 곱함
+            with span('aggregate.similar_regions'):
+                sims = self.profiles[i:i + 1] @ self.profiles.T
+                sims[0, i] = -np.inf
+                rows, scores = self._top(sims, min(k, sims.shape[1] - 1))
+                rows, scores = rows[0], scores[0]
+        return pd.DataFrame({
+            REGION_COL: [self.cube.regions[r] for r in rows],
+            SIMILARITY_COL: np.round(scores.astype(np.float64), 4),
+            COUNT_COL: self.cube.region_sums[rows],
+        })
+
+    def profile(self, regions):
+        """
+        지역들의 범죄 유형별 비율 (프로필 비교 차트용)
+        Returns:
+            지역 x 범죄유형 비율 DataFrame (행 합계 1, 없는 지역은 뺌)
+        """
+        rows = [i for i in (self.cube.region_index(name) for name in regions) if i is not None]
+        counts = self.cube.matrix[rows].astype(np.float64)
+        totals = counts.sum(axis=1, keepdims=True)
+        shares = np.divide(counts, totals, out=np.zeros_like(counts), where=totals > 0)
+        return pd.DataFrame(shares, index=[self.cube.regions[i] for i in rows], columns=self.cube.crimes)
@@ -0,0 +1,137 @@
+import glob
+import json
+import os
+import time
+
+
+# 첫 화면 스냅샷 (CRIME_FINDER_SNAPSHOT=0이면 쓰지 않음)
+ENABLED = os.environ.get('CRIME_FINDER_SNAPSHOT', '1').lower() not in ('0', 'false', 'no', 'off')
+SNAPSHOT_PATH = os.environ.get(
+    'CRIME_FINDER_SNAPSHOT_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'snapshot.json')
+)
+# 스냅샷 내용이 바뀌면 올림 (예전 형식 파일은 무시)
+FORMAT = 1
+
+# 이 모듈은 첫 화면을 그릴 때 import되므로 pandas, plotly, 데이터 모듈은 스냅샷을 만들 때만 import한다.
+
+
+def data_signature(data_dir):
+    """
+    data 폴더 CSV 파일들의 (이름, 크기, 수정 시각) 목록 (내용 해시 없이 stat만, 스냅샷이 최신인지 확인용)
+    """
+    signature = []
+    for path in sorted(glob.glob(os.path.join(data_dir, '*.csv'))):
+        stat = os.stat(path)
+        signature.append([os.path.basename(path), stat.st_size, stat.st_mtime_ns])
+    return signature
+
+
+def load_snapshot(data_dir, path=None):
+    """
+    스냅샷 읽기
+    Args:
+        data_dir: 데이터 폴더 (파일이 스냅샷을 만든 뒤 바뀌었으면 쓰지 않음)
+        path: 스냅샷 파일 (None이면 SNAPSHOT_PATH)
+    Returns:
+        스냅샷 dict, 없거나 형식이 다르거나 데이터가 바뀌었으면 None
+    """
+    try:
+        with open(path or SNAPSHOT_PATH, encoding='utf-8') as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if snapshot.get('format') != FORMAT or snapshot.get('signature') != data_signature(data_dir):
+        return None
+    return snapshot
+
+
+def top_combinations_table(cube, k=10):
+    """
+    가장 많이 발생한 지역-범죄 조합 표를 JSON으로 쓸 수 있는 모양으로
+    Returns:
+        (조합 DataFrame, {'columns': [...], 'rows': [[...], ...]}) 순위는 첫 컬럼
+    """
+    import queries
+
+    top = queries.top_combinations(cube, k)
+    table = {
+        'columns': ['순위'] + list(top.columns),
+        'rows': [[int(rank)] + [value.item() if hasattr(value, 'item') else value for value in row]
+                 for rank, row in zip(top.index, top.itertuples(index=False))],
+    }
+    return top, table
+
+
+def build_snapshot(store, data_dir, path=None):
+    """
+    첫 화면(가장 최근 연도의 Top 10 표와 차트)을 스냅샷 파일로 씀
+    표는 컬럼과 행 리스트로, 차트는 plotly 그림 JSON(spec)으로 저장해서
+    읽을 때 pandas, plotly.express, 데이터 파일 없이 바로 그릴 수 있게 한다.
+    Args:
+        store: refresh()를 마친 CrimeStore
+        data_dir: store가 읽은 데이터 폴더
+        path: 스냅샷 파일 (None이면 SNAPSHOT_PATH)
+    Returns:
+        스냅샷 dict
+    """
+    from figures import top_combinations_figure
+
+    signature = data_signature(data_dir)
+    year = store.latest_year()
+    cube = store.cube(year)
+    top, table = top_combinations_table(cube)
+    snapshot = {
+        'format': FORMAT,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'signature': signature,
+        'store_version': store.version,
+        'years': list(store.years),
+        'year': year,
+        'version': cube.attrs['version'],
+        'attrs': {key: cube.attrs[key] for key in ('encoding', 'encoding_reason') if key in cube.attrs},
+        'top_combinations': table,
+        'figures': {
+            'top_combinations': json.loads(top_combinations_figure(top).to_json()),
+        },
+    }
+
+    path = path or SNAPSHOT_PATH
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return snapshot
+
+
+def refresh_snapshot(store, data_dir, path=None):
+    """스냅샷이 없거나 store와 버전이 다르면 새로 만듦 (저장소를 다 읽은 뒤, 데이터가 바뀐 뒤에 부름)"""
+    snapshot = load_snapshot(data_dir, path)
+    if snapshot is not None and snapshot['store_version'] == store.version:
+        return snapshot
+    try:
+        return build_snapshot(store, data_dir, path)
+    except OSError:
+        # 스냅샷을 못 써도 대시보드는 평소처럼 동작함
+        return None
+
+
+def main():
+    import argparse
+
+    from store import CrimeStore
+
+    parser = argparse.ArgumentParser(description='첫 화면 스냅샷 만들기 (배포/컨테이너 빌드 단계에서 실행)')
+    parser.add_argument('--data-dir', default='data')
+    parser.add_argument('--path', default=None, help=f'스냅샷 파일 (기본값 {SNAPSHOT_PATH})')
+    args = parser.parse_args()
+
+    store = CrimeStore(args.data_dir)
+    store.refresh()
+    snapshot = build_snapshot(store, args.data_dir, args.path)
+    print(f"{args.path or SNAPSHOT_PATH}: {snapshot['year']}년, 데이터 버전 {snapshot['store_version']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,502 @@
+import heapq
+import operator
+
+import numpy as np
+import pandas as pd
+
+from profiling import timed
+
+
+# 선택 정렬 알고리즘 구현
+@timed('sort.selection_sort')
+def selection_sort(data, key=None, reverse=False):
+    """
+    선택 정렬 알고리즘
+    Args:
+        data: 정렬할 리스트 또는 pandas DataFrame
+        key: 정렬 기준이 되는 키 함수 (DataFrame의 경우 컬럼명)
+        reverse: True면 내림차순, False면 오름차순
+    Returns:
+        정렬된 리스트 또는 DataFrame
+    """
+    if isinstance(data, pd.DataFrame):
+        # DataFrame인 경우
+        data_list = data.to_dict('records')
+        n = len(data_list)
+        
+        for i in range(n - 1):
+            # 현재 위치부터 끝까지 최소값(또는 최대값) 찾기
+            extreme_idx = i
+            for j in range(i + 1, n):
+                if key:
+                    current_val = data_list[j][key]
+                    extreme_val = data_list[extreme_idx][key]
+                else:
+                    current_val = data_list[j]
+                    extreme_val = data_list[extreme_idx]
+                
+                if reverse:
+                    # 내림차순: 더 큰 값을 찾음
+                    if current_val > extreme_val:
+                        extreme_idx = j
+                else:
+                    # 오름차순: 더 작은 값을 찾음
+                    if current_val < extreme_val:
+                        extreme_idx = j
+            
+            # 최소값(또는 최대값)을 현재 위치로 이동
+            data_list[i], data_list[extreme_idx] = data_list[extreme_idx], data_list[i]
+        
+        return pd.DataFrame(data_list)
+    else:
+        # 리스트인 경우
+        data_list = list(data)
+        n = len(data_list)
+        
+        for i in range(n - 1):
+            extreme_idx = i
+            for j in range(i + 1, n):
+                if reverse:
+                    if data_list[j] > data_list[extreme_idx]:
+                        extreme_idx = j
+                else:
+                    if data_list[j] < data_list[extreme_idx]:
+                        extreme_idx = j
+            
+            data_list[i], data_list[extreme_idx] = data_list[extreme_idx], data_list[i]
+        
+        return data_list
+
+@timed('sort.bubble_sort')
+def bubble_sort(data, key=None, reverse=False):
+    """
+    버블 정렬 알고리즘
+    Args:
+        data: 정렬할 리스트 또는 pandas DataFrame
+        key: 정렬 기준이 되는 키 함수 (DataFrame의 경우 컬럼명)
+        reverse: True면 내림차순, False면 오름차순
+    Returns:
+        정렬된 리스트 또는 DataFrame
+    """
+    if isinstance(data, pd.DataFrame):
+        data_list = data.to_dict('records')
+        n = len(data_list)
+
+        for i in range(n - 1):
+            for j in range(n - i - 1):
+                if key:
+                    current_val = data_list[j][key]
+                    next_val = data_list[j + 1][key]
+                else:
+                    current_val = data_list[j]
+                    next_val = data_list[j + 1]
+
+                if reverse:
+                    if current_val > next_val:
+                        data_list[j], data_list[j + 1] = data_list[j + 1], data_list[j]
+                else:
+                    if current_val < next_val:
+                        data_list[j], data_list[j + 1] = data_list[j + 1], data_list[j]
+        return pd.DataFrame(data_list)
+    else:
+        data_list = list(data)
+        n = len(data_list)
+
+        for i in range(n - 1):
+            for j in range(n - i - 1):
+                if reverse:
+                    if data_list[j] > data_list[j + 1]:
+                        data_list[j], data_list[j + 1] = data_list[j + 1], data_list[j]
+                else:
+                    if data_list[j] < data_list[j + 1]:
+                        data_list[j], data_list[j + 1] = data_list[j + 1], data_list[j]
+        return data_list
+
+@timed('sort.insertion_sort')
+def insertion_sort(data, key=None, reverse=False):
+    """
+    삽입 정렬 알고리즘
+    Args:
+        data: 정렬할 리스트 또는 pandas DataFrame
+        key: 정렬 기준이 되는 키 함수 (DataFrame의 경우 컬럼명)
+        reverse: True면 내림차순, False면 오름차순
+    Returns:
+        정렬된 리스트 또는 DataFrame
+    """
+    if isinstance(data, pd.DataFrame):
+        data_list = data.to_dict('records')
+        n = len(data_list)
+
+        for i in range(1, n):
+            for j in range(i, 0, -1):
+                if key:
+                    if reverse:
+                        if data_list[j][key] > data_list[j - 1][key]:
+                            data_list[j], data_list[j - 1] = data_list[j - 1], data_list[j]
+                        else:
+                            break
+                    else:
+                        if data_list[j][key] < data_list[j - 1][key]:
+                            data_list[j], data_list[j - 1] = data_list[j - 1], data_list[j]
+                        else:
+                            break
+                else:
+                    if reverse:
+                        if data_list[j] > data_list[j - 1]:
+                            data_list[j], data_list[j - 1] = data_list[j - 1], data_list[j]
+                        else:
+                            break
+                    else:
+                        if data_list[j] < data_list[j - 1]:
+                            data_list[j], data_list[j - 1] = data_list[j - 1], data_list[j]
+                        else:
+                            break
+        return pd.DataFrame(data_list)
+    else:
+        data_list = list(data)
+        n = len(data_list)
+
+        for i in range(1, n):
+            for j in range(i, 0, -1):
+                if reverse:
+                    if data_list[j] > data_list[j - 1]:
+                        data_list[j], data_list[j - 1] = data_list[j - 1], data_list[j]
+                    else:
+                        break
+                else:
+                    if data_list[j] < data_list[j - 1]:
+                        data_list[j], data_list[j - 1] = data_list[j - 1], data_list[j]
+                    else:
+                        break
+        
+        return data_list
+
+# 퀵 정렬에서 쓰는 상수
+INSERTION_THRESHOLD = 16   # 이 크기 이하 구간은 삽입 정렬
+NINTHER_THRESHOLD = 128    # 이 크기보다 큰 구간은 ninther(9개 중 중앙값)로 피벗 선택
+
+
+def _median_of_three(keys, order, a, b, c, lt):
+    # order[a], order[b], order[c] 중 키가 가운데인 위치 반환
+    ka, kb, kc = keys[order[a]], keys[order[b]], keys[order[c]]
+    if lt(ka, kb):
+        if lt(kb, kc):
+            return b
+        return c if lt(ka, kc) else a
+    if lt(ka, kc):
+        return a
+    return c if lt(kb, kc) else b
+
+
+def _choose_pivot(keys, order, lo, hi, lt):
+    mid = (lo + hi) // 2
+    if hi - lo + 1 > NINTHER_THRESHOLD:
+        step = (hi - lo + 1) // 8
+        return _median_of_three(
+            keys, order,
+            _median_of_three(keys, order, lo, lo + step, lo + 2 * step, lt),
+            _median_of_three(keys, order, mid - step, mid, mid + step, lt),
+            _median_of_three(keys, order, hi - 2 * step, hi - step, hi, lt),
+            lt
+        )
+    return _median_of_three(keys, order, lo, mid, hi, lt)
+
+
+def _partition(keys, order, lo, hi, lt):
+    """
+    order[lo..hi] 구간을 피벗 기준으로 제자리 분할
+    피벗과 같은 값에서도 양쪽 포인터가 멈추고 교환하므로 중복 값이 많아도 균형 있게 나뉜다.
+    Returns:
+        피벗의 최종 위치
+    """
+    p = _choose_pivot(keys, order, lo, hi, lt)
+    order[lo], order[p] = order[p], order[lo]
+    pivot = keys[order[lo]]
+
+    left = lo + 1
+    right = hi
+    while True:
+        while left <= right and lt(keys[order[left]], pivot):
+            left += 1
+        while left <= right and lt(pivot, keys[order[right]]):
+            right -= 1
+        if left >= right:
+            break
+        order[left], order[right] = order[right], order[left]
+        left += 1
+        right -= 1
+
+    order[lo], order[right] = order[right], order[lo]
+    return right
+
+
+def _insertion_sort_range(keys, order, lo, hi, lt):
+    for i in range(lo + 1, hi + 1):
+        item = order[i]
+        item_key = keys[item]
+        j = i - 1
+        while j >= lo and lt(item_key, keys[order[j]]):
+            order[j + 1] = order[j]
+            j -= 1
+        order[j + 1] = item
+
+
+def _heap_sort_range(keys, order, lo, hi, lt):
+    n = hi - lo + 1
+
+    def sift_down(root, end):
+        while True:
+            child = 2 * root + 1
+            if child >= end:
+                return
+            if child + 1 < end and lt(keys[order[lo + child]], keys[order[lo + child + 1]]):
+                child += 1
+            if not lt(keys[order[lo + root]], keys[order[lo + child]]):
+                return
+            order[lo + root], order[lo + child] = order[lo + child], order[lo + root]
+            root = child
+
+    for start in range(n // 2 - 1, -1, -1):
+        sift_down(start, n)
+    for end in range(n - 1, 0, -1):
+        order[lo], order[lo + end] = order[lo + end], order[lo]
+        sift_down(0, end)
+
+
+def _introsort(keys, order, lt):
+    """
+    인덱스 배열 order를 keys 기준으로 제자리 정렬 (재귀 없이 명시적 스택 사용)
+    분할 깊이가 2*log2(n)을 넘으면 그 구간은 힙 정렬로 바꿔서 최악의 경우도 O(n log n)
+    """
+    n = len(order)
+    if n < 2:
+        return
+    stack = [(0, n - 1, 2 * n.bit_length())]
+    while stack:
+        lo, hi, depth = stack.pop()
+        while hi - lo + 1 > INSERTION_THRESHOLD:
+            if depth == 0:
+                _heap_sort_range(keys, order, lo, hi, lt)
+                break
+            depth -= 1
+            p = _partition(keys, order, lo, hi, lt)
+            # 큰 쪽은 스택에 넣고 작은 쪽을 바로 이어서 처리 -> 스택 깊이 O(log n)
+            if p - lo < hi - p:
+                stack.append((p + 1, hi, depth))
+                hi = p - 1
+            else:
+                stack.append((lo, p - 1, depth))
+                lo = p + 1
+        else:
+            _insertion_sort_range(keys, order, lo, hi, lt)
+
+
+@timed('sort.quick_sort')
+def quick_sort(data, key=None, reverse=False):
+    """
+    퀵 정렬 알고리즘 (제자리, 반복문, introsort)
+    인덱스 배열을 제자리에서 분할하고, 피벗은 median-of-three(큰 구간은 ninther),
+    작은 구간은 삽입 정렬, 분할이 너무 깊어지면 힙 정렬로 넘어간다.
+    Args:
+        data: 정렬할 리스트 또는 pandas DataFrame
+        key: 정렬 기준이 되는 키 함수 (DataFrame의 경우 컬럼명)
+        reverse: True면 내림차순, False면 오름차순
+    Returns:
+        정렬된 리스트 또는 DataFrame
+    """
+    if isinstance(data, pd.DataFrame):
+        if key is not None:
+            keys = data[key].tolist()
+        else:
+            keys = list(data.itertuples(index=False, name=None))
+    else:
+        keys = list(data)
+
+    lt = operator.gt if reverse else operator.lt
+    order = list(range(len(keys)))
+    _introsort(keys, order, lt)
+
+    if isinstance(data, pd.DataFrame):
+        return data.take(order).reset_index(drop=True)
+    return [keys[i] for i in order]
+
+# 실제 서비스용 정렬 엔진
+
+# numpy가 radix sort를 쓰는 키 범위
+INT16 = np.iinfo(np.int16)
+
+
+def _rank_codes(values, descending):
+    """
+    정렬 키 한 개를 정수 순위 코드로 바꾸기 (lexsort에 넘기기 위함)
+    Args:
+        values: 키 컬럼 (pandas Series)
+        descending: True면 큰 값이 작은 코드를 가지도록 뒤집음
+    Returns:
+        int64 numpy 배열 (결측값은 오름차순/내림차순 모두 맨 뒤)
+    """
+    if pd.api.types.is_integer_dtype(values.dtype) and not isinstance(values.dtype, pd.CategoricalDtype):
+        # 정수 건수는 그대로 키로 사용 (결측값이 없음)
+        codes = values.to_numpy(dtype=np.int64)
+        return -codes if descending else codes
+
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # 범주형은 범주 이름 순서로 (ordered 범주형이면 정의된 순서 그대로)
+        cat = values.array
+        m = len(cat.categories)
+        if cat.ordered:
+            ranks = np.arange(m, dtype=np.int64)
+        else:
+            ranks = np.empty(m, dtype=np.int64)
+            ranks[np.argsort(cat.categories.to_numpy(), kind='stable')] = np.arange(m)
+        codes = np.where(cat.codes < 0, -1, ranks[cat.codes])
+    else:
+        codes, uniques = pd.factorize(values, sort=True)
+        codes = codes.astype(np.int64)
+        m = len(uniques)
+    if descending:
+        codes = np.where(codes < 0, m, m - 1 - codes)
+    else:
+        codes[codes < 0] = m
+    return codes
+
+
+def _narrow(codes):
+    # 범위가 맞으면 int16으로 줄여서 np.argsort가 radix sort를 쓰게 함
+    if codes.size and INT16.min <= codes.min() and codes.max() <= INT16.max:
+        return codes.astype(np.int16)
+    return codes
+
+
+def _smallest_k(codes, k):
+    """
+    codes에서 가장 작은 k개의 위치 (작은 순, 같은 값은 앞 위치가 먼저)
+    np.partition으로 k번째 값을 O(n)에 찾고 골라낸 k개만 정렬한다.
+    """
+    if k >= len(codes):
+        return np.argsort(codes, kind='stable')
+    # k번째 값(threshold)보다 확실히 앞선 위치 + 동점 중 앞쪽 위치만 골라 k개를 만든다
+    threshold = np.partition(codes, k - 1)[k - 1]
+    better = np.flatnonzero(codes < threshold)
+    ties = np.flatnonzero(codes == threshold)[:k - len(better)]
+    selected = np.concatenate([better, ties])
+    return selected[np.argsort(codes[selected], kind='stable')]
+
+
+def sort_permutation(data, key, reverse=False):
+    """
+    정렬 결과의 행 순서(인덱스 순열)만 계산
+    키 컬럼만 numpy 배열로 꺼내서 안정 정렬(np.lexsort)로 순열을 구한다.
+    Args:
+        data: pandas DataFrame
+        key: 정렬 기준 컬럼명 또는 컬럼명 리스트 (앞쪽이 우선)
+        reverse: bool 또는 key마다 하나씩인 bool 리스트
+    Returns:
+        행 위치 순열 (int64 numpy 배열)
+    """
+    keys = [key] if isinstance(key, str) else list(key)
+    if isinstance(reverse, bool):
+        reverses = [reverse] * len(keys)
+    else:
+        reverses = list(reverse)
+        if len(reverses) != len(keys):
+            raise ValueError(f"reverse 개수({len(reverses)})가 key 개수({len(keys)})와 다릅니다.")
+
+    if len(keys) == 1:
+        # 키가 하나면 np.argsort의 안정 정렬 사용
+        # numpy는 16비트 이하 정수만 radix sort를 쓰므로 범위가 맞으면 int16으로 줄여서 넘긴다
+        # (그 밖의 int64 코드는 timsort)
+        return np.argsort(_narrow(_rank_codes(data[keys[0]], reverses[0])), kind='stable')
+
+    # np.lexsort는 마지막 키를 가장 우선으로 보므로 순서를 뒤집어서 넘긴다
+    columns = [_rank_codes(data[k], r) for k, r in zip(keys, reverses)]
+    return np.lexsort(columns[::-1])
+
+
+@timed('sort.fast_sort')
+def fast_sort(data, key=None, reverse=False):
+    """
+    O(n log n) 안정 정렬 (교육용 정렬 함수들과 같은 key/reverse 사용법)
+    Args:
+        data: 정렬할 리스트 또는 pandas DataFrame
+        key: DataFrame의 경우 컬럼명 또는 컬럼명 리스트 (None이면 모든 컬럼)
+        reverse: True면 내림차순, 컬럼마다 다르게 하려면 bool 리스트
+    Returns:
+        정렬된 리스트 또는 DataFrame (행 순서만 바뀌고 인덱스는 0부터 다시 매김)
+    """
+    if isinstance(data, pd.DataFrame):
+        if key is None:
+            key = list(data.columns)
+        order = sort_permutation(data, key, reverse)
+        return data.take(order).reset_index(drop=True)
+    else:
+        # 리스트는 파이썬 내장 timsort 사용 (reverse=True도 안정 정렬)
+        return sorted(data, reverse=reverse)
+
+
+# Top K 찾기 (전체 정렬 없이 부분 선택)
+@timed('sort.top_k')
+def top_k(data, k, key, reverse=True, by=None):
+    """
+    상위 k개 행 찾기 (np.partition으로 O(n) 선택 후 k개만 정렬)
+    동점은 원래 행 순서가 앞선 것이 먼저 온다 (안정 정렬 후 head(k)와 같은 결과).
+    Args:
+        data: pandas DataFrame
+        k: 상위 k개 (by가 있으면 그룹마다 k개)
+        key: 정렬 기준 컬럼명
+        reverse: True면 큰 값부터
+        by: 그룹 컬럼명 또는 컬럼명 리스트 (예: '지역'이면 지역마다 상위 k개 범죄)
+    Returns:
+        상위 k개 DataFrame (by가 있으면 그룹 이름 순 -> 그룹 안 순위 순)
+    """
+    n = len(data)
+    if k <= 0 or n == 0:
+        return data.iloc[:0].reset_index(drop=True)
+
+    # 코드가 작을수록 앞 순위
+    codes = _rank_codes(data[key], reverse)
+
+    if by is None:
+        order = _smallest_k(codes, k)
+    else:
+        # 그룹별 top-k: 행을 그룹 이름 순으로 모으고 (그룹 코드는 작은 정수라 radix sort)
+        # 그룹마다 k개만 골라서 그 k개만 정렬 (행 전체를 (그룹, 키)로 정렬하지 않음)
+        group_cols = [by] if isinstance(by, str) else list(by)
+        group = np.zeros(n, dtype=np.int64)
+        for col in group_cols:
+            g = _rank_codes(data[col], False)
+            group = group * (int(g.max()) + 1) + g
+        group, uniques = pd.factorize(group, sort=True)
+        grouped = np.argsort(_narrow(group), kind='stable')
+        bounds = np.cumsum(np.bincount(group, minlength=len(uniques)))
+
+        parts = []
+        start = 0
+        for stop in bounds:
+            rows = grouped[start:stop]
+            parts.append(rows[_smallest_k(codes[rows], k)])
+            start = stop
+        order = np.concatenate(parts)
+
+    return data.take(order).reset_index(drop=True)
+
+
+@timed('sort.get_top_k')
+def get_top_k(data, k, key=None, reverse=True, by=None):
+    """
+    Top K 항목 찾기 (전체를 정렬하지 않음)
+    Args:
+        data: pandas DataFrame 또는 리스트
+        k: 상위 k개
+        key: 정렬 기준 컬럼명
+        reverse: True면 내림차순
+        by: 그룹별 top-k를 원할 때 그룹 컬럼명
+    Returns:
+        상위 k개 DataFrame 또는 리스트
+    """
+    if isinstance(data, pd.DataFrame):
+        return top_k(data, k, key=key, reverse=reverse, by=by)
+    # 리스트는 크기 k인 힙으로 선택 (heapq.nlargest/nsmallest는 동점 순서를 유지)
+    if reverse:
+        return heapq.nlargest(k, data)
+    return heapq.nsmallest(k, data)
@@ -0,0 +1,75 @@
+import inspect
+import os
+
+import streamlit as st
+
+from snapshot import ENABLED as SNAPSHOT_ENABLED, SNAPSHOT_PATH, data_signature, load_snapshot, refresh_snapshot
+from watcher import DataWatcher, StoreLoader, imports_done
+
+# 첫 화면에 필요한 것만 모은 모듈 (pandas, plotly.express, 데이터 모듈을 import하지 않음)
+# 무거운 섹션은 sections.py에 있고 탭을 열 때 import됨
+
+# 데이터 폴더 (연도별 통계 CSV 파일을 모두 읽음)
+DATA_DIR = "data"
+
+# 열린 탭만 실행하는 stateful 탭 (st.tabs의 key, on_change와 tab.open)을 지원하는 streamlit인지
+STATEFUL_TABS = 'on_change' in inspect.signature(st.tabs).parameters
+
+def section_tabs(labels):
+    """섹션 탭 (stateful 탭이 없는 streamlit이면 보통 st.tabs로, 이때는 모든 탭이 실행됨)"""
+    if STATEFUL_TABS:
+        return st.tabs(labels, key='section_tab', on_change='rerun')
+    return st.tabs(labels)
+
+def tab_open(tab):
+    """탭이 열려 있는지 (stateful 탭이 아니면 어느 탭이 보이는지 알 수 없으므로 항상 True)"""
+    return getattr(tab, 'open', True)
+
+# 데이터 로드 작업 (프로세스마다 하나, 백그라운드에서 읽고 다 읽으면 첫 화면 스냅샷을 새로 만듦)
+@st.cache_resource
+def get_loader():
+    return StoreLoader(DATA_DIR, on_ready=lambda store: refresh_snapshot(store, DATA_DIR))
+
+def load_store():
+    """data 폴더의 연도별 CSV를 병렬로 읽어 합친 저장소 (모든 세션이 공유, 읽는 중이면 기다림)"""
+    return get_loader().result()
+
+# data 폴더 감시 (프로세스마다 하나, 바뀐 파일만 백그라운드에서 다시 읽고 스냅샷도 다시 만듦)
+@st.cache_resource
+def get_watcher():
+    watcher = DataWatcher(load_store(), on_update=lambda store: refresh_snapshot(store, DATA_DIR))
+    watcher.start()
+    return watcher
+
+def snapshot_mtime():
+    """스냅샷 파일 수정 시각 (캐시 키로 사용, 파일이 없으면 None)"""
+    try:
+        return os.path.getmtime(SNAPSHOT_PATH)
+    except OSError:
+        return None
+
+@st.cache_resource(max_entries=2)
+def cached_snapshot(signature, mtime):
+    """데이터 파일이나 스냅샷 파일이 바뀌었을 때만 다시 읽음 (읽기 전용으로 공유)"""
+    return load_snapshot(DATA_DIR) if mtime is not None else None
+
+def get_snapshot():
+    """
+    첫 화면 스냅샷
+    Returns:
+        스냅샷 dict, 꺼져 있거나 없거나 데이터가 바뀌었으면 None
+    """
+    if not SNAPSHOT_ENABLED:
+        return None
+    # 시그니처는 stat만 하므로 매 실행마다 확인해도 가벼움
+    signature = data_signature(DATA_DIR)
+    return cached_snapshot(tuple(map(tuple, signature)), snapshot_mtime())
+
+@st.cache_resource(max_entries=8)
+def snapshot_figure(version, name, _spec):
+    """스냅샷의 차트 spec을 plotly 그림으로 (검증은 데이터 버전마다 한 번만, 모든 세션이 공유)"""
+    import plotly.graph_objects as go
+
+    # 검증도 sys.modules의 numpy, pandas를 쓰므로 백그라운드에서 import하는 중이면 기다림
+    imports_done.wait()
+    return go.Figure(_spec)
@@ -0,0 +1,356 @@
+import glob
+import hashlib
+import multiprocessing
+import os
+import re
+import sys
+import threading
+import types
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from aggregates import CrimeCube
+from cache import file_fingerprint, read_cache, write_cache
+from loader import DataLoadError, YEAR_COL, read_raw
+from profiling import span, timed
+
+
+# 파일 이름의 기준일(예: _20231231) 또는 연도(예: 2023)에서 통계 연도 찾기
+DATE_PATTERN = re.compile(r'((?:19|20)\d{2})[01]\d[0-3]\d')
+YEAR_PATTERN = re.compile(r'(?:19|20)\d{2}')
+
+# 파일을 병렬로 읽는 작업 프로세스의 시작 방식
+SPAWN = multiprocessing.get_context('spawn')
+
+
+def file_year(path):
+    """
+    파일 이름에서 통계 연도 찾기
+    Args:
+        path: CSV 파일 경로
+    Returns:
+        연도(int), 찾을 수 없으면 None
+    """
+    name = os.path.basename(path)
+    dates = DATE_PATTERN.findall(name)
+    if dates:
+        return int(dates[-1])
+    years = YEAR_PATTERN.findall(name)
+    return int(years[-1]) if years else None
+
+
+def discover_files(data_dir):
+    """
+    data 폴더의 통계 CSV 파일 찾기
+    Returns:
+        {연도: 경로} dict (같은 연도 파일이 여러 개면 이름순으로 마지막 파일 = 가장 늦은 발표본)
+    """
+    files = {}
+    for path in sorted(glob.glob(os.path.join(data_dir, '*.csv'))):
+        year = file_year(path)
+        if year is not None:
+            files[year] = path
+    return files
+
+
+@timed('load.ingest_file')
+def ingest_file(path, fingerprint=None):
+    """
+    파일 하나를 읽어서 행렬로 만들기 (디스크 캐시 사용)
+    캐시에 저장할 수 있으면 행렬은 캐시 파일의 읽기 전용 memmap이라서
+    여러 프로세스가 같은 페이지를 공유한다 (복사해서 들고 있지 않음).
+    Args:
+        path: CSV 파일 경로
+        fingerprint: 미리 계산한 file_fingerprint(path) 결과
+    Returns:
+        dict (path, fingerprint, regions, crimes, matrix, attrs)
+    """
+    fingerprint = fingerprint or file_fingerprint(path)
+    cube = read_cache(path, fingerprint=fingerprint)
+    if cube is None:
+        df_raw, encoding, reason = read_raw(path)
+        cube = CrimeCube.from_wide(df_raw)
+        if cube.matrix.size == 0:
+            raise DataLoadError(f"0보다 큰 발생 건수가 하나도 없습니다: {path}")
+        cube.attrs['encoding'] = encoding
+        cube.attrs['encoding_reason'] = reason
+        if write_cache(path, cube, fingerprint=fingerprint):
+            cube = read_cache(path, fingerprint=fingerprint) or cube
+    cube.attrs['sha256'] = fingerprint['sha256']
+    return {
+        'path': path,
+        'fingerprint': fingerprint,
+        'regions': list(cube.regions),
+        'crimes': list(cube.crimes),
+        'matrix': cube.matrix,
+        'attrs': dict(cube.attrs),
+    }
+
+
+def _ingest_in_worker(path):
+    # 프로세스 풀에서 실행: memmap을 pickle하면 복사본이 넘어가므로
+    # 캐시 파일을 연 (읽기 전용) 행렬은 빼고 보내고 받는 쪽에서 다시 연다
+    entry = ingest_file(path)
+    if not entry['matrix'].flags.writeable:
+        entry['matrix'] = None
+    return entry
+
+
+@contextmanager
+def _worker_main():
+    # spawn 작업 프로세스는 부모의 __main__ 파일을 __mp_main__으로 다시 실행하는데
+    # streamlit은 __main__을 페이지 스크립트(main.py)로 바꿔 두므로 작업 프로세스마다 대시보드 전체가 실행된다.
+    # 작업 프로세스를 띄우는 동안만 __file__/__spec__이 없는 빈 __main__을 보여줘서 store만 import하게 함
+    main = sys.modules['__main__']
+    stub = sys.modules['__main__'] = types.ModuleType('__main__')
+    try:
+        yield
+    finally:
+        # 그 사이에 다른 스레드(streamlit 재실행)가 __main__을 바꿨으면 그대로 둠
+        if sys.modules['__main__'] is stub:
+            sys.modules['__main__'] = main
+
+
+def _attach_matrix(entry):
+    # 작업 프로세스가 캐시에 써 둔 행렬을 이 프로세스에서 memmap으로 열기
+    if entry['matrix'] is None:
+        cube = read_cache(entry['path'], fingerprint=entry['fingerprint'])
+        if cube is None:
+            return ingest_file(entry['path'], fingerprint=entry['fingerprint'])
+        entry['matrix'] = cube.matrix
+    return entry
+
+
+class CrimeStore:
+    """
+    여러 연도 통계 파일을 하나로 합친 저장소
+    - files[year]['matrix'] = 그 연도 파일의 지역 x 범죄유형 행렬 (디스크 캐시의 읽기 전용 memmap, 복사하지 않음)
+    - positions[year] = 그 연도 행렬의 행/열이 regions/crimes(모든 연도 라벨 합집합)의 몇 번째인지
+    - 파일마다 지문(크기, mtime, 해시)을 기억해서 바뀐 파일만 다시 읽는다.
+    - 바뀐 파일이 여러 개면 프로세스 풀에서 병렬로 읽고 변환한다.
+    - 읽지 못한 파일은 오류를 errors에 남기고 나머지 파일만 반영한다.
+      그 파일은 다시 바뀔 때까지 (크기, mtime이 같으면) 다시 읽지 않는다.
+    """
+
+    def __init__(self, data_dir, max_workers=None):
+        self.data_dir = data_dir
+        self.max_workers = max_workers
+        self.files = {}      # 연도 -> ingest_file 결과
+        self.years = []
+        self.regions = []
+        self.crimes = []
+        self.positions = {}  # 연도 -> (행 위치 배열, 열 위치 배열)
+        self.version = ''
+        self.errors = {}     # 읽지 못한 파일 경로 -> 오류 메시지
+        self._failed = {}    # 읽지 못한 파일 경로 -> 그때의 (크기, mtime)
+        self._cubes = {}
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+
+    def _changed(self, found):
+        # stat이 같으면 해시도 계산하지 않고 넘어감, stat이 달라도 내용 해시가 같으면 그대로 둠
+        changed = []
+        for year, path in found.items():
+            stat = os.stat(path)
+            if self._failed.get(path) == (stat.st_size, stat.st_mtime_ns):
+                continue
+            entry = self.files.get(year)
+            if entry is not None and entry['path'] == path:
+                old = entry['fingerprint']
+                if (stat.st_size, stat.st_mtime_ns) == (old['size'], old['mtime_ns']):
+                    continue
+                fingerprint = file_fingerprint(path)
+                if fingerprint['sha256'] == old['sha256']:
+                    entry['fingerprint'] = fingerprint
+                    continue
+            changed.append((year, path))
+        return changed
+
+    def _ingest(self, changed):
+        # 파일마다 따로 읽어서 (연도, 경로, 결과) 리스트와 {경로: 예외}를 돌려줌
+        results, errors = [], {}
+        if len(changed) > 1 and self.max_workers != 1:
+            # 스레드가 여러 개인 서버 프로세스를 fork하면 다른 스레드가 잡고 있던 잠금 때문에 멈출 수 있어서 spawn
+            with ProcessPoolExecutor(max_workers=self.max_workers, mp_context=SPAWN) as pool:
+                # 작업 프로세스는 submit 안에서 시작됨
+                with _worker_main():
+                    futures = [(year, path, pool.submit(_ingest_in_worker, path)) for year, path in changed]
+                for year, path, future in futures:
+                    try:
+                        results.append((year, path, _attach_matrix(future.result())))
+                    except Exception as e:
+                        errors[path] = e
+        else:
+            for year, path in changed:
+                try:
+                    results.append((year, path, ingest_file(path)))
+                except Exception as e:
+                    errors[path] = e
+        return results, errors
+
+    @timed('load.refresh')
+    def refresh(self):
+        """
+        data 폴더를 다시 훑어서 추가/변경/삭제된 파일만 반영
+        파일 읽기와 합치기는 잠금 밖에서 하고 마지막에 한 번에 바꿔 끼우므로
+        그동안 다른 세션은 이전 데이터를 그대로 읽는다.
+        파일 하나를 읽지 못해도 나머지는 반영하고 오류는 errors에 남긴다.
+        Returns:
+            다시 읽은 (연도, 경로) 리스트와 삭제된 연도 리스트 튜플
+        Raises:
+            DataLoadError: 통계 파일이 하나도 없거나 읽을 수 있는 파일이 하나도 없을 때
+        """
+        with self._refresh_lock:
+            found = discover_files(self.data_dir)
+            if not found:
+                raise DataLoadError(f"'{self.data_dir}' 폴더에 연도가 붙은 통계 CSV 파일이 없습니다.")
+
+            paths = set(found.values())
+            for path in [path for path in self._failed if path not in paths]:
+                del self._failed[path]
+                self.errors.pop(path, None)
+
+            changed = self._changed(found)
+            removed = [year for year in self.files if year not in found]
+            results = []
+            if changed:
+                stats = {path: os.stat(path) for _, path in changed}
+                results, errors = self._ingest(changed)
+                for path, error in errors.items():
+                    self._failed[path] = (stats[path].st_size, stats[path].st_mtime_ns)
+                    self.errors[path] = str(error)
+                for _, path, _ in results:
+                    self._failed.pop(path, None)
+                    self.errors.pop(path, None)
+                changed = [(year, path) for year, path, _ in results]
+            if not changed and not removed:
+                self._check_loaded(self.files)
+                return [], []
+
+            files = dict(self.files)
+            for year, _, result in results:
+                files[year] = result
+            for year in removed:
+                del files[year]
+            self._check_loaded(files)
+
+            # 바뀌지 않은 연도의 cube(와 그 안의 집계)는 그대로 다시 씀
+            stale = {year for year, _ in changed} | set(removed) | {None}
+            cubes = {year: cube for year, cube in self._cubes.items() if year not in stale}
+            with span('transform.merge'):
+                merged = self._merge(files)
+            added = [year for year, _ in changed if year not in self.files]
+            total = self._cubes.get(None)
+            if total is not None and len(added) == len(changed) and not removed:
+                # 새 연도만 들어왔으면 합계 cube는 새 연도 칸만 더해서 갱신
+                cubes[None] = self._append_years(total, [files[year] for year in added], merged[-1])
+            with self._lock:
+                self.files = files
+                self.years, self.regions, self.crimes, self.positions, self.version = merged
+                self._cubes = cubes
+            return changed, removed
+
+    def _check_loaded(self, files):
+        # 읽은 연도가 하나도 없으면 그대로 서비스할 수 없음
+        if not files:
+            raise DataLoadError(f"'{self.data_dir}' 폴더의 통계 파일을 하나도 읽지 못했습니다. {self.error_text()}")
+
+    def error_text(self):
+        """읽지 못한 파일들의 오류를 한 줄로 (없으면 빈 문자열)"""
+        return '; '.join(f"{os.path.basename(path)}: {error}" for path, error in list(self.errors.items()))
+
+    def _merge(self, files):
+        # 모든 연도의 라벨 합집합과 연도별 행/열 위치만 만듦 (행렬은 캐시 memmap 그대로 두고 복사하지 않음)
+        years = sorted(files)
+        regions, crimes = {}, {}
+        for year in years:
+            for name in files[year]['regions']:
+                regions.setdefault(name, len(regions))
+            for name in files[year]['crimes']:
+                crimes.setdefault(name, len(crimes))
+
+        positions = {
+            year: (np.array([regions[name] for name in files[year]['regions']], dtype=np.int64),
+                   np.array([crimes[name] for name in files[year]['crimes']], dtype=np.int64))
+            for year in years
+        }
+
+        digest = hashlib.sha256()
+        for year in years:
+            digest.update(f"{year}:{files[year]['fingerprint']['sha256']};".encode('utf-8'))
+        return years, list(regions), list(crimes), positions, digest.hexdigest()[:16]
+
+    def _append_years(self, total, entries, version):
+        # 세션들이 보고 있는 합계 cube는 그대로 두고 복사본에 더함 (읽기 전용 행렬은 append가 복사)
+        cube = CrimeCube(total.regions, total.crimes, total.matrix, attrs=total.attrs)
+        frames = [CrimeCube(entry['regions'], entry['crimes'], entry['matrix']).to_long() for entry in entries]
+        cube.append(pd.concat(frames, ignore_index=True), version=f'{version}-all')
+        cube.matrix.flags.writeable = False
+        return cube
+
+    def latest_year(self):
+        return self.years[-1] if self.years else None
+
+    def cached_years(self):
+        """cube를 이미 만들어 둔 연도들 (None은 모든 연도 합계)"""
+        with self._lock:
+            return list(self._cubes)
+
+    def cube(self, year=None):
+        """
+        한 연도(또는 None이면 모든 연도 합계)의 CrimeCube (데이터가 바뀔 때만 새로 만듦)
+        attrs['version']은 그 화면의 캐시 키로 쓴다. 연도 cube는 그 파일의 해시,
+        합계 cube는 저장소 버전이라서 다른 연도 파일이 바뀌어도 키가 그대로다.
+        """
+        with self._lock:
+            cube = self._cubes.get(year)
+            if cube is not None:
+                return cube
+            if year is None:
+                # 합계는 연도 행렬을 라벨 합집합 위치에 더해서 만듦 (모든 연도에 0인 지역/범죄는 없음)
+                total = np.zeros((len(self.regions), len(self.crimes)), dtype=np.int64)
+                for y in self.years:
+                    rows, cols = self.positions[y]
+                    total[np.ix_(rows, cols)] += self.files[y]['matrix']
+                cube = CrimeCube(self.regions, self.crimes, total.astype(np.int32))
+                version = self.version
+            else:
+                # 파일 하나의 행렬과 라벨이 그대로 cube가 됨 (memmap을 복사하지 않고 모든 세션이 공유)
+                entry = self.files[year]
+                matrix = entry['matrix']
+                keep_rows = matrix.any(axis=1)
+                keep_cols = matrix.any(axis=0)
+                if not (keep_rows.all() and keep_cols.all()):
+                    matrix = matrix[np.ix_(keep_rows, keep_cols)]
+                cube = CrimeCube(
+                    np.asarray(entry['regions'], dtype=object)[keep_rows],
+                    np.asarray(entry['crimes'], dtype=object)[keep_cols],
+                    matrix,
+                    attrs=entry['attrs']
+                )
+                version = entry['fingerprint']['sha256'][:16]
+            cube.matrix.flags.writeable = False
+            cube.attrs['year'] = year
+            cube.attrs['version'] = f"{version}-{year if year is not None else 'all'}"
+            self._cubes[year] = cube
+            return cube
+
+    def iter_long(self):
+        """
+        연도마다 long format 조각 ('연도', '지역', '범죄유형', '발생건수')을 하나씩 만듦
+        전체를 한 테이블로 합치지 않으므로 external_sort 같은 스트리밍 처리에 넘길 수 있다.
+        """
+        for year in list(self.years):
+            frame = self.cube(year).to_long()
+            frame.insert(0, YEAR_COL, np.int16(year))
+            yield frame
+
+    def to_long(self):
+        """모든 연도의 long format 테이블 ('연도', '지역', '범죄유형', '발생건수')"""
+        frames = list(self.iter_long())
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
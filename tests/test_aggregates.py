@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from aggregates import CrimeCube
+
+
+@pytest.fixture
+def cube():
+    rng = np.random.default_rng(7)
+    regions = [f'서울{name}구' for name in '가나다라마바사아자차']
+    crimes = [f'범죄{j:02d}' for j in range(12)]
+    # 작은 값 범위라 동점이 많음
+    return CrimeCube(regions, crimes, rng.integers(0, 4, size=(len(regions), len(crimes))))
+
+
+def cells(cube):
+    return [(int(cube.matrix[i, j]), region, crime)
+            for i, region in enumerate(cube.regions)
+            for j, crime in enumerate(cube.crimes)
+            if cube.matrix[i, j] > 0]
+
+
+def rows(frame):
+    return [(int(count), region, crime) for region, crime, count in frame.itertuples(index=False, name=None)]
+
+
+@pytest.mark.parametrize('k', [1, 5, 40, 1000])
+def test_top_k_matches_brute_force(cube, k):
+    expected = sorted(cells(cube), key=lambda c: (-c[0], c[1], c[2]))[:k]
+    assert rows(cube.top_k(k)) == expected
+
+
+@pytest.mark.parametrize('k', [1, 3, 12, 50])
+def test_top_k_by_region_and_crime_match_brute_force(cube, k):
+    by_region = []
+    for region in sorted(cube.regions):
+        group = [c for c in cells(cube) if c[1] == region]
+        by_region += sorted(group, key=lambda c: (-c[0], c[2]))[:k]
+    assert rows(cube.top_k(k, by='지역')) == by_region
+
+    by_crime = []
+    for crime in sorted(cube.crimes):
+        group = [c for c in cells(cube) if c[2] == crime]
+        by_crime += sorted(group, key=lambda c: (-c[0], c[1]))[:k]
+    assert rows(cube.top_k(k, by='범죄유형')) == by_crime
+
+
+def test_top_k_rejects_unknown_axis(cube):
+    with pytest.raises(ValueError):
+        cube.top_k(3, by='시도')
+
+
+def test_totals_match_matrix(cube):
+    totals = cube.region_totals()
+    expected = sorted(((int(s), r) for r, s in zip(cube.regions, cube.matrix.sum(axis=1)) if s > 0),
+                      key=lambda t: (-t[0], t[1]))
+    assert [(int(c), r) for r, c in totals.itertuples(index=False, name=None)] == expected
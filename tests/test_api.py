@@ -0,0 +1,87 @@
+import glob
+import http.client
+import json
+import os
+import shutil
+import threading
+from urllib.parse import quote
+
+import pytest
+
+import cache
+from api import ApiServer
+from queries import QueryService
+from store import CrimeStore
+
+
+SOURCE = glob.glob(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', '*.csv'))[0]
+
+
+@pytest.fixture(scope='module')
+def server(tmp_path_factory):
+    tmp_path = tmp_path_factory.mktemp('api')
+    data_dir = tmp_path / 'data'
+    data_dir.mkdir()
+    shutil.copy(SOURCE, data_dir / '통계_20231231.csv')
+    store = CrimeStore(str(data_dir), max_workers=1)
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(cache, 'CACHE_DIR', str(tmp_path / 'cache'))
+        store.refresh()
+    server = ApiServer(('127.0.0.1', 0), QueryService(store), cache_entries=16)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def get(server, path, headers=None):
+    conn = http.client.HTTPConnection('127.0.0.1', server.server_port, timeout=10)
+    try:
+        conn.request('GET', quote(path, safe='/?=&'), headers=headers or {})
+        res = conn.getresponse()
+        body = res.read()
+        return res.status, res.getheader('ETag'), json.loads(body) if body else None
+    finally:
+        conn.close()
+
+
+def test_query_and_etag_revalidation(server):
+    status, etag, body = get(server, '/api/region_totals?year=2023&limit=5')
+    assert status == 200
+    assert len(body['rows']) == 5
+    counts = [row['발생건수'] for row in body['rows']]
+    assert counts == sorted(counts, reverse=True)
+
+    status, same, body = get(server, '/api/region_totals?year=2023&limit=5', {'If-None-Match': etag})
+    assert (status, same, body) == (304, etag, None)
+    # 파라미터가 다르면 ETag도 다름
+    assert get(server, '/api/region_totals?year=2023&limit=6')[1] != etag
+
+
+@pytest.mark.parametrize('path', [
+    '/api/region_totals?limit=abc',
+    '/api/region_totals?limit=0',
+    '/api/region_totals?year=1999',
+    '/api/region_totals?color=red',
+    '/api/district_totals',
+    '/api/rank_range?start=5&stop=1',
+])
+def test_bad_parameters_are_400(server, path):
+    status, _, body = get(server, path)
+    assert status == 400
+    assert body['error']
+
+
+@pytest.mark.parametrize('path', ['/api/nothing', '/other'])
+def test_unknown_paths_are_404(server, path):
+    status, _, body = get(server, path)
+    assert status == 404
+    assert body['error']
+
+
+def test_meta(server):
+    status, _, body = get(server, '/api/meta')
+    assert status == 200
+    assert body['years'] == [2023]
+    assert 'region_totals' in body['queries']
@@ -0,0 +1,58 @@
+import os
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from external_sort import external_sort
+from sorting import fast_sort
+
+
+def random_values(n, seed):
+    rng = random.Random(seed)
+    return [rng.randint(0, 1000) for _ in range(n)]
+
+
+@pytest.mark.parametrize('reverse', [False, True])
+@pytest.mark.parametrize('memory_limit', [4096, 1 << 20])
+def test_values_match_sorted(reverse, memory_limit):
+    # 작은 상한이면 run이 많이 생겨서 여러 단계로 합쳐짐
+    values = random_values(20000, memory_limit)
+    assert list(external_sort(iter(values), reverse=reverse, memory_limit=memory_limit)) == \
+        sorted(values, reverse=reverse)
+
+
+def test_values_with_key_are_stable():
+    rng = random.Random(1)
+    values = [(rng.randint(0, 9), i) for i in range(5000)]
+    key = lambda value: value[0]
+    assert list(external_sort(values, key=key, memory_limit=4096)) == sorted(values, key=key)
+    assert list(external_sort(values, key=key, reverse=True, memory_limit=4096)) == \
+        sorted(values, key=key, reverse=True)
+
+
+def test_empty_input():
+    assert list(external_sort([])) == []
+
+
+def test_frames_match_fast_sort(tmp_path):
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame({
+        '지역': rng.choice(['서울', '부산', '대구', None], 3000),
+        '발생건수': rng.integers(0, 50, 3000),
+        '비율': np.where(rng.random(3000) < 0.1, np.nan, rng.random(3000)),
+    })
+    keys, reverses = ['발생건수', '지역', '비율'], [True, False, True]
+    chunks = [df.iloc[start:start + 250] for start in range(0, len(df), 250)]
+    result = pd.concat(external_sort(chunks, key=keys, reverse=reverses, memory_limit=16384,
+                                     chunk_rows=700, tmp_dir=str(tmp_path)), ignore_index=True)
+    pd.testing.assert_frame_equal(result, fast_sort(df, key=keys, reverse=reverses))
+    # 정렬이 끝나면 run 파일은 남지 않음
+    assert os.listdir(tmp_path) == []
+
+
+def test_frames_reject_mismatched_columns():
+    chunks = [pd.DataFrame({'a': [1]}), pd.DataFrame({'b': [2]})]
+    with pytest.raises(ValueError):
+        list(external_sort(chunks, key='a'))
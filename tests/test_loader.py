@@ -0,0 +1,42 @@
+import pytest
+
+from loader import DataLoadError, read_raw, sniff_encoding
+
+
+HEADER = '범죄대분류,범죄중분류,서울종로구\n'
+
+
+def write(path, text, encoding):
+    path.write_bytes(text.encode(encoding))
+    return str(path)
+
+
+def test_sniff_encoding():
+    assert sniff_encoding(b'\xef\xbb\xbfabc')[0] == 'utf-8-sig'
+    assert sniff_encoding(b'abc')[0] == 'utf-8'
+    assert sniff_encoding('강력범죄'.encode('utf-8'))[0] == 'utf-8'
+    assert sniff_encoding('강력범죄'.encode('cp949'), complete=True)[0] == 'cp949'
+    with pytest.raises(DataLoadError):
+        sniff_encoding(b'\xff\xff\xff', complete=True)
+
+
+def test_read_raw_retries_cp949_after_ascii_sample(tmp_path):
+    # 판별에 쓰는 앞부분은 ASCII뿐이고 cp949 글자는 그 뒤에 나옴
+    text = 'a,b,c\n' + '1,2,3\n' * 20 + '강력범죄,살인,1\n'
+    path = write(tmp_path / 'late.csv', text, 'cp949')
+    df_raw, encoding, _ = read_raw(path, sniff_bytes=16)
+    assert encoding == 'cp949'
+    assert df_raw.iloc[-1, 0] == '강력범죄'
+
+
+def test_read_raw_utf8_and_cp949(tmp_path):
+    text = HEADER + '강력범죄,살인,3\n'
+    for encoding in ['utf-8', 'cp949']:
+        df_raw, detected, _ = read_raw(write(tmp_path / f'{encoding}.csv', text, encoding))
+        assert detected == encoding
+        assert list(df_raw.columns) == ['범죄대분류', '범죄중분류', '서울종로구']
+
+
+def test_read_raw_rejects_too_few_columns(tmp_path):
+    with pytest.raises(DataLoadError):
+        read_raw(write(tmp_path / 'narrow.csv', 'a,b\n1,2\n', 'utf-8'))
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from aggregates import CrimeCube
+from rank_index import RankIndex
+
+
+@pytest.fixture
+def cube():
+    # 값 범위가 작아서 동점 그룹이 많음 (0인 지역도 공동 꼴찌로 들어감)
+    rng = np.random.default_rng(13)
+    regions = [f'부산지역{i:02d}구' for i in rng.permutation(30)]
+    return CrimeCube(regions, ['가', '나', '다'], rng.integers(0, 5, (30, 3)))
+
+
+def brute_ranks(cube, c):
+    counts = cube.region_sums if c is None else cube.matrix[:, cube.crime_index(c)]
+    # 순위 = 나보다 건수가 많은 지역 수 + 1
+    return {name: int((counts > count).sum()) + 1 for name, count in zip(cube.regions, counts)}
+
+
+@pytest.mark.parametrize('crime', [None, '가', '다'])
+def test_rank_matches_brute_force(cube, crime):
+    index = RankIndex(cube)
+    expected = brute_ranks(cube, crime)
+    for region, rank in expected.items():
+        assert index.rank(region, crime)['rank'] == rank
+    assert index.rank('없는지역', crime) is None
+
+
+@pytest.mark.parametrize('crime', [None, '가', '나'])
+@pytest.mark.parametrize('start, stop', [(1, 1), (1, 12), (3, 7), (10, 30), (25, 100), (0, 2), (8, 5)])
+def test_between_selects_by_rank_value(cube, crime, start, stop):
+    index = RankIndex(cube)
+    ranks = brute_ranks(cube, crime)
+    result = index.between(start, stop, crime)
+    # 순위 값이 구간 안인 지역 전부 (동점 그룹을 자르지 않음), 순위 -> 지역 이름 순
+    expected = sorted((rank, name) for name, rank in ranks.items() if start <= rank <= stop)
+    assert list(zip(result['순위'], result['지역'])) == expected
+
+
+def test_rank_of_count(cube):
+    index = RankIndex(cube)
+    counts = cube.matrix[:, cube.crime_index('가')]
+    for count in range(-1, 7):
+        assert index.rank_of_count(count, '가') == int((counts > count).sum()) + 1
+    with pytest.raises(KeyError):
+        index.rank_of_count(1, '없는범죄')
+
+
+def test_scorecard_starts_with_total(cube):
+    index = RankIndex(cube)
+    card = index.scorecard(cube.regions[0])
+    assert card['범죄유형'].iloc[0] == '전체'
+    assert card['순위'].iloc[1:].is_monotonic_increasing
+    assert index.scorecard('없는지역').empty
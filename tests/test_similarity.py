@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from aggregates import CrimeCube
+from similarity import SimilarityIndex
+
+
+# 노름이 정수인 패턴들이라 같은 패턴의 지역은 프로필이 정확히 같음 (유사도 동점)
+PATTERNS = [[1, 0, 0, 0], [0, 1, 0, 0], [3, 4, 0, 0], [0, 0, 3, 4], [2, 2, 1, 0], [1, 2, 2, 0], [0, 0, 0, 0]]
+
+
+@pytest.fixture
+def cube():
+    rng = np.random.default_rng(11)
+    picks = rng.integers(0, len(PATTERNS), 40)
+    matrix = np.array([PATTERNS[p] for p in picks]) * rng.integers(1, 4, (40, 1))
+    regions = [f'서울지역{i:02d}구' for i in rng.permutation(40)]
+    return CrimeCube(regions, ['가', '나', '다', '라'], matrix)
+
+
+def brute_similar(cube, region, k):
+    matrix = cube.matrix.astype(np.float64)
+    norms = np.linalg.norm(matrix, axis=1)
+    i = cube.region_index(region)
+    result = []
+    for j, name in enumerate(cube.regions):
+        if j == i:
+            continue
+        sim = matrix[i] @ matrix[j] / (norms[i] * norms[j]) if norms[i] and norms[j] else 0.0
+        result.append((round(sim, 4), name))
+    return sorted(result, key=lambda item: (-item[0], item[1]))[:k]
+
+
+@pytest.mark.parametrize('k', [1, 5, 12, 39, 100])
+def test_similar_matches_brute_force(cube, k):
+    index = SimilarityIndex(cube, max_neighbors=10, block_rows=7)
+    for region in cube.regions:
+        result = index.similar(region, k)
+        expected = brute_similar(cube, region, k)
+        assert result['지역'].tolist() == [name for _, name in expected]
+        assert np.allclose(result['유사도'], [sim for sim, _ in expected], atol=1e-4)
+
+
+def test_similar_unknown_region_and_nonpositive_k(cube):
+    index = SimilarityIndex(cube)
+    assert index.similar('없는지역', 5).empty
+    assert index.similar(cube.regions[0], 0).empty
+
+
+def test_profile_rows_sum_to_one(cube):
+    index = SimilarityIndex(cube)
+    nonzero = [name for name, total in zip(cube.regions, cube.region_sums) if total > 0][:5]
+    shares = index.profile(nonzero + ['없는지역'])
+    assert list(shares.index) == nonzero
+    assert np.allclose(shares.sum(axis=1), 1.0)
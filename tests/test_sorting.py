@@ -0,0 +1,123 @@
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sorting import INSERTION_THRESHOLD, fast_sort, get_top_k, quick_sort, sort_permutation, top_k
+
+
+def random_values(n, seed, high=50):
+    rng = random.Random(seed)
+    return [rng.randint(0, high) for _ in range(n)]
+
+
+@pytest.mark.parametrize('n', [0, 1, 2, INSERTION_THRESHOLD, INSERTION_THRESHOLD + 1, 500, 3000])
+@pytest.mark.parametrize('reverse', [False, True])
+def test_quick_sort_matches_sorted(n, reverse):
+    values = random_values(n, n)
+    assert quick_sort(values, reverse=reverse) == sorted(values, reverse=reverse)
+
+
+@pytest.mark.parametrize('values', [
+    list(range(1000)),           # 이미 정렬됨
+    list(range(1000, 0, -1)),    # 역순
+    [7] * 1000,                  # 모두 같은 값
+    [i % 3 for i in range(1000)],
+])
+def test_quick_sort_adversarial_inputs(values):
+    assert quick_sort(values) == sorted(values)
+
+
+def test_quick_sort_dataframe_column():
+    df = pd.DataFrame({'지역': [f'r{i}' for i in range(300)], '발생건수': random_values(300, 1)})
+    result = quick_sort(df, key='발생건수', reverse=True)
+    assert result['발생건수'].tolist() == sorted(df['발생건수'], reverse=True)
+    assert sorted(result['지역']) == sorted(df['지역'])
+
+
+def test_fast_sort_list():
+    values = random_values(200, 2)
+    assert fast_sort(values) == sorted(values)
+    assert fast_sort(values, reverse=True) == sorted(values, reverse=True)
+
+
+def test_sort_permutation_is_stable_with_mixed_directions():
+    rng = random.Random(3)
+    df = pd.DataFrame({
+        'a': [rng.randint(0, 5) for _ in range(400)],
+        'b': [rng.choice('가나다라마') for _ in range(400)],
+        'c': pd.Categorical([rng.choice(['x', 'y', 'z']) for _ in range(400)]),
+    })
+    rows = list(df.itertuples(index=False, name=None))
+    expected = sorted(range(len(rows)), key=lambda i: (-rows[i][0], rows[i][1], rows[i][2]))
+    order = sort_permutation(df, ['a', 'b', 'c'], [True, False, False])
+    assert order.tolist() == expected
+
+
+@pytest.mark.parametrize('reverse', [False, True])
+def test_sort_permutation_single_key(reverse):
+    # 범위가 작은 정수 (int16 radix sort)와 큰 정수 (int64) 모두
+    for high in [100, 10 ** 9]:
+        values = random_values(1000, high, high)
+        df = pd.DataFrame({'v': values})
+        expected = sorted(range(len(values)), key=lambda i: -values[i] if reverse else values[i])
+        assert sort_permutation(df, 'v', reverse).tolist() == expected
+
+
+@pytest.mark.parametrize('reverse', [False, True])
+def test_sort_permutation_puts_missing_last(reverse):
+    df = pd.DataFrame({'v': [3.0, np.nan, 1.0, 2.0, np.nan]})
+    result = df.take(sort_permutation(df, 'v', reverse))['v'].tolist()
+    assert result[:3] == sorted([1.0, 2.0, 3.0], reverse=reverse)
+    assert all(np.isnan(result[3:]))
+
+
+def test_sort_permutation_rejects_mismatched_reverse():
+    with pytest.raises(ValueError):
+        sort_permutation(pd.DataFrame({'a': [1], 'b': [2]}), ['a', 'b'], [True])
+
+
+def brute_top_k(df, k, key, reverse, by=None):
+    # 안정 정렬 후 (그룹마다) 앞의 k개
+    ordered = df.sort_values(key, ascending=not reverse, kind='stable')
+    if by is None:
+        return ordered.head(k).reset_index(drop=True)
+    return (ordered.sort_values(by, kind='stable').groupby(by, sort=False).head(k)
+            .reset_index(drop=True))
+
+
+@pytest.fixture
+def counts_frame():
+    rng = random.Random(5)
+    return pd.DataFrame({
+        '지역': [rng.choice(['서울', '부산', '대구', '인천']) for _ in range(600)],
+        '범죄유형': [f'c{rng.randint(0, 30)}' for _ in range(600)],
+        '발생건수': [rng.randint(0, 20) for _ in range(600)],
+    })
+
+
+@pytest.mark.parametrize('k', [1, 5, 37, 600, 1000])
+@pytest.mark.parametrize('reverse', [True, False])
+def test_top_k_matches_stable_sort(counts_frame, k, reverse):
+    expected = brute_top_k(counts_frame, k, '발생건수', reverse)
+    pd.testing.assert_frame_equal(top_k(counts_frame, k, '발생건수', reverse), expected)
+
+
+@pytest.mark.parametrize('k', [1, 3, 200])
+def test_top_k_by_group_matches_stable_sort(counts_frame, k):
+    expected = brute_top_k(counts_frame, k, '발생건수', True, by='지역')
+    pd.testing.assert_frame_equal(top_k(counts_frame, k, '발생건수', by='지역'), expected)
+    expected = brute_top_k(counts_frame, k, '발생건수', True, by=['지역', '범죄유형'])
+    pd.testing.assert_frame_equal(top_k(counts_frame, k, '발생건수', by=['지역', '범죄유형']), expected)
+
+
+def test_top_k_empty_and_nonpositive_k(counts_frame):
+    assert top_k(counts_frame, 0, '발생건수').empty
+    assert top_k(counts_frame.iloc[:0], 3, '발생건수').empty
+
+
+def test_get_top_k_list():
+    values = random_values(300, 6)
+    assert get_top_k(values, 10) == sorted(values, reverse=True)[:10]
+    assert get_top_k(values, 10, reverse=False) == sorted(values)[:10]
@@ -0,0 +1,115 @@
+import glob
+import os
+import shutil
+import sys
+import types
+
+import numpy as np
+import pytest
+
+import cache
+import store as store_module
+from api import make_etag
+from store import CrimeStore
+
+
+SOURCE = glob.glob(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', '*.csv'))[0]
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, 'CACHE_DIR', str(tmp_path / 'cache'))
+    # spawn 작업 프로세스는 환경 변수로 캐시 폴더를 받음
+    monkeypatch.setenv('CRIME_FINDER_CACHE_DIR', str(tmp_path / 'cache'))
+    path = tmp_path / 'data'
+    path.mkdir()
+    return path
+
+
+def add_year(data_dir, year):
+    shutil.copy(SOURCE, data_dir / f'통계_{year}1231.csv')
+
+
+def test_added_year_is_appended_to_total_cube(data_dir):
+    add_year(data_dir, 2022)
+    store = CrimeStore(str(data_dir), max_workers=1)
+    store.refresh()
+    before = store.cube()
+    etag = make_etag(before.attrs['version'], 'region_totals', {})
+
+    add_year(data_dir, 2023)
+    store.refresh()
+    after = store.cube()
+
+    # 새 연도 칸만 더한 복사본이 새 버전으로 들어가고, 보던 cube는 그대로
+    assert after is not before
+    assert after.attrs['version'] == f'{store.version}-all'
+    assert make_etag(after.attrs['version'], 'region_totals', {}) != etag
+    assert np.array_equal(after.region_sums, before.region_sums * 2)
+    assert before.matrix.sum() * 2 == after.matrix.sum()
+
+
+def test_append_changes_version(data_dir):
+    add_year(data_dir, 2023)
+    store = CrimeStore(str(data_dir), max_workers=1)
+    store.refresh()
+    cube = store.cube(2023)
+    version = cube.attrs['version']
+
+    cube.append(cube.to_long())
+    assert cube.attrs['version'] == f'{version}+1'
+    cube.append(cube.to_long())
+    assert cube.attrs['version'] == f'{version}+2'
+
+
+def test_broken_file_does_not_block_other_years(data_dir, monkeypatch):
+    add_year(data_dir, 2022)
+    broken = data_dir / '통계_20231231.csv'
+    broken.write_bytes(b'\xff\xfe\x00')
+    store = CrimeStore(str(data_dir), max_workers=1)
+    changed, _ = store.refresh()
+    assert [year for year, _ in changed] == [2022]
+    assert list(store.errors) == [str(broken)]
+
+    # 바뀌지 않은 잘못된 파일은 다시 읽지 않음
+    calls = []
+    with monkeypatch.context() as patch:
+        patch.setattr(store_module, 'ingest_file', lambda path, fingerprint=None: calls.append(path))
+        assert store.refresh() == ([], [])
+    assert calls == []
+
+    add_year(data_dir, 2023)
+    changed, _ = store.refresh()
+    assert [year for year, _ in changed] == [2023]
+    assert store.years == [2022, 2023]
+    assert store.errors == {}
+
+
+def test_cubes_share_cached_memmap(data_dir):
+    add_year(data_dir, 2022)
+    add_year(data_dir, 2023)
+    store = CrimeStore(str(data_dir), max_workers=1)
+    store.refresh()
+    for year in store.years:
+        matrix = store.files[year]['matrix']
+        assert not matrix.flags.writeable
+        assert np.shares_memory(store.cube(year).matrix, matrix)
+    assert np.array_equal(store.cube().matrix, store.cube(2022).matrix * 2)
+
+
+def test_pool_workers_do_not_rerun_page_script(data_dir, tmp_path, monkeypatch):
+    # streamlit처럼 __main__을 페이지 스크립트로 바꿔 둔 상태에서 프로세스 풀로 읽기
+    marker = tmp_path / 'ran'
+    script = tmp_path / 'page.py'
+    script.write_text(f'open({str(marker)!r}, "w").close()\n')
+    page = types.ModuleType('__main__')
+    page.__file__ = str(script)
+    monkeypatch.setitem(sys.modules, '__main__', page)
+
+    add_year(data_dir, 2022)
+    add_year(data_dir, 2023)
+    store = CrimeStore(str(data_dir), max_workers=2)
+    changed, _ = store.refresh()
+    assert len(changed) == 2
+    assert not marker.exists()
+    assert sys.modules['__main__'] is page
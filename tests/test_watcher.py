@@ -0,0 +1,44 @@
+import glob
+import os
+import shutil
+
+import pytest
+
+import cache
+from watcher import DataWatcher, StoreLoader, imports_done
+
+
+SOURCE = glob.glob(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', '*.csv'))[0]
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, 'CACHE_DIR', str(tmp_path / 'cache'))
+    path = tmp_path / 'data'
+    path.mkdir()
+    shutil.copy(SOURCE, path / '통계_20221231.csv')
+    return path
+
+
+def fail(store):
+    raise RuntimeError('boom')
+
+
+def test_loader_keeps_store_when_on_ready_fails(data_dir):
+    loader = StoreLoader(str(data_dir), on_ready=fail)
+    store = loader.result(timeout=60)
+    loader._thread.join(timeout=60)
+    assert imports_done.is_set()
+    assert store.years == [2022]
+    assert loader.ready_error == 'boom'
+
+
+def test_watcher_records_on_update_errors_and_keeps_polling(data_dir):
+    loader = StoreLoader(str(data_dir))
+    watcher = DataWatcher(loader.result(timeout=60), on_update=fail)
+    shutil.copy(SOURCE, data_dir / '통계_20231231.csv')
+    changed, _ = watcher.check()
+    assert [year for year, _ in changed] == [2023]
+    assert watcher.error == 'boom'
+    assert watcher.check() == ([], [])
+    assert watcher.error is None
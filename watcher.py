@@ -0,0 +1,166 @@
+import logging
+import os
+import sys
+import threading
+import time
+
+
+logger = logging.getLogger(__name__)
+
+# 폴링 주기 (초), 0이면 감시하지 않음
+POLL_SECONDS = float(os.environ.get('CRIME_FINDER_POLL_SECONDS', '5'))
+
+# StoreLoader가 pandas와 데이터 모듈을 import하는 동안만 clear (import가 끝나면 다시 set, 그 뒤로는 계속 set)
+# import 중인 모듈은 반쯤 만들어진 채로 sys.modules에 있어서 (plotly는 pandas가 sys.modules에 있으면 씀)
+# 그동안 다른 스레드에서 그리는 코드는 imports_done.wait()로 기다리고, 끝난 뒤에는 잠금 없이 그린다.
+imports_done = threading.Event()
+imports_done.set()
+
+
+def warm(cube):
+    """대시보드가 처음 그릴 때 쓰는 집계를 미리 만들어 둠 (다음 rerun이 기다리지 않도록)"""
+    cube.top_k(10)
+    cube.region_totals()
+    cube.crime_totals()
+    cube.sido_totals()
+    cube.pivot()
+
+
+class DataWatcher:
+    """
+    data 폴더 폴링 스레드
+    - interval초마다 CrimeStore.refresh()로 추가/변경/삭제된 파일만 다시 읽는다.
+    - 바뀐 것이 있으면 세션들이 보던 연도의 cube와 집계를 백그라운드에서 미리 만든다.
+    - 세션들은 다음 rerun에서 새 데이터를 보게 된다 (캐시 키가 데이터 버전이라 예전 결과는 쓰지 않음).
+    """
+
+    def __init__(self, store, interval=POLL_SECONDS, on_update=None):
+        self.store = store
+        self.interval = interval
+        # 바뀐 것을 반영한 뒤 부를 함수 (store를 받음, 예: 첫 화면 스냅샷 다시 만들기)
+        self.on_update = on_update
+        self.checks = 0
+        self.updates = 0
+        self.last_check = None
+        self.last_update = None
+        self.last_changes = ([], [])
+        self.error = store.error_text() or None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """감시 스레드 시작 (interval이 0 이하이면 아무것도 하지 않음)"""
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name='data-watcher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def check(self):
+        """
+        한 번 확인하고 바뀐 것을 반영
+        Returns:
+            CrimeStore.refresh()의 (다시 읽은 파일, 삭제된 연도) 튜플
+        """
+        warm_years = self.store.cached_years()
+        try:
+            changed, removed = self.store.refresh()
+        except Exception as e:
+            # 잘못된 파일이 들어와도 이전 데이터로 계속 서비스
+            self.error = str(e)
+            return [], []
+        finally:
+            self.checks += 1
+            self.last_check = time.time()
+        # 읽지 못한 파일이 있어도 나머지는 반영됨 (그 파일은 바뀔 때까지 다시 읽지 않음)
+        self.error = self.store.error_text() or None
+
+        if changed or removed:
+            self.updates += 1
+            self.last_update = time.time()
+            self.last_changes = (changed, removed)
+            try:
+                for year in warm_years:
+                    if year is None or year in self.store.years:
+                        warm(self.store.cube(year))
+                if self.on_update is not None:
+                    self.on_update(self.store)
+            except Exception as e:
+                # 데이터는 이미 바뀌었으므로 감시는 계속하고 오류만 남김
+                logger.exception('데이터 갱신 후처리 실패')
+                self.error = str(e)
+        return changed, removed
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+
+class StoreLoader:
+    """
+    CrimeStore를 백그라운드 스레드에서 읽는 작업 (프로세스마다 하나)
+    첫 화면을 스냅샷으로 그리는 동안 데이터 모듈 import와 파일 읽기를 뒤에서 끝내 두고,
+    저장소가 필요한 곳은 result()로 다 읽을 때까지 기다린다.
+    """
+
+    def __init__(self, data_dir, on_ready=None):
+        self.data_dir = data_dir
+        # 다 읽은 뒤 부를 함수 (store를 받음), 여기서 난 오류는 저장소 사용을 막지 않음
+        self.on_ready = on_ready
+        self.store = None
+        self.error = None
+        self.ready_error = None
+        self._done = threading.Event()
+        if 'store' not in sys.modules:
+            # 스레드를 띄우기 전에 clear해야 그 사이에 시작한 그리기도 기다림
+            imports_done.clear()
+        self._thread = threading.Thread(target=self._run, name='store-loader', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            # pandas와 데이터 모듈은 이 스레드에서 처음 import됨
+            try:
+                from aggregates import enable_copy_on_write
+                from store import CrimeStore
+                # 대시보드 프로세스의 pandas 옵션은 여기서 한 번만 (캐시한 표를 얕은 복사본으로 내보내도록)
+                enable_copy_on_write()
+            finally:
+                imports_done.set()
+            store = CrimeStore(self.data_dir)
+            store.refresh()
+            self.store = store
+        except Exception as e:
+            self.error = e
+        finally:
+            self._done.set()
+        if self.store is not None and self.on_ready is not None:
+            try:
+                self.on_ready(self.store)
+            except Exception as e:
+                # 저장소는 그대로 쓰고 오류만 남김 (화면에서 알림)
+                logger.exception('데이터 로드 후처리 실패')
+                self.ready_error = str(e)
+
+    def is_ready(self):
+        return self._done.is_set()
+
+    def result(self, timeout=None):
+        """
+        다 읽은 CrimeStore (읽는 중이면 기다림)
+        Raises:
+            읽다가 난 예외 (예: DataLoadError)를 그대로 다시 발생
+        """
+        if not self._done.wait(timeout):
+            raise TimeoutError('데이터를 아직 읽는 중입니다.')
+        if self.error is not None:
+            raise self.error
+        return self.store